@@ -0,0 +1,4 @@
+from benchmarks.runner import benchmarks
+
+
+benchmarks()
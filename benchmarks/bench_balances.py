@@ -0,0 +1,44 @@
+from os.path import dirname, join
+from typing import Callable, Iterator
+
+from pytezos import pytezos
+from pytezos.crypto.encoding import base58_encode
+from pytezos.michelson.types.big_map import BigMapType
+
+from benchmarks.runner import benchmark
+from scripts.helpers.contracts.tokens import FxhashToken
+from scripts.helpers.stand_in import TezosNodeStandIn
+from scripts.helpers.utility import load_contract_interface
+
+
+TOKEN_ADDRESS = 'KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi'
+HOLDERS_COUNT = 200
+
+
+@benchmark
+def fa2_get_balances() -> Iterator[Callable[[], object]]:
+    """Holders snapshot of the FA2 token: one big_map value request per
+    holder at the pinned block over the local stand-in"""
+
+    filename = join(dirname(__file__), '..', 'scripts', 'helpers', 'contracts', 'tokens', 'fa2', 'fxhash.tz')
+    contract = load_contract_interface(filename)
+    storage = contract.storage.encode({
+        **FxhashToken.default_storage,
+        'ledger': 0,
+        'metadata': 1,
+        'operators': 2,
+        'token_data': 3,
+        'token_metadata': 4,
+    })
+    ledger = type(contract.storage.data).from_micheline_value(storage)['ledger']
+    assert isinstance(ledger, BigMapType)
+    holders = [base58_encode(i.to_bytes(20, 'big'), b'tz1').decode() for i in range(HOLDERS_COUNT)]
+    block = {
+        'hash': 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2',
+        'level': 1,
+        'contracts': {TOKEN_ADDRESS: {'storage': storage}},
+        'big_maps': {'0': {ledger.get_key_hash((holder, 0)): {'int': '1'} for holder in holders}},
+    }
+    with TezosNodeStandIn({'blocks': [block]}) as node:
+        token = FxhashToken(contract=contract, client=pytezos.using(shell=node.url), address=TOKEN_ADDRESS)
+        yield lambda: token.get_balances(holders)
@@ -0,0 +1,83 @@
+from typing import Callable, Iterator
+from unittest.mock import Mock
+
+from benchmarks.runner import benchmark
+from scripts.defaults import (
+    ERC20_PROXY_ADDRESS,
+    TEZOS_TOKEN_ADDRESS,
+    TICKETER_ADDRESS,
+)
+from scripts.helpers.contracts.tokens import FxhashToken
+from scripts.helpers.addressable import (
+    make_deposit_routing_info,
+    make_withdrawal_routing_info,
+)
+from scripts.helpers.ticket import Ticket, deserialize_ticket
+from scripts.helpers.ticket_content import TicketContent
+from scripts.helpers.utility import make_address_bytes, to_micheline
+
+
+RECEIVER = 'tz1burnburnburnburnburnburnburjAYjjX'
+ETHERLINK_RECEIVER = '0xBefD2C6fFC36249ebEbd21d6DF6376ecF3BAc448'
+
+
+def make_token() -> FxhashToken:
+    return FxhashToken(Mock(), Mock(), TEZOS_TOKEN_ADDRESS, 0)
+
+
+def make_content() -> TicketContent:
+    return TicketContent(0, make_token().make_token_info_bytes())
+
+
+@benchmark
+def ticket_hash() -> Iterator[Callable[[], object]]:
+    ticket = Ticket(RECEIVER, TICKETER_ADDRESS, make_content(), 1)
+    yield ticket.hash
+
+
+@benchmark
+def ticket_content_to_bytes_hex() -> Iterator[Callable[[], object]]:
+    yield make_content().to_bytes_hex
+
+
+@benchmark
+def ticket_content_from_micheline() -> Iterator[Callable[[], object]]:
+    micheline = make_content().to_micheline()
+    yield lambda: TicketContent.from_micheline(micheline)
+
+
+@benchmark
+def make_token_info_bytes() -> Iterator[Callable[[], object]]:
+    yield make_token().make_token_info_bytes
+
+
+@benchmark
+def make_tezos_address_bytes() -> Iterator[Callable[[], object]]:
+    yield lambda: make_address_bytes(TICKETER_ADDRESS)
+
+
+@benchmark
+def deposit_routing_info() -> Iterator[Callable[[], object]]:
+    yield lambda: make_deposit_routing_info(ETHERLINK_RECEIVER, ERC20_PROXY_ADDRESS)
+
+
+@benchmark
+def withdrawal_routing_info() -> Iterator[Callable[[], object]]:
+    yield lambda: make_withdrawal_routing_info(RECEIVER, TICKETER_ADDRESS)
+
+
+@benchmark
+def deserialize_raw_ticket() -> Iterator[Callable[[], object]]:
+    raw_ticket = {
+        'ticketer': TICKETER_ADDRESS,
+        'content_type': to_micheline(TicketContent.michelson_type),
+        'content': make_content().to_micheline(),
+        'amount': '1000',
+    }
+    yield lambda: deserialize_ticket(RECEIVER, raw_ticket)
+
+
+@benchmark
+def ticket_content_from_bytes_hex() -> Iterator[Callable[[], object]]:
+    payload = make_content().to_bytes_hex()
+    yield lambda: TicketContent.from_bytes_hex(payload)
@@ -0,0 +1,49 @@
+from typing import Callable, Iterator
+
+import requests
+
+from benchmarks.runner import benchmark
+from scripts.defaults import ERC20_PROXY_ADDRESS, TICKETER_ADDRESS
+from scripts.helpers.rollup_node import get_messages, get_proof, get_tickets_count
+from scripts.helpers.stand_in import RollupNodeStandIn, get_fixture_path
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+OUTBOX_LEVEL = 5_242_880
+
+
+@benchmark
+def rollup_node_get_messages() -> Iterator[Callable[[], object]]:
+    with RollupNodeStandIn.from_fixture(get_fixture_path('withdrawal.json')) as node:
+        yield lambda: get_messages(node.url, OUTBOX_LEVEL)
+
+
+@benchmark
+def rollup_node_get_proof() -> Iterator[Callable[[], object]]:
+    with RollupNodeStandIn.from_fixture(get_fixture_path('withdrawal.json')) as node:
+        yield lambda: get_proof(node.url, OUTBOX_LEVEL, 0)
+
+
+@benchmark
+def rollup_node_get_tickets_count() -> Iterator[Callable[[], object]]:
+    ticket = Ticket(
+        owner=ERC20_PROXY_ADDRESS,
+        ticketer=TICKETER_ADDRESS,
+        content=TicketContent(0, bytes.fromhex('0502000000')),
+        amount=0,
+    )
+    with RollupNodeStandIn.from_fixture(get_fixture_path('withdrawal.json')) as node:
+        yield lambda: get_tickets_count(node.url, ticket, ERC20_PROXY_ADDRESS)
+
+
+@benchmark
+def rollup_node_session_get() -> Iterator[Callable[[], object]]:
+    """Lower bound for the rollup node client: the raw request over the
+    kept-alive session to the same stand-in"""
+
+    with RollupNodeStandIn.from_fixture(get_fixture_path('withdrawal.json')) as node:
+        session = requests.Session()
+        url = f'{node.url}/global/block/head/outbox/{OUTBOX_LEVEL}/messages'
+        yield lambda: session.get(url).json()
+        session.close()
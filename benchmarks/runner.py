@@ -0,0 +1,136 @@
+import json
+import platform
+import statistics
+import time
+from importlib.metadata import version
+from typing import Callable, Iterator, Optional
+
+import click
+
+from scripts.helpers.formatting import accent
+
+
+# Benchmark is a generator function: it makes the setup, yields the callable
+# to measure and makes the teardown after the measurement is finished:
+BenchmarkFunction = Callable[[], Iterator[Callable[[], object]]]
+
+REGISTRY: dict[str, BenchmarkFunction] = {}
+
+
+def benchmark(function: BenchmarkFunction) -> BenchmarkFunction:
+    """Registers benchmark under the `{module}.{function}` name"""
+
+    module = function.__module__.rsplit('.', 1)[-1]
+    REGISTRY[f'{module}.{function.__name__}'] = function
+    return function
+
+
+def measure(target: Callable[[], object], rounds: int, min_round_time: float) -> dict[str, float]:
+    """Returns per call time statistics in seconds: the number of calls in
+    each round is calibrated to take at least `min_round_time`"""
+
+    number = 1
+    while True:
+        started_at = time.perf_counter()
+        for _ in range(number):
+            target()
+        elapsed = time.perf_counter() - started_at
+        if elapsed >= min_round_time:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            target()
+        timings.append((time.perf_counter() - started_at) / number)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'calls_per_round': number,
+    }
+
+
+def run_benchmarks(
+    name_filter: Optional[str] = None,
+    rounds: int = 5,
+    min_round_time: float = 0.1,
+) -> dict[str, dict[str, float]]:
+    # NOTE: importing benchmark modules registers benchmarks:
+    from benchmarks import bench_balances, bench_encoding, bench_rollup_node  # noqa: F401
+
+    results = {}
+    for name, function in REGISTRY.items():
+        if name_filter and name_filter not in name:
+            continue
+        generator = function()
+        target = next(generator)
+        try:
+            results[name] = measure(target, rounds, min_round_time)
+        finally:
+            # NOTE: resuming the generator runs the teardown after `yield`,
+            # `close()` would only run `finally` and `with` exits:
+            next(generator, None)
+    return results
+
+
+def make_environment() -> dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'pytezos': version('pytezos'),
+        'web3': version('web3'),
+    }
+
+
+def format_time(seconds: float) -> str:
+    return f'{seconds * 1_000_000:10.2f} us'
+
+
+@click.command()
+@click.option('--filter', 'name_filter', default=None, help='Run only benchmarks which names contain given substring.')
+@click.option('--rounds', default=5, show_default=True, help='Number of measured rounds per benchmark.')
+@click.option('--min-round-time', default=0.1, show_default=True, help='Minimal duration of a round in seconds.')
+@click.option('--save', default=None, type=click.Path(dir_okay=False), help='Save results to the JSON file to use it as a baseline.')
+@click.option('--compare', default=None, type=click.Path(exists=True, dir_okay=False), help='Compare results with the baseline JSON file.')
+@click.option('--threshold', default=0.2, show_default=True, help='Allowed relative slowdown of the median time in the compare mode.')
+def benchmarks(
+    name_filter: Optional[str],
+    rounds: int,
+    min_round_time: float,
+    save: Optional[str],
+    compare: Optional[str],
+    threshold: float,
+) -> None:
+    """Runs bridge hot path benchmarks, optionally saves the results as a
+    baseline or compares them with the saved baseline"""
+
+    results = run_benchmarks(name_filter, rounds, min_round_time)
+    baseline: dict[str, dict[str, float]] = {}
+    if compare is not None:
+        with open(compare) as f:
+            baseline_data = json.load(f)
+        baseline = baseline_data['results']
+        click.echo(f'Comparing with baseline made in {baseline_data["environment"]}')
+
+    regressions = []
+    for name, result in results.items():
+        line = f'{name:50} {format_time(result["median"])}'
+        if name in baseline:
+            ratio = result['median'] / baseline[name]['median']
+            line += f'  x{ratio:.2f}'
+            if ratio > 1 + threshold:
+                regressions.append(name)
+                line += '  ' + accent('REGRESSION')
+        click.echo(line)
+
+    if save is not None:
+        with open(save, 'w') as f:
+            json.dump({'environment': make_environment(), 'results': results}, f, indent=2)
+        click.echo(f'Results are saved to {save}')
+
+    if regressions:
+        raise click.ClickException(
+            f'{len(regressions)} benchmarks are slower than baseline by more than {threshold:.0%}'
+        )
@@ -1,5 +1,7 @@
 import os
 from typing import Any
+from typing import Callable
+from typing import Optional
 
 import click
 import requests
@@ -12,19 +14,29 @@ from scripts.bootstrap.cli import echo
 from scripts.bootstrap.cli import notice_echo
 from scripts.bootstrap.cli import survey_table
 from scripts.bootstrap.const import KERNEL_ADDRESS
+from scripts.bootstrap.const import MAINNET_L1_RPC_URL
 from scripts.bootstrap.const import MAINNET_TZKT_API_URL
 from scripts.bootstrap.const import MAINNET_WHITELIST
 from scripts.bootstrap.const import NETWORK_DEFAULTS
+from scripts.bootstrap.dto import ManifestAssetDTO
 from scripts.bootstrap.dto import TicketerDTO
 from scripts.bootstrap.dto import TicketerParamsDTO
 from scripts.bootstrap.dto import TokenInfoDTO
 from scripts.bootstrap.dto import TokenMetadataDTO
 from scripts.bootstrap.dto import UserInputDTO
+from scripts.bootstrap.manifest import BootstrapState
+from scripts.bootstrap.manifest import BootstrapStateMismatch
+from scripts.bootstrap.manifest import load_manifest
 from scripts.etherlink import deploy_erc20
 from scripts.helpers.contracts import TokenHelper
+from scripts.helpers.endpoint_pool import get_endpoint_pool
+from scripts.helpers.token_metadata import TokenMetadataResolver
+from scripts.helpers.utility import get_etherlink_web3
+from scripts.helpers.utility import get_tezos_client
 from scripts.tezos import deploy_ticketer
 from scripts.tezos import deploy_token_bridge_helper
 from scripts.tezos import get_ticketer_params
+from scripts import cli_options
 
 
 class EtherlinkBootstrapClient:
@@ -78,6 +90,13 @@ def ask_origination_confirmation(token_info: TokenInfoDTO) -> None:
         exit(0)
 
 
+def make_mainnet_metadata_resolver() -> TokenMetadataResolver:
+    return TokenMetadataResolver(
+        tzkt_api_url=MAINNET_TZKT_API_URL,
+        client=pytezos.using(shell=MAINNET_L1_RPC_URL),
+    )
+
+
 class TokenBootstrap:
     def __init__(
         self,
@@ -88,7 +107,10 @@ class TokenBootstrap:
         testrunner_account: str,
         use_test_prefix: bool,
         test_version: int,
-
+        token_info: Optional[TokenInfoDTO] = None,
+        state: Optional[BootstrapState] = None,
+        interactive: bool = True,
+        metadata_resolver: Optional[TokenMetadataResolver] = None,
     ):
         self._mainnet_asset_id = mainnet_asset_id
         self._is_mainnet = is_mainnet
@@ -98,7 +120,10 @@ class TokenBootstrap:
         self._test_amount_multiplier = .2
         self._use_test_prefix = use_test_prefix
         self._test_version = test_version
-        self._token_info: TokenInfoDTO
+        self._token_info = token_info
+        self._state = state
+        self._interactive = interactive
+        self._metadata_resolver = metadata_resolver or make_mainnet_metadata_resolver()
 
     def run(self, whitelist_counter: int):
         survey.printers.info(
@@ -107,13 +132,39 @@ class TokenBootstrap:
         )
 
         self._fetch_mainnet_token_metadata()
-        ask_origination_confirmation(self._token_info)
+        if self._interactive:
+            ask_origination_confirmation(self._token_info)
 
-        asset_id = self.deploy_test_token()
+        asset_id = self._resume_or_run('token', self.deploy_test_token)
         # asset_id = self.prepare_l1_token()
-        ticketer_data = self.deploy_ticketer(asset_id)
-        erc20_proxy_address = self.deploy_erc20_proxy(ticketer_data.ticketer_params)
-        self.deploy_helper(ticketer_data.ticketer.address, erc20_proxy_address)
+        ticketer = self._resume_or_run('ticketer', lambda: self._dump_ticketer(self.deploy_ticketer(asset_id)))
+        ticketer_params = TicketerParamsDTO.model_validate(ticketer['ticketer_params'])
+        erc20_proxy_address = self._resume_or_run('erc20_proxy', lambda: self.deploy_erc20_proxy(ticketer_params))
+        self._resume_or_run('token_bridge_helper', lambda: self.deploy_helper(ticketer['address'], erc20_proxy_address))
+
+    def _resume_or_run(self, step: str, deploy: Callable[[], Any]) -> Any:
+        """Returns result of the step recorded in the state file if the step was
+        completed in one of the previous runs, otherwise runs the step and records its result."""
+
+        if self._state is None:
+            return deploy()
+
+        result = self._state.get(self._mainnet_asset_id, step)
+        if result is not None:
+            survey.printers.done(f'Step `{step}` for Token `{self._token_info.metadata.name}` is already completed: {result}.')
+            return result
+
+        result = deploy()
+        self._state.set(self._mainnet_asset_id, step, result)
+        return result
+
+    @staticmethod
+    def _dump_ticketer(ticketer_data: TicketerDTO) -> dict[str, Any]:
+        return {
+            'address': ticketer_data.ticketer.address,
+            'ticketer_params': ticketer_data.ticketer_params.model_dump(),
+            'ticket_hash': str(ticketer_data.ticket_hash),
+        }
 
     def prepare_l1_token(self) -> str:
         contract_address, token_id = self._mainnet_asset_id.split('_')
@@ -128,22 +179,25 @@ class TokenBootstrap:
             return self._mainnet_asset_id
 
     def _fetch_mainnet_token_metadata(self) -> None:
-        contract_address, token_id = self._mainnet_asset_id.split('_')
+        # NOTE: token info could be already provided by the manifest
+        if self._token_info is None:
+            token_metadata = self._metadata_resolver.resolve(self._mainnet_asset_id)
+            if token_metadata is None or token_metadata.total_supply is None:
+                raise click.ClickException(f'Failed to resolve metadata for asset `{self._mainnet_asset_id}`')
+            self._token_info = TokenInfoDTO(
+                metadata=TokenMetadataDTO(
+                    name=token_metadata.name,
+                    symbol=token_metadata.symbol,
+                    decimals=token_metadata.decimals,
+                ),
+                standard=token_metadata.standard,
+                supply=token_metadata.total_supply,
+            )
 
-        token_data = requests.get(f'{MAINNET_TZKT_API_URL}/tokens?contract={contract_address}&tokenId={token_id}').json()[0]
         if self._use_test_prefix:
-            token_data['metadata']['name'] = ' '.join(['Test', token_data['metadata']['name'], f'v{self._test_version}'])
-            token_data['metadata']['symbol'] = '_'.join(['TEST', token_data['metadata']['symbol'], str(self._test_version)])
-
-        self._token_info = TokenInfoDTO(
-            metadata=TokenMetadataDTO(
-                name=token_data['metadata']['name'],
-                symbol=token_data['metadata']['symbol'],
-                decimals=token_data['metadata'].get('decimals'),
-            ),
-            standard=token_data['standard'].upper(),
-            supply=int(token_data['totalSupply']),
-        )
+            metadata = self._token_info.metadata
+            metadata.name = ' '.join(['Test', metadata.name, f'v{self._test_version}'])
+            metadata.symbol = '_'.join(['TEST', metadata.symbol, str(self._test_version)])
 
     def deploy_test_token(self) -> str:
         contract_address, token_id = self._mainnet_asset_id.split('_')
@@ -260,6 +314,7 @@ class TokenBootstrap:
             f'Token Bridge Helper Contract deployed for Token `{self._token_info.metadata.name}`: {helper.address}.',
             re=True,
         )
+        return helper.address
 
 
 class RollupBootstrap:
@@ -320,12 +375,13 @@ class BootstrapSurvey:
             ).rstrip('/')
             try:
                 survey.printers.text('', end='\r')
-                url = f'{l1_rpc_url}/chains/main/blocks/head'
+                path = 'chains/main/blocks/head'
                 with survey.graphics.SpinProgress(
                     prefix='Checking the specified RPC Endpoint ',
-                    suffix=f' fetching {url}',
+                    suffix=f' fetching {l1_rpc_url} {path}',
                 ):
-                    response = requests.get(url).json()
+                    pool = get_endpoint_pool(l1_rpc_url)
+                    response = pool.get(path, keep_base_path=True).json()
                     assert response['protocol']
             except (IOError, AssertionError):
                 survey.printers.fail('Could not retrieve the specified RPC Endpoint. Please try again.', re=True)
@@ -369,9 +425,10 @@ class BootstrapSurvey:
                 with survey.graphics.SpinProgress(
                     prefix='Checking the specified RPC Endpoint ',
                 ):
-                    response = requests.get(
-                        f'{self._l1_rpc_url}/chains/main/blocks/head/context/smart_rollups/smart_rollup/{smart_rollup_address}' +
+                    response = get_endpoint_pool(self._l1_rpc_url).get(
+                        f'chains/main/blocks/head/context/smart_rollups/smart_rollup/{smart_rollup_address}' +
                         '/genesis_info',
+                        keep_base_path=True,
                     ).json()
                     assert isinstance(response, dict)
                     assert response['level']
@@ -395,7 +452,7 @@ class BootstrapSurvey:
                     suffix=lambda x: state,
                 ):
                     state = ' fetching balance...'
-                    client = pytezos.using(
+                    client = get_tezos_client(
                         shell=self._l1_rpc_url,
                         key=l1_private_key,
                     )
@@ -452,7 +509,32 @@ class BootstrapSurvey:
 
 
 @click.command()
-def rollout():
+@click.option(
+    '--manifest',
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help='JSON or YAML file with network params and assets list. If provided, bootstrap runs without any prompts.',
+)
+@click.option(
+    '--state-file',
+    default='.bootstrap-state.json',
+    show_default=True,
+    help='File where deployed addresses are recorded after each step; completed steps are skipped on re-run. Used only with `--manifest`.',
+)
+@cli_options.profile
+def rollout(manifest: Optional[str], state_file: str):
+    if manifest is not None:
+        notice_echo(f'Starting Bridge Application Bootstrap process using manifest {manifest}.')
+        manifest_dto = load_manifest(manifest)
+        rollup_bootstrap_service = RollupBootstrapFactory.build(
+            manifest_dto.network,
+            assets=manifest_dto.assets,
+            state=BootstrapState(state_file),
+            test_version=manifest_dto.test_version,
+        )
+        rollup_bootstrap_service.run()
+        return
+
     notice_echo('This command will help you to deploy all contracts for a new rollup.')
     bootstrap_survey = BootstrapSurvey(network_defaults=NETWORK_DEFAULTS)
     user_input = bootstrap_survey.perform()
@@ -464,8 +546,17 @@ def rollout():
 
 class RollupBootstrapFactory:
     @classmethod
-    def build(cls, user_input: UserInputDTO):
-        tezos_client = pytezos.using(
+    def build(
+        cls,
+        user_input: UserInputDTO,
+        assets: Optional[list[ManifestAssetDTO]] = None,
+        state: Optional[BootstrapState] = None,
+        test_version: Optional[int] = None,
+    ):
+        """Builds bootstrap service; when `assets` provided (manifest mode)
+        the service runs non-interactively and records progress to the `state`"""
+
+        tezos_client = get_tezos_client(
             shell=user_input.l1_rpc_url,
             key=user_input.l1_private_key,
         )
@@ -474,18 +565,53 @@ class RollupBootstrapFactory:
             private_key=user_input.l2_private_key,
         )
 
-        test_version: int = cls._bump_test_version() if user_input.use_test_prefix else 0
+        if state is not None:
+            # NOTE: addresses recorded for another chain or rollup must never
+            # be reused, so the resumed state must match the network:
+            try:
+                state.bind({
+                    'l1_chain_id': tezos_client.shell.chains.main.chain_id(),
+                    'l2_chain_id': str(get_etherlink_web3(user_input.l2_rpc_url).eth.chain_id),
+                    'smart_rollup_address': user_input.smart_rollup_address,
+                })
+            except BootstrapStateMismatch as error:
+                raise click.ClickException(str(error)) from error
+
+        if state is not None and state.test_version is not None:
+            # NOTE: resumed run should reuse the version of the interrupted one
+            test_version = state.test_version
+        elif test_version is None:
+            test_version = cls._bump_test_version() if user_input.use_test_prefix else 0
+        if state is not None:
+            state.test_version = test_version
+
+        if assets is None:
+            assets = [ManifestAssetDTO(asset_id=asset_id) for asset_id in MAINNET_WHITELIST]
+            interactive = True
+        else:
+            interactive = False
+
+        # NOTE: resolving metadata of all assets in a single batch request,
+        # TokenBootstrap instances then read it from the resolver cache:
+        metadata_resolver = make_mainnet_metadata_resolver()
+        metadata_resolver.resolve_many(
+            asset.asset_id for asset in assets if cls._make_token_info(asset) is None
+        )
 
         tokens = []
-        for mainnet_asset_id in MAINNET_WHITELIST:
+        for asset in assets:
             token_bootstrap = TokenBootstrap(
-                mainnet_asset_id=mainnet_asset_id,
+                mainnet_asset_id=asset.asset_id,
                 is_mainnet=user_input.is_mainnet,
                 tezos_client=tezos_client,
                 etherlink_client=etherlink_client,
                 testrunner_account=user_input.l1_testrunner_account,
                 use_test_prefix=user_input.use_test_prefix,
                 test_version=test_version,
+                token_info=cls._make_token_info(asset),
+                state=state,
+                interactive=interactive,
+                metadata_resolver=metadata_resolver,
             )
             tokens.append(token_bootstrap)
 
@@ -495,6 +621,19 @@ class RollupBootstrapFactory:
             tokens=tokens,
         )
 
+    @staticmethod
+    def _make_token_info(asset: ManifestAssetDTO) -> Optional[TokenInfoDTO]:
+        """Returns token info if it is fully provided in the manifest, otherwise
+        it will be resolved by the metadata resolver"""
+
+        if asset.metadata is None or asset.standard is None or asset.supply is None:
+            return None
+        return TokenInfoDTO(
+            metadata=asset.metadata.model_copy(),
+            standard=asset.standard.upper(),
+            supply=asset.supply,
+        )
+
     @staticmethod
     def _bump_test_version() -> int:
         filename = '.version'
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from scripts.bootstrap.const import DEFAULT_TOKEN_ID
@@ -27,11 +29,22 @@ class TokenInfoDTO(BaseModel):
     supply: int
 
 class UserInputDTO(BaseModel):
-    is_mainnet: bool
+    is_mainnet: bool = False
     smart_rollup_address: str
     l1_private_key: str
     l2_private_key: str
     l1_rpc_url: str
     l2_rpc_url: str
     l1_testrunner_account: str
-    use_test_prefix: bool
+    use_test_prefix: bool = False
+
+class ManifestAssetDTO(BaseModel):
+    asset_id: str
+    metadata: Optional[TokenMetadataDTO] = None
+    standard: Optional[str] = None
+    supply: Optional[int] = None
+
+class ManifestDTO(BaseModel):
+    network: UserInputDTO
+    assets: list[ManifestAssetDTO]
+    test_version: Optional[int] = None
@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Any
+from typing import Optional
+
+import yaml
+
+from scripts.bootstrap.dto import ManifestDTO
+
+
+def _expand_env(value: Any) -> Any:
+    """Recursively expands `$VAR` / `${VAR}` references in manifest strings,
+    so secrets (private keys) can be provided by CI environment"""
+
+    if isinstance(value, str):
+        return os.path.expandvars(value)
+    if isinstance(value, list):
+        return [_expand_env(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand_env(item) for key, item in value.items()}
+    return value
+
+
+def load_manifest(filename: str) -> ManifestDTO:
+    """Loads bootstrap manifest from JSON or YAML file.
+
+    Example (YAML):
+        network:
+          name: Parisnet
+          l1_rpc_url: https://rpc.tzkt.io/parisnet
+          smart_rollup_address: sr1JBmCsMoXmCeeYQWB3YYYqP9d68wUXQzkC
+          l1_private_key: $L1_PRIVATE_KEY
+          l2_rpc_url: https://etherlink.dipdup.net
+          l2_private_key: $L2_PRIVATE_KEY
+          l1_testrunner_account: tz1TZDn2ZK35UnEjyuGQRVeM2NC5tQScJLpQ
+          use_test_prefix: true
+        assets:
+          - asset_id: KT1PWx2mnDueood7fEmfbBDKx1D9BAnnXitn_0
+          - asset_id: KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0
+            metadata: {name: Tether USD, symbol: USDt, decimals: 6}
+            standard: FA2
+            supply: 1000000000000
+    """
+
+    with open(filename, 'r') as f:
+        if filename.endswith(('.yaml', '.yml')):
+            raw_manifest = yaml.safe_load(f)
+        else:
+            raw_manifest = json.load(f)
+
+    return ManifestDTO.model_validate(_expand_env(raw_manifest))
+
+
+class BootstrapStateMismatch(Exception):
+    pass
+
+
+class BootstrapState:
+    """Records deployed contracts per asset and per step in the JSON file,
+    so interrupted bootstrap can be resumed without redeploying contracts
+    which were already originated. The state is bound to the chains and
+    the rollup it was made for and can not be resumed against other ones"""
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        self._state: dict[str, Any] = {'network': None, 'test_version': None, 'assets': {}}
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                self._state.update(json.load(f))
+
+    def bind(self, network: dict[str, str]) -> None:
+        """Records the identity of the network (chain ids and rollup address)
+        or checks it is the same as in the recorded state, raises
+        BootstrapStateMismatch otherwise"""
+
+        recorded = self._state['network']
+        if recorded is None:
+            if self._state['assets']:
+                raise BootstrapStateMismatch(
+                    f'State file {self._filename} has no network recorded, '
+                    'it is not known which network its contracts belong to'
+                )
+            self._state['network'] = network
+            self._save()
+            return
+
+        mismatched = sorted(key for key in {*recorded, *network} if recorded.get(key) != network.get(key))
+        if mismatched:
+            details = ', '.join(
+                f'{key}: {recorded.get(key)} in the state, {network.get(key)} now' for key in mismatched
+            )
+            raise BootstrapStateMismatch(
+                f'State file {self._filename} was made for another network ({details}), '
+                'use another `--state-file` or remove it to start over'
+            )
+
+    @property
+    def test_version(self) -> Optional[int]:
+        return self._state['test_version']
+
+    @test_version.setter
+    def test_version(self, version: int) -> None:
+        self._state['test_version'] = version
+        self._save()
+
+    def get(self, asset_id: str, step: str) -> Any:
+        return self._state['assets'].get(asset_id, {}).get(step)
+
+    def set(self, asset_id: str, step: str, value: Any) -> None:
+        self._state['assets'].setdefault(asset_id, {})[step] = value
+        self._save()
+
+    def _save(self) -> None:
+        # NOTE: writing to the temporary file first, so the state is never
+        # left half-written if the process is killed in the middle of a dump
+        tmp_filename = f'{self._filename}.tmp'
+        with open(tmp_filename, 'w') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_filename, self._filename)
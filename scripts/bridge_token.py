@@ -4,7 +4,12 @@ from scripts.tezos.get_ticketer_params import get_ticketer_params
 from scripts.tezos.deploy_token_bridge_helper import deploy_token_bridge_helper
 from scripts.etherlink import deploy_erc20
 from scripts import cli_options
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from scripts.helpers.token_metadata import (
+    TokenMetadataResolver,
+    make_asset_id,
+)
+from scripts.helpers.utility import get_tezos_client
 from scripts.helpers.formatting import (
     accent,
     echo_variable,
@@ -17,24 +22,27 @@ from scripts.helpers.formatting import (
 # TODO: consider auto-determine token type by token entrypoints
 @cli_options.token_type
 @cli_options.token_id
-@cli_options.token_decimals
-@cli_options.token_symbol
-@cli_options.token_name
+@cli_options.optional_token_decimals
+@cli_options.optional_token_symbol
+@cli_options.optional_token_name
 @cli_options.tezos_private_key
 @cli_options.tezos_rpc_url
+@cli_options.tzkt_api_url
 @cli_options.etherlink_private_key
 @cli_options.etherlink_rpc_url
 @cli_options.kernel_address
 @cli_options.skip_confirm
+@cli_options.profile
 def bridge_token(
     token_address: str,
     token_type: str,
     token_id: int,
-    token_decimals: int,
-    token_symbol: str,
-    token_name: str,
+    token_decimals: Optional[int],
+    token_symbol: Optional[str],
+    token_name: Optional[str],
     tezos_private_key: str,
     tezos_rpc_url: str,
+    tzkt_api_url: str,
     etherlink_private_key: str,
     etherlink_rpc_url: str,
     kernel_address: str,
@@ -45,12 +53,32 @@ def bridge_token(
     """
 
     # TODO: consider require token_id to be provided if token_type is FA2
-    # TODO: consider adding a TzKT API call to get token metadata if not provided
+    if token_decimals is None or token_symbol is None or token_name is None:
+        resolver = TokenMetadataResolver(
+            tzkt_api_url=tzkt_api_url,
+            client=get_tezos_client(tezos_rpc_url, tezos_private_key),
+        )
+        metadata = resolver.resolve(make_asset_id(token_address, token_id))
+        if metadata is not None:
+            token_decimals = token_decimals if token_decimals is not None else metadata.decimals
+            token_symbol = token_symbol or metadata.symbol
+            token_name = token_name or metadata.name
+
+    # NOTE: asking for the values which were not found in the token metadata:
+    if token_decimals is None:
+        token_decimals = click.prompt('Token decimals', type=int)
+    if token_symbol is None:
+        token_symbol = click.prompt('Token symbol')
+    if token_name is None:
+        token_name = click.prompt('Token name')
+
     click.echo('Deploying bridge contracts for ' + wrap(accent(token_symbol)) + ':')
     echo_variable('  - ', 'Token contract', token_address)
     if token_type == 'FA2':
         echo_variable('  - ', 'Token id', str(token_id))
-    # TODO: echo token metadata
+    echo_variable('  - ', 'Token name', token_name)
+    echo_variable('  - ', 'Token symbol', token_symbol)
+    echo_variable('  - ', 'Token decimals', str(token_decimals))
     # TODO: echo public keys, rpc node addresses
     if not skip_confirm:
         click.confirm('Do you want to proceed?', abort=True, default=True)
@@ -0,0 +1,205 @@
+import json
+import click
+from typing import Any
+from pytezos.client import PyTezosClient
+from scripts.tezos.deploy_ticketer import make_extra_metadata
+from scripts.etherlink import deploy_erc20
+from scripts import cli_options
+from scripts.helpers.bulk import originate_many
+from scripts.helpers.contracts import (
+    Ticketer,
+    TokenBridgeHelper,
+    TokenHelper,
+)
+from scripts.helpers.ticket_content import TicketContent
+from scripts.helpers.token_metadata import (
+    TokenMetadataResolver,
+    make_asset_id,
+)
+from scripts.helpers.utility import (
+    get_tezos_client,
+    make_address_bytes,
+)
+from scripts.helpers.formatting import (
+    accent,
+    echo_variable,
+    wrap,
+)
+
+
+def fill_token_metadata(
+    resolver: TokenMetadataResolver,
+    tokens_params: list[dict[str, Any]],
+) -> None:
+    """Fills missing `token_name`, `token_symbol` and `token_decimals` of the
+    tokens params using a single batch of metadata lookups"""
+
+    fields = {'token_name': 'name', 'token_symbol': 'symbol', 'token_decimals': 'decimals'}
+    incomplete = {
+        make_asset_id(params['token_address'], int(params.get('token_id', 0))): params
+        for params in tokens_params
+        if any(params.get(field) is None for field in fields)
+    }
+    resolved = resolver.resolve_many(incomplete)
+    for asset_id, params in incomplete.items():
+        for field, metadata_field in fields.items():
+            if params.get(field) is None and asset_id in resolved:
+                params[field] = getattr(resolved[asset_id], metadata_field)
+            if params.get(field) is None:
+                raise click.ClickException(f'Failed to resolve `{field}` for `{asset_id}`')
+
+
+def deploy_ticketers(
+    manager: PyTezosClient,
+    tokens: list[TokenHelper],
+    extra_metadata: list[dict[str, str]],
+) -> list[Ticketer]:
+    """Deploys Ticketers for given tokens packed into as few operation
+    groups as possible"""
+
+    originations = [
+        Ticketer.originate(manager, token, token_metadata)
+        for token, token_metadata in zip(tokens, extra_metadata, strict=True)
+    ]
+    addresses = originate_many(manager, originations)
+    return [Ticketer.from_address(manager, address) for address in addresses]
+
+
+def deploy_token_bridge_helpers(
+    manager: PyTezosClient,
+    tokens: list[TokenHelper],
+    ticketers: list[Ticketer],
+    erc20_proxies: list[str],
+    symbols: list[str],
+) -> list[TokenBridgeHelper]:
+    """Deploys Token Bridge Helpers for given ticketers packed into as few
+    operation groups as possible"""
+
+    originations = [
+        TokenBridgeHelper.originate(
+            client=manager,
+            ticketer=ticketer,
+            erc_proxy=bytes.fromhex(erc20_proxy.replace('0x', '')),
+            token=token,
+            symbol=symbol,
+        )
+        for token, ticketer, erc20_proxy, symbol in zip(
+            tokens, ticketers, erc20_proxies, symbols, strict=True
+        )
+    ]
+    addresses = originate_many(manager, originations)
+    return [TokenBridgeHelper.from_address(manager, address) for address in addresses]
+
+
+@click.command()
+@click.option(
+    '--tokens-file',
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help='JSON file with the list of tokens to bridge, each item has the same fields as `bridge_token` options: `token_address`, `token_type`, `token_id`, `token_decimals`, `token_symbol` and `token_name`. Missing metadata fields are resolved from the token metadata.',
+)
+@cli_options.tezos_private_key
+@cli_options.tezos_rpc_url
+@cli_options.tzkt_api_url
+@cli_options.etherlink_private_key
+@cli_options.etherlink_rpc_url
+@cli_options.kernel_address
+@cli_options.skip_confirm
+@cli_options.profile
+def bridge_tokens(
+    tokens_file: str,
+    tezos_private_key: str,
+    tezos_rpc_url: str,
+    tzkt_api_url: str,
+    etherlink_private_key: str,
+    etherlink_rpc_url: str,
+    kernel_address: str,
+    skip_confirm: bool,
+) -> list[dict[str, Any]]:
+    """Deploys bridge contracts for many tokens at once: all Ticketers are
+    originated in bulk, then ERC20 Proxies, then all Token Bridge Helpers
+    in bulk.
+    """
+
+    with open(tokens_file) as f:
+        tokens_params: list[dict[str, Any]] = json.load(f)
+
+    manager = get_tezos_client(tezos_rpc_url, tezos_private_key)
+    fill_token_metadata(TokenMetadataResolver(tzkt_api_url, client=manager), tokens_params)
+    click.echo(f'Deploying bridge contracts for {len(tokens_params)} tokens:')
+    for params in tokens_params:
+        echo_variable('  - ', params['token_symbol'], params['token_address'])
+    if not skip_confirm:
+        click.confirm('Do you want to proceed?', abort=True, default=True)
+    click.echo('')
+
+    tokens = [
+        TokenHelper.get_cls(params['token_type']).from_address(
+            manager,
+            params['token_address'],
+            token_id=int(params.get('token_id', 0)),
+        )
+        for params in tokens_params
+    ]
+    extra_metadata = [
+        make_extra_metadata(
+            params['token_name'],
+            params['token_symbol'],
+            params['token_decimals'],
+        )
+        for params in tokens_params
+    ]
+
+    click.echo('Deploying Ticketers in bulk...')
+    ticketers = deploy_ticketers(manager, tokens, extra_metadata)
+    for params, ticketer in zip(tokens_params, ticketers):
+        echo_variable('  - ', params['token_symbol'], ticketer.address)
+    click.echo('')
+
+    erc20_proxies = []
+    for params, token, token_metadata, ticketer in zip(
+        tokens_params, tokens, extra_metadata, ticketers
+    ):
+        # NOTE: the content is the same as set in the Ticketer storage, so
+        # there is no need to request it from the node:
+        content = TicketContent(*Ticketer.make_storage(token, token_metadata)['content'])
+        erc20 = deploy_erc20.callback(
+            ticketer_address_bytes=make_address_bytes(ticketer.address),
+            ticket_content_bytes=content.to_bytes_hex(),
+            token_name=params['token_name'],
+            token_symbol=params['token_symbol'],
+            token_decimals=params['token_decimals'],
+            kernel_address=kernel_address,
+            etherlink_private_key=etherlink_private_key,
+            etherlink_rpc_url=etherlink_rpc_url,
+            skip_confirm=True,
+            silent=False,
+        )  # type: ignore
+        erc20_proxies.append(erc20.address)
+        click.echo('')
+
+    click.echo('Deploying Token Bridge Helpers in bulk...')
+    helpers = deploy_token_bridge_helpers(
+        manager,
+        tokens,
+        ticketers,
+        erc20_proxies,
+        [params['token_symbol'] for params in tokens_params],
+    )
+    for params, helper in zip(tokens_params, helpers):
+        echo_variable('  - ', params['token_symbol'], helper.address)
+    click.echo('')
+
+    click.echo(
+        'Successfully deployed FA Bridge contracts for '
+        + wrap(accent(str(len(tokens_params))))
+        + ' tokens'
+    )
+    return [
+        {
+            'ticketer': ticketer,
+            'erc20': erc20_proxy,
+            'token_bridge_helper': helper,
+        }
+        for ticketer, erc20_proxy, helper in zip(ticketers, erc20_proxies, helpers)
+    ]
@@ -1,5 +1,7 @@
 import click
-from typing import Optional
+import functools
+import time
+from typing import Any, Callable, Optional, TypeVar
 from click.core import (
     Context,
     Option,
@@ -15,10 +17,25 @@ from scripts.defaults import (
     FA_WITHDRAWAL_PRECOMPILE,
     XTZ_WITHDRAWAL_PRECOMPILE,
     ETHERLINK_ROLLUP_NODE_URL,
+    TZKT_API_URL,
+)
+from scripts.helpers.profiling import (
+    DEFAULT_TOP,
+    profile as profile_command,
+)
+from scripts.helpers.rpc_metrics import (
+    RpcMetrics,
+    record_rpc_calls,
+)
+from scripts.helpers.tracing import (
+    start_span,
+    trace_to_file,
 )
 
 # TODO: add validation to options? (reuse logic from bootstrap?)
 
+F = TypeVar('F', bound=Callable[..., Any])
+
 
 skip_confirm = click.option(
     '--skip-confirm',
@@ -224,6 +241,35 @@ token_name = click.option(
     help='Token name added to the ERC20 Proxy token and Ticketer metadata content.',
 )
 
+# NOTE: optional variants of the token metadata options, missing values are
+# resolved from the indexer or from the token contract:
+optional_token_decimals = click.option(
+    '--token-decimals',
+    type=int,
+    default=None,
+    help='Token decimals added to the ERC20 Proxy token and Ticketer metadata content. Resolved from the token metadata if not provided.',
+)
+
+optional_token_symbol = click.option(
+    '--token-symbol',
+    default=None,
+    help='Token symbol added to the ERC20 Proxy token and Ticketer metadata content. Resolved from the token metadata if not provided.',
+)
+
+optional_token_name = click.option(
+    '--token-name',
+    default=None,
+    help='Token name added to the ERC20 Proxy token and Ticketer metadata content. Resolved from the token metadata if not provided.',
+)
+
+tzkt_api_url = click.option(
+    '--tzkt-api-url',
+    default=TZKT_API_URL,
+    envvar='TZKT_API_URL',
+    help='TzKT API URL used to resolve token metadata.',
+    show_default=True,
+)
+
 total_supply = click.option(
     '--total-supply',
     required=True,
@@ -254,3 +300,107 @@ xtz_ticket_helper = click.option(
     help='The address of the xtz ticket helper used in xtz bridge.',
     show_default=True,
 )
+
+withdrawal_store = click.option(
+    '--withdrawal-store',
+    default=None,
+    envvar='WITHDRAWAL_STORE',
+    type=click.Path(dir_okay=False),
+    help='SQLite file to record the withdrawal lifecycle steps to.',
+)
+
+
+def rpc_metrics(func: F) -> F:
+    """Adds `--rpc-metrics` option: RPC calls made by the command are
+    recorded and written to the file when the command finishes (JSON if
+    the file ends with `.json`, Prometheus text format otherwise)"""
+
+    @click.option(
+        '--rpc-metrics',
+        'rpc_metrics_file',
+        default=None,
+        envvar='RPC_METRICS_FILE',
+        type=click.Path(dir_okay=False),
+        help='File to write RPC latency, bytes, retries and errors metrics to.',
+    )
+    @functools.wraps(func)
+    def wrapper(*args: Any, rpc_metrics_file: Optional[str] = None, **kwargs: Any) -> Any:
+        if rpc_metrics_file is None:
+            return func(*args, **kwargs)
+        metrics = RpcMetrics()
+        try:
+            with record_rpc_calls(metrics):
+                return func(*args, **kwargs)
+        finally:
+            metrics.write(rpc_metrics_file)
+
+    return wrapper  # type: ignore
+
+
+def trace_file(func: F) -> F:
+    """Adds `--trace-file` option: the command and its stages (build,
+    autofill, sign, inject, wait for inclusion, fetch receipt) are recorded
+    as spans and appended to the file, one JSON object per line"""
+
+    @click.option(
+        '--trace-file',
+        default=None,
+        envvar='TRACE_FILE',
+        type=click.Path(dir_okay=False),
+        help='File to append per-stage tracing spans to (one JSON object per line).',
+    )
+    @functools.wraps(func)
+    def wrapper(*args: Any, trace_file: Optional[str] = None, **kwargs: Any) -> Any:
+        if trace_file is None:
+            with start_span(func.__name__):
+                return func(*args, **kwargs)
+        with trace_to_file(trace_file), start_span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+def profile(func: F) -> F:
+    """Adds `--profile` option: the command runs under cProfile, the stats
+    are written to `{prefix}.pstats` with the chronological timeline of all
+    HTTP requests in `{prefix}.timeline.json`, and the top-N functions and
+    slowest requests are printed to stderr when the command finishes"""
+
+    @click.option(
+        '--profile',
+        is_flag=True,
+        default=False,
+        help='Profile the command with cProfile and record the timeline of HTTP requests.',
+    )
+    @click.option(
+        '--profile-output',
+        default=None,
+        envvar='PROFILE_OUTPUT',
+        help='Prefix of the profile files, `{command}-{timestamp}` if not provided.',
+    )
+    @click.option(
+        '--profile-top',
+        default=DEFAULT_TOP,
+        show_default=True,
+        help='Number of functions and HTTP requests in the printed profile summary.',
+    )
+    @functools.wraps(func)
+    def wrapper(
+        *args: Any,
+        profile: bool = False,
+        profile_output: Optional[str] = None,
+        profile_top: int = DEFAULT_TOP,
+        **kwargs: Any,
+    ) -> Any:
+        if not profile:
+            return func(*args, **kwargs)
+        prefix = profile_output or f'{func.__name__}-{time.strftime("%Y%m%d-%H%M%S")}'
+        try:
+            with profile_command() as result:
+                return func(*args, **kwargs)
+        finally:
+            click.echo(result.summary(profile_top), err=True)
+            pstats_file, timeline_file = result.write(prefix)
+            click.echo(f'Profile written to {pstats_file} and {timeline_file}', err=True)
+
+    return wrapper  # type: ignore
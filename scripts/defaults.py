@@ -11,6 +11,7 @@ KERNEL_ADDRESS = '0x0000000000000000000000000000000000000000'
 FA_WITHDRAWAL_PRECOMPILE = '0xff00000000000000000000000000000000000002'
 XTZ_WITHDRAWAL_PRECOMPILE = '0xff00000000000000000000000000000000000001'
 ETHERLINK_ROLLUP_NODE_URL = 'https://ghostnet-smart.tzkt.io/'
+TZKT_API_URL = 'https://api.ghostnet.tzkt.io/v1'
 
 
 # Default values for testing scenarios:
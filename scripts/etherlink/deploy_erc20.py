@@ -29,6 +29,7 @@ from scripts import cli_options
 @cli_options.skip_confirm
 @cli_options.silent
 # TODO: consider adding gas price and gas limit here as parameters?
+@cli_options.profile
 def deploy_erc20(
     ticketer_address_bytes: str,
     ticket_content_bytes: str,
@@ -1,45 +1,141 @@
 import click
+import json
 from typing import (
     Any,
+    Optional,
+    Union,
 )
-import requests
+from web3.exceptions import TransactionNotFound
 from scripts import cli_options
+from scripts.helpers.etherlink.subscriptions import (
+    EthSubscriptions,
+    is_websocket_url,
+)
+from scripts.helpers.etherlink.withdrawal_events import (
+    decode_withdrawal_log,
+    get_withdrawal_logs,
+    stream_withdrawal_events,
+)
+from scripts.helpers.tracing import start_span
+from scripts.helpers.utility import get_etherlink_web3
+from scripts.helpers.withdrawal_store import WithdrawalStore
+
+
+def follow_withdrawal_events(
+    etherlink_rpc_url: str,
+    kernel_address: str,
+    from_block: Optional[int],
+    chunk_size: int,
+    withdrawal_store: Optional[str],
+) -> None:
+    """Prints withdrawal events from the `logs` subscription until the
+    connection is closed. Subscription is made before reading the block
+    range, so no events are missed between the range and the stream"""
+
+    if not is_websocket_url(etherlink_rpc_url):
+        raise click.BadParameter(
+            'WebSocket URL is required to follow events', param_hint='--etherlink-rpc-url'
+        )
+
+    def handle(event: dict[str, Any]) -> None:
+        click.echo(json.dumps(event))
+        if withdrawal_store is not None:
+            with WithdrawalStore(withdrawal_store) as store:
+                store.record_event(event)
+
+    with EthSubscriptions(etherlink_rpc_url) as client:
+        events = stream_withdrawal_events(client, kernel_address)
+        last_block = -1
+        if from_block is not None:
+            web3 = get_etherlink_web3(etherlink_rpc_url)
+            last_block = web3.eth.block_number
+            for event in get_withdrawal_logs(web3, kernel_address, from_block, last_block, chunk_size):
+                handle(event)
+        for event in events:
+            if event['block_number'] > last_block:
+                handle(event)
 
 
 @click.command()
 @click.option(
     '--tx-hash',
-    required=True,
-    prompt='Transaction hash',
+    default=None,
     help='The hash of the transaction which called withdraw function.',
 )
+@click.option(
+    '--from-block',
+    default=None,
+    type=int,
+    help='Parse all withdrawal events starting from this block instead of the single transaction.',
+)
+@click.option(
+    '--to-block',
+    default=None,
+    type=int,
+    help='The last block of the range, the latest block if not set.',
+)
+@click.option(
+    '--chunk-size',
+    default=1000,
+    show_default=True,
+    help='Max number of blocks in one `eth_getLogs` request, it is reduced if the node rejects the result size.',
+)
+@click.option(
+    '--follow',
+    is_flag=True,
+    default=False,
+    help='Keep printing new withdrawal events as they are pushed by the node, requires WebSocket `--etherlink-rpc-url` (`ws://` or `wss://`).',
+)
 @cli_options.etherlink_rpc_url
 @cli_options.kernel_address
+@cli_options.withdrawal_store
+@cli_options.rpc_metrics
+@cli_options.trace_file
+@cli_options.profile
 def parse_withdrawal_event(
-    tx_hash: str, etherlink_rpc_url: str, kernel_address: str
-) -> dict[str, Any]:
-    """Parses the withdrawal event from the transaction receipt"""
-
-    # TODO: replace this logic with web3.py, there should be a way to parse events
-    result = requests.post(
-        etherlink_rpc_url,
-        json={
-            'jsonrpc': '2.0',
-            'method': 'eth_getTransactionReceipt',
-            'params': [tx_hash],
-            'id': 1,
-        },
-    )
-
-    if result.status_code != 200:
-        print(result.text)
-        return {'error': result.text}
-
-    receipt = result.json()['result']
-
-    if receipt is None:
-        print('Transaction not found')
-        return {'error': 'Transaction not found'}
+    etherlink_rpc_url: str,
+    kernel_address: str,
+    tx_hash: Optional[str] = None,
+    from_block: Optional[int] = None,
+    to_block: Optional[int] = None,
+    chunk_size: int = 1000,
+    follow: bool = False,
+    withdrawal_store: Optional[str] = None,
+) -> Union[dict[str, Any], list[dict[str, Any]]]:
+    """Parses the withdrawal event from the transaction receipt or all
+    withdrawal events in the block range (one JSON object per line)"""
+
+    if follow:
+        follow_withdrawal_events(
+            etherlink_rpc_url, kernel_address, from_block, chunk_size, withdrawal_store
+        )
+        return []
+
+    if from_block is not None:
+        web3 = get_etherlink_web3(etherlink_rpc_url)
+        to_block = web3.eth.block_number if to_block is None else to_block
+        events = []
+        with start_span('fetch_logs', chain='etherlink', from_block=from_block, to_block=to_block):
+            for event in get_withdrawal_logs(web3, kernel_address, from_block, to_block, chunk_size):
+                click.echo(json.dumps(event))
+                events.append(event)
+        if withdrawal_store is not None:
+            with WithdrawalStore(withdrawal_store) as store:
+                for event in events:
+                    store.record_event(event)
+        return events
+
+    if tx_hash is None:
+        tx_hash = click.prompt('Transaction hash')
+
+    # NOTE: web3 works with the HTTP, WebSocket and comma-separated URLs:
+    web3 = get_etherlink_web3(etherlink_rpc_url)
+    with start_span('fetch_receipt', chain='etherlink', tx_hash=tx_hash):
+        try:
+            receipt = web3.eth.get_transaction_receipt(tx_hash)  # type: ignore
+        except TransactionNotFound:
+            click.echo('Transaction not found')
+            return {'error': 'Transaction not found'}
 
     logs = receipt['logs']
 
@@ -48,18 +144,20 @@ def parse_withdrawal_event(
         raise click.Abort()
 
     # NOTE: the order of logs is not determined, so we need to find the kernel log:
-    kernel_logs = [log for log in logs if log['address'] == kernel_address]
+    kernel_logs = [log for log in logs if log['address'].lower() == kernel_address.lower()]
     if len(kernel_logs) == 0:
         click.echo('There are logs, but no kernel logs found')
         raise click.Abort()
 
     assert len(kernel_logs) == 1, 'Multiple kernel logs found'
-    data = kernel_logs[0]['data']
-    outbox_level = int(data[-128:-64], 16)
-    outbox_index = int(data[-64:], 16)
+    event = decode_withdrawal_log(kernel_logs[0])
+    outbox_level, outbox_index = event['outbox_level'], event['outbox_index']
 
-    print(f'outbox_level: {outbox_level}')
-    print(f'outbox_index: {outbox_index}')
+    click.echo(f'outbox_level: {outbox_level}')
+    click.echo(f'outbox_index: {outbox_index}')
+    if withdrawal_store is not None:
+        with WithdrawalStore(withdrawal_store) as store:
+            store.record_event(event)
     return {
         'outbox_level': outbox_level,
         'outbox_index': outbox_index,
@@ -1,8 +1,10 @@
 import click
 import subprocess
+from scripts import cli_options
 
 
 @click.command()
+@cli_options.profile
 def test_contracts() -> None:
     """Runs tests for contracts"""
 
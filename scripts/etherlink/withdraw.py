@@ -1,4 +1,5 @@
 import click
+from typing import Optional
 from web3.types import HexBytes  # type: ignore
 from scripts.helpers.utility import (
     get_etherlink_web3,
@@ -12,6 +13,7 @@ from scripts.helpers.formatting import (
     format_int,
 )
 from scripts.helpers.etherlink import FaWithdrawalPrecompileHelper
+from scripts.helpers.withdrawal_store import WithdrawalStore
 from scripts import cli_options
 
 
@@ -27,7 +29,11 @@ from scripts import cli_options
 @cli_options.withdraw_precompile
 @cli_options.etherlink_private_key
 @cli_options.etherlink_rpc_url
+@cli_options.withdrawal_store
+@cli_options.rpc_metrics
+@cli_options.trace_file
 # TODO: consider renaming to fa_withdraw
+@cli_options.profile
 def withdraw(
     erc20_proxy_address: str,
     tezos_side_router_address: str,
@@ -40,6 +46,7 @@ def withdraw(
     withdraw_precompile: str,
     etherlink_private_key: str,
     etherlink_rpc_url: str,
+    withdrawal_store: Optional[str] = None,
 ) -> str:
     """Withdraws provided wrapped FA token (ERC20) from L2 back to L1"""
 
@@ -85,4 +92,16 @@ def withdraw(
     click.echo(
         'Successfully initiated FA withdrawal, tx hash: ' + wrap(accent(tx_hash.hex()))
     )
+    if withdrawal_store is not None:
+        with WithdrawalStore(withdrawal_store) as store:
+            store.record_withdrawal(
+                tx_hash.hex(),
+                sender=account.address,
+                ticket_owner=erc20_proxy_address,
+                receiver=receiver_address,
+                proxy=tezos_side_router_address,
+                amount=amount,
+                ticketer_bytes=ticketer.hex(),
+                content_bytes=content.hex(),
+            )
     return tx_hash.hex()
@@ -27,6 +27,9 @@ from scripts import cli_options
 @cli_options.xtz_withdraw_precompile
 @cli_options.etherlink_private_key
 @cli_options.etherlink_rpc_url
+@cli_options.rpc_metrics
+@cli_options.trace_file
+@cli_options.profile
 def xtz_withdraw(
     amount: int,
     receiver_address: str,
@@ -0,0 +1,4 @@
+# NOTE: contracts helpers are loaded first, they import `addressable` which
+# imports contracts back, so entering this cycle from `addressable` (or from
+# `ticket` and rollup node helpers importing it) fails with ImportError:
+import scripts.helpers.contracts  # noqa: F401
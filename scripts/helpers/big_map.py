@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+import requests
+from pytezos.client import PyTezosClient
+from pytezos.contract.interface import ContractInterface
+from pytezos.michelson.types.big_map import BigMapType
+from scripts.helpers.endpoint_pool import EndpointPool, PooledRpcNode
+
+
+# Number of big_map values requested from the node at once:
+DEFAULT_CONCURRENCY = 32
+
+
+def get_block_hash(client: PyTezosClient, block: str = 'head') -> str:
+    """Resolves block alias (`head`, level, `head~N`) to the block hash, so
+    all following requests read the same block while the chain moves on"""
+
+    block_hash: str = client.shell.blocks[block].hash()
+    return block_hash
+
+
+def get_storage_big_map(
+    client: PyTezosClient,
+    contract: ContractInterface,
+    address: str,
+    name: str,
+    block: str = 'head',
+) -> BigMapType:
+    """Reads storage of the contract at the given block and returns its
+    big_map field with the given name, which has the big_map id and the
+    key/value types"""
+
+    storage = client.shell.blocks[block].context.contracts[address].storage()
+    big_map = type(contract.storage.data).from_micheline_value(storage)[name]
+    if not isinstance(big_map, BigMapType):
+        raise ValueError(f'Storage field `{name}` is not a big_map')
+    return big_map
+
+
+def get_big_map_values(
+    client: PyTezosClient,
+    big_map: BigMapType,
+    keys: list[Any],
+    block: str = 'head',
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[Optional[Any]]:
+    """Reads values of the big_map for many keys at the given block. Key
+    hashes are computed locally and values are requested from the node
+    concurrently, one keep-alive session per worker. Returns values as
+    Python objects in the order of the keys, None for missing keys"""
+
+    node = client.shell.node
+    # NOTE: requests go through the endpoint pool if the client has one,
+    # so they fail over to the healthy node:
+    pool = node.pool if isinstance(node, PooledRpcNode) else EndpointPool(node.uri[:1])
+    path = f'chains/main/blocks/{block}/context/big_maps/{big_map.ptr}'
+    key_hashes = [big_map.get_key_hash(key) for key in keys]
+    value_type = big_map.args[1]
+    local = threading.local()
+
+    def fetch(key_hash: str) -> Optional[Any]:
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        response = pool.get(f'{path}/{key_hash}', session=local.session, keep_base_path=True)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return value_type.from_micheline_value(response.json()).to_python_object()
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(fetch, key_hashes))
@@ -0,0 +1,111 @@
+from collections import deque
+from typing import Sequence
+
+from pytezos.client import PyTezosClient
+from pytezos.operation.forge import forge_operation
+from pytezos.operation.group import OperationGroup
+from pytezos.rpc.errors import RpcError
+
+from scripts.helpers.utility import (
+    find_op_by_hash,
+    get_addresses_from_op,
+    pkh,
+)
+
+
+# Protocol limit for the size of the forged operation group in bytes:
+MAX_OPERATION_DATA_LENGTH = 32 * 1024
+
+# Reserve for the branch and signature of the group:
+GROUP_SIZE_RESERVE = 32 + 64
+
+# Reserve for the fee, counter, gas and storage limits of each content which
+# are zeroes until the group is autofilled:
+CONTENT_SIZE_RESERVE = 32
+
+
+def estimate_content_size(client: PyTezosClient, content: dict) -> int:
+    """Estimates the size of the forged operation content before autofill"""
+
+    forged = forge_operation({**content, 'source': pkh(client)})
+    return len(forged) + CONTENT_SIZE_RESERVE
+
+
+def chunk_operations(
+    client: PyTezosClient,
+    operations: Sequence[OperationGroup],
+    max_size: int = MAX_OPERATION_DATA_LENGTH,
+) -> list[list[OperationGroup]]:
+    """Splits given operations into as few chunks as the operation group
+    size limit allows, keeping the order of the operations"""
+
+    chunks: list[list[OperationGroup]] = []
+    chunk: list[OperationGroup] = []
+    chunk_size = GROUP_SIZE_RESERVE
+
+    for operation in operations:
+        size = sum(estimate_content_size(client, c) for c in operation.contents)
+        if chunk and chunk_size + size > max_size:
+            chunks.append(chunk)
+            chunk, chunk_size = [], GROUP_SIZE_RESERVE
+        chunk.append(operation)
+        chunk_size += size
+
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def is_gas_limit_error(error: RpcError) -> bool:
+    """Checks if the simulation failed because the group exceeds gas limits"""
+
+    return 'gas_exhausted' in str(error) or 'gas_limit_too_high' in str(error)
+
+
+def send_packed(
+    client: PyTezosClient,
+    operations: Sequence[OperationGroup],
+    max_size: int = MAX_OPERATION_DATA_LENGTH,
+) -> list[dict]:
+    """Sends given operations packed into as few operation groups as the size
+    and gas limits allow and returns included operation dicts in the order.
+
+    NOTE: the mempool admits one manager operation group per source per block,
+    so the groups are sent one after another, each waiting for inclusion.
+    If the group simulation exceeds gas limits, it is split in two halves."""
+
+    chunks = deque(chunk_operations(client, operations, max_size))
+    included: list[dict] = []
+
+    while chunks:
+        chunk = chunks.popleft()
+        try:
+            opg = client.bulk(*chunk).send()
+        except RpcError as error:
+            if len(chunk) == 1 or not is_gas_limit_error(error):
+                raise
+            middle = len(chunk) // 2
+            chunks.extendleft([chunk[middle:], chunk[:middle]])
+            continue
+
+        client.wait(opg)
+        included.append(find_op_by_hash(client, opg))
+
+    return included
+
+
+def originate_many(
+    client: PyTezosClient,
+    originations: Sequence[OperationGroup],
+    max_size: int = MAX_OPERATION_DATA_LENGTH,
+) -> list[str]:
+    """Deploys contracts from given origination operation groups packed
+    into as few operation groups as possible. Returns originated addresses
+    in the same order as the originations were provided"""
+
+    included = send_packed(client, originations, max_size)
+    addresses = [
+        address for op in included for address in get_addresses_from_op(op)
+    ]
+    assert len(addresses) == len(originations), 'unexpected originations count'
+    return addresses
@@ -1,18 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
 from os.path import join
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from pytezos.client import PyTezosClient
 from pytezos.contract.call import ContractCall
+from pytezos.contract.interface import ContractInterface
 from pytezos.operation.group import OperationGroup
 
 from scripts.helpers.addressable import Addressable
+from scripts.helpers.big_map import (
+    DEFAULT_CONCURRENCY,
+    get_block_hash,
+)
 from scripts.helpers.contracts.contract import ContractHelper
 from scripts.helpers.contracts.tokens import TokenHelper
 from scripts.helpers.contracts.tokens import TokenInfo
 from scripts.helpers.metadata import Metadata
+from scripts.helpers.offline_views import (
+    OfflineViews,
+    get_storage_micheline,
+)
 from scripts.helpers.ticket import Ticket
 from scripts.helpers.ticket_content import TicketContent
 from scripts.helpers.utility import get_build_dir
+from scripts.helpers.utility import load_contract_interface
 from scripts.helpers.utility import originate_from_file
 
 
@@ -103,6 +114,45 @@ class Ticketer(ContractHelper):
 
         return self.contract.get_token().run_view()  # type: ignore
 
+    def get_offline_views(self, block: str = 'head') -> OfflineViews:
+        """Reads storage once and returns views evaluator which runs
+        `get_total_supply`, `get_content` and `get_token` locally"""
+
+        return OfflineViews.from_address(self.client, self.contract, self.address, block)
+
+    @staticmethod
+    def load_contract() -> ContractInterface:
+        """Returns Ticketer contract interface from the build directory"""
+
+        return load_contract_interface(join(get_build_dir(), 'ticketer.tz'))
+
+    @classmethod
+    def read_views_many(
+        cls,
+        client: PyTezosClient,
+        addresses: Iterable[str],
+        block: str = 'head',
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[str, dict[str, Any]]:
+        """Returns results of all views of many Ticketers at the same block:
+        storages are read concurrently, one request per Ticketer, and views
+        are evaluated locally with the Ticketer code from the build dir"""
+
+        contract = cls.load_contract()
+        addresses = list(dict.fromkeys(addresses))
+        block_hash = get_block_hash(client, block)
+        with ThreadPoolExecutor(concurrency) as executor:
+            storages = list(
+                executor.map(
+                    lambda address: get_storage_micheline(client, address, block_hash),
+                    addresses,
+                )
+            )
+        return {
+            address: OfflineViews.from_micheline(contract, storage).run_all()
+            for address, storage in zip(addresses, storages)
+        }
+
     def get_content_bytes_hex(self) -> str:
         """Returns content of the ticketer as bytes hex string"""
 
@@ -49,20 +49,3 @@ class CtezToken(FA12):
         storage['token_metadata'] = {token_id: (token_id, token_info)}
         storage['total_supply'] = sum(balances.values())
         return originate_from_file(filename, client, storage)
-
-    def get_balance(
-        self,
-        client_or_contract: Addressable,
-    ) -> int:
-        """Returns balance of given address.
-        NOTE: this is the implementation only works with Ctez token.
-        TODO: consider make special implementations for different FA1.2 tokens.
-        """
-
-        address = get_address(client_or_contract)
-        try:
-            balance = self.contract.storage['ledger'][address]()
-        except KeyError:
-            balance = 0
-        assert isinstance(balance, int)
-        return balance
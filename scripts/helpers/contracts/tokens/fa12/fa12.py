@@ -1,3 +1,4 @@
+from typing import Any
 from scripts.helpers.contracts.tokens.token import TokenHelper
 from pytezos.client import PyTezosClient
 from pytezos.contract.call import ContractCall
@@ -48,7 +49,21 @@ class FA12(TokenHelper):
         }
 
     def get_balance(self, client_or_contract: Addressable) -> int:
-        raise NotImplementedError("FA1.2 generic get_balance not implemented")
+        address = get_address(client_or_contract)
+        return self.get_balances([address], concurrency=1)[address]
+
+    def make_ledger_key(self, address: str) -> str:
+        return address
+
+    def parse_ledger_value(self, value: Any) -> int:
+        # NOTE: some FA1.2 ledgers keep allowances next to the balance:
+        # `big_map address (pair (nat %balance) (map %approvals address nat))`
+        if isinstance(value, dict):
+            value = value['balance']
+        elif isinstance(value, tuple):
+            value = value[0]
+        assert isinstance(value, int)
+        return value
 
     @classmethod
     def originate(
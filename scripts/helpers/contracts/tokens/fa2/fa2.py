@@ -1,3 +1,4 @@
+from typing import Any
 from pytezos.client import PyTezosClient
 from pytezos.contract.call import ContractCall
 from pytezos.operation.group import OperationGroup
@@ -56,6 +57,13 @@ class FA2(TokenHelper):
         assert isinstance(balance, int)
         return balance
 
+    def make_ledger_key(self, address: str) -> tuple[str, int]:
+        return (address, self.token_id)
+
+    def parse_ledger_value(self, value: Any) -> int:
+        assert isinstance(value, int)
+        return value
+
     def make_token_info(self) -> dict[str, str]:
         return {
             'contract_address': self.address,
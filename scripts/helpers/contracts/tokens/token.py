@@ -1,18 +1,28 @@
 from abc import abstractmethod
 from scripts.helpers.contracts.contract import ContractHelper
 from pytezos.contract.call import ContractCall
-from scripts.helpers.utility import pack
-from typing import Optional, Type
+from scripts.helpers.utility import pack_string_bytes_map
+from typing import Any, Iterable, Optional, Type
 from pytezos.operation.group import OperationGroup
 from pytezos.client import PyTezosClient
 from dataclasses import dataclass
-from scripts.helpers.addressable import Addressable
+from scripts.helpers.addressable import (
+    Addressable,
+    get_address,
+)
+from scripts.helpers.big_map import (
+    DEFAULT_CONCURRENCY,
+    get_big_map_values,
+    get_block_hash,
+    get_storage_big_map,
+)
 
 
 TicketContent = tuple[int, Optional[bytes]]
 TokenInfo = Optional[dict[str, str]]
 
-# Map token info type is the same as token info metadata in FA2:
+# Map token info type is the same as token info metadata in FA2, it is
+# packed with `pack_string_bytes_map` which gives the same bytes:
 MAP_TOKEN_INFO_TYPE = 'map %token_info string bytes'
 
 
@@ -45,9 +55,39 @@ class TokenHelper(ContractHelper):
     @abstractmethod
     def get_balance(self, client_or_contract: Addressable) -> int: ...
 
+    @abstractmethod
+    def make_ledger_key(self, address: str) -> Any:
+        """Returns key of the `ledger` big_map for the given owner"""
+
+    @abstractmethod
+    def parse_ledger_value(self, value: Any) -> int:
+        """Returns balance from the `ledger` big_map value"""
+
     @abstractmethod
     def make_token_info(self) -> dict[str, str]: ...
 
+    def get_balances(
+        self,
+        owners: Iterable[Addressable],
+        block: str = 'head',
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[str, int]:
+        """Returns balances of many owners read from the `ledger` big_map at
+        the same block: the block and the big_map id are resolved once,
+        key hashes are computed locally and values are fetched concurrently"""
+
+        addresses = list(dict.fromkeys(get_address(owner) for owner in owners))
+        block_hash = get_block_hash(self.client, block)
+        ledger = get_storage_big_map(
+            self.client, self.contract, self.address, 'ledger', block_hash
+        )
+        keys = [self.make_ledger_key(address) for address in addresses]
+        values = get_big_map_values(self.client, ledger, keys, block_hash, concurrency)
+        return {
+            address: 0 if value is None else self.parse_ledger_value(value)
+            for address, value in zip(addresses, values)
+        }
+
     def make_token_info_bytes(
         self,
         extra_token_info: Optional[TokenInfo] = None,
@@ -65,7 +105,7 @@ class TokenHelper(ContractHelper):
             key: value.encode('utf-8') for key, value in token_info.items()
         }
 
-        return pack(token_info_bytes, MAP_TOKEN_INFO_TYPE)
+        return pack_string_bytes_map(token_info_bytes)
 
     @classmethod
     def from_dict(cls, client: PyTezosClient, token_dict: dict) -> 'TokenHelper':
@@ -0,0 +1,273 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+from pytezos.client import PyTezosClient
+from pytezos.michelson.forge import unforge_address
+from web3 import Web3
+from scripts.helpers.etherlink.subscriptions import (
+    EthSubscriptions,
+    stream_logs,
+)
+from scripts.helpers.etherlink.logs import (
+    get_logs_in_chunks,
+    to_hex,
+    to_int,
+)
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+# Deposit event emitted by the ERC20 proxies, see `IDepositEvent.sol`:
+DEPOSIT_EVENT_SIGNATURE = 'Deposit(uint256,address,address,uint256,uint256,uint256)'
+DEPOSIT_EVENT_TOPIC = Web3.keccak(text=DEPOSIT_EVENT_SIGNATURE).hex()
+
+# Manager operations validation pass in the block operations list:
+MANAGER_OPERATIONS_PASS = 3
+
+# Deposit is matched with the event by inbox level, ticket hash, receiver
+# and amount; deposits with the same key are matched in the inbox order:
+DepositKey = tuple[int, int, str, int]
+
+
+@dataclass
+class L1Deposit:
+    operation_hash: str
+    level: int
+    # Position of the internal transaction in the block, it defines the order
+    # of the messages in the rollup inbox:
+    position: tuple[int, int, int]
+    ticketer: str
+    content: TicketContent
+    amount: int
+    receiver: str
+    router: Optional[str]
+
+    @property
+    def ticket_hash(self) -> int:
+        ticket = Ticket(self.ticketer, self.ticketer, self.content, self.amount)
+        return ticket.hash()
+
+    @property
+    def key(self) -> DepositKey:
+        return (self.level, self.ticket_hash, self.receiver, self.amount)
+
+
+@dataclass
+class DepositMatch:
+    deposit: L1Deposit
+    event: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'operation_hash': self.deposit.operation_hash,
+            'level': self.deposit.level,
+            'ticketer': self.deposit.ticketer,
+            'token_id': self.deposit.content.token_id,
+            **self.event,
+            'ticket_hash': f'{self.event["ticket_hash"]:064x}',
+        }
+
+
+def flatten_comb(micheline: dict[str, Any]) -> list[dict[str, Any]]:
+    """Returns arguments of the right comb pair: `Pair a (Pair b c)` and
+    `Pair a b c` both give `[a, b, c]`"""
+
+    args = list(micheline['args'])
+    while args[-1].get('prim') == 'Pair' and len(args) < 3:
+        args = args[:-1] + list(args[-1]['args'])
+    return args
+
+
+def decode_address(micheline: dict[str, Any]) -> str:
+    if 'string' in micheline:
+        return str(micheline['string'])
+    return str(unforge_address(bytes.fromhex(micheline['bytes'])))
+
+
+def decode_rollup_deposit(value: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Decodes `Pair routing_info ticket` sent to the Etherlink rollup,
+    unwrapping the `Left` / `Right` of the rollup parameter type. Routing
+    info is the receiver address optionally followed by the router (ERC20
+    proxy) address"""
+
+    while value.get('prim') in ('Left', 'Right'):
+        value = value['args'][0]
+    if value.get('prim') != 'Pair' or 'bytes' not in value['args'][0]:
+        return None
+    routing_info = bytes.fromhex(value['args'][0]['bytes'])
+    ticketer, content, amount = flatten_comb(value['args'][1])
+    return {
+        'ticketer': decode_address(ticketer),
+        'content': TicketContent.from_micheline(content),
+        'amount': int(amount['int']),
+        'receiver': '0x' + routing_info[:20].hex(),
+        'router': '0x' + routing_info[20:40].hex() if len(routing_info) >= 40 else None,
+    }
+
+
+def find_rollup_deposits(
+    operation: dict[str, Any],
+    level: int,
+    operation_index: int,
+    smart_rollup_address: str,
+) -> list[L1Deposit]:
+    """Finds all applied internal transactions sending tickets to the rollup
+    in the operation from the block at the given level"""
+
+    deposits = []
+    for content_index, content in enumerate(operation['contents']):
+        results = content.get('metadata', {}).get('internal_operation_results', [])
+        for internal_index, result in enumerate(results):
+            if result.get('kind') != 'transaction':
+                continue
+            if result.get('destination') != smart_rollup_address:
+                continue
+            if result.get('result', {}).get('status') != 'applied':
+                continue
+            decoded = decode_rollup_deposit(result['parameters']['value'])
+            if decoded is None:
+                continue
+            deposits.append(
+                L1Deposit(
+                    operation_hash=operation['hash'],
+                    level=level,
+                    position=(operation_index, content_index, internal_index),
+                    **decoded,
+                )
+            )
+    return deposits
+
+
+def decode_deposit_log(log: Any) -> dict[str, Any]:
+    """Decodes ERC20 proxy deposit log, see `IDepositEvent.sol`"""
+
+    data = to_hex(log['data'])[2:]
+    words = [data[i : i + 64] for i in range(0, len(data), 64)]
+    if len(words) != 5:
+        raise ValueError('Unexpected deposit event data size')
+
+    return {
+        'transaction_hash': to_hex(log['transactionHash']),
+        'block_number': to_int(log['blockNumber']),
+        'log_index': to_int(log['logIndex']),
+        'ticket_hash': int(to_hex(log['topics'][1]), 16),
+        'ticket_owner': Web3.to_checksum_address('0x' + words[0][24:]),
+        'receiver': Web3.to_checksum_address('0x' + words[1][24:]),
+        'amount': int(words[2], 16),
+        'inbox_level': int(words[3], 16),
+        'inbox_msg_id': int(words[4], 16),
+    }
+
+
+def stream_deposit_events(client: EthSubscriptions) -> Iterator[dict[str, Any]]:
+    """Subscribes to deposit events of all ERC20 proxies and returns the
+    iterator over decoded events as they are pushed by the node"""
+
+    logs = stream_logs(client, {'topics': [DEPOSIT_EVENT_TOPIC]})
+    return (decode_deposit_log(log) for log in logs)
+
+
+class DepositTracker:
+    """Matches L1 deposit operations with L2 deposit events. Pending deposits
+    are indexed by (inbox level, ticket hash, receiver, amount), so the L2
+    logs are matched in one streaming pass regardless of the number of
+    deposits in flight.
+
+    NOTE: XTZ deposits (routing info without the ERC20 proxy) are minted
+    by the kernel as native balance and emit no deposit event, so they are
+    kept in `unmatchable` and never waited for"""
+
+    def __init__(self, smart_rollup_address: str):
+        self.smart_rollup_address = smart_rollup_address
+        self._pending: dict[DepositKey, deque[L1Deposit]] = defaultdict(deque)
+        self.unmatchable: list[L1Deposit] = []
+
+    @property
+    def pending(self) -> list[L1Deposit]:
+        return [deposit for deposits in self._pending.values() for deposit in deposits]
+
+    def add(self, deposit: L1Deposit) -> None:
+        if deposit.router is None:
+            self.unmatchable.append(deposit)
+            return
+        deposits = self._pending[deposit.key]
+        deposits.append(deposit)
+        if len(deposits) > 1 and deposits[-2].position > deposit.position:
+            # NOTE: deposits with the same key are kept in the inbox order
+            self._pending[deposit.key] = deque(sorted(deposits, key=lambda d: d.position))
+
+    def add_operations(
+        self,
+        client: PyTezosClient,
+        operation_hashes: Iterable[str],
+        from_level: int,
+        to_level: int,
+    ) -> set[str]:
+        """Scans manager operations of the blocks in the level range once and
+        adds rollup deposits of the given operations, returns hashes which
+        were not found"""
+
+        missing = set(operation_hashes)
+        for level in range(from_level, to_level + 1):
+            if not missing:
+                break
+            block = client.shell.blocks[level]
+            hashes = block.operation_hashes[MANAGER_OPERATIONS_PASS]()
+            for index, operation_hash in enumerate(hashes):
+                if operation_hash not in missing:
+                    continue
+                operation = block.operations[MANAGER_OPERATIONS_PASS][index]()
+                for deposit in find_rollup_deposits(
+                    operation, level, index, self.smart_rollup_address
+                ):
+                    self.add(deposit)
+                missing.discard(operation_hash)
+        return missing
+
+    def match(self, events: Iterable[dict[str, Any]]) -> Iterator[DepositMatch]:
+        """Matches decoded deposit events with pending deposits, events are
+        expected in the L2 order (block number, log index)"""
+
+        for event in events:
+            key = (
+                event['inbox_level'],
+                event['ticket_hash'],
+                event['receiver'].lower(),
+                event['amount'],
+            )
+            deposits = self._pending.get(key)
+            if not deposits:
+                continue
+            deposit = deposits.popleft()
+            if not deposits:
+                del self._pending[key]
+            yield DepositMatch(deposit=deposit, event=event)
+
+    def match_logs(
+        self,
+        web3: Web3,
+        from_block: int,
+        to_block: int,
+        chunk_size: int = 1000,
+    ) -> Iterator[DepositMatch]:
+        """Streams deposit events of all ERC20 proxies from the block range
+        and matches them with pending deposits"""
+
+        logs = get_logs_in_chunks(
+            web3, {'topics': [DEPOSIT_EVENT_TOPIC]}, from_block, to_block, chunk_size
+        )
+        events = (decode_deposit_log(log) for log in logs)
+        for deposit_match in self.match(events):
+            yield deposit_match
+            if not self._pending:
+                return
+
+    def match_stream(self, events: Iterable[dict[str, Any]]) -> Iterator[DepositMatch]:
+        """Matches pushed deposit events until there are no pending deposits"""
+
+        if not self._pending:
+            return
+        for deposit_match in self.match(events):
+            yield deposit_match
+            if not self._pending:
+                return
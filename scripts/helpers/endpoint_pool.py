@@ -0,0 +1,344 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar
+from urllib.parse import urlencode, urlparse, urlunparse
+
+import requests
+from pytezos.rpc.node import (
+    RpcError,
+    RpcForbiddenError,
+    RpcNode,
+    RpcNotFoundError,
+)
+from web3 import HTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+
+T = TypeVar('T')
+
+# Set to `1` to enable hedged idempotent reads for pools made from URL lists:
+HEDGE_ENV_VAR = 'RPC_HEDGE'
+
+# Statuses of proxies and load balancers in front of the overloaded or
+# restarting node, the request is repeated on the next endpoint:
+UNAVAILABLE_STATUSES = (502, 503, 504)
+
+# Default timeout of pytezos and rollup node RPC requests, the request which
+# timed out is repeated on the next endpoint:
+TEZOS_RPC_TIMEOUT = 60
+
+# Hedge delay used until the endpoint has enough latency samples for p95:
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_SAMPLES = 10
+LATENCY_SAMPLES = 100
+EWMA_ALPHA = 0.3
+
+# Failed endpoint is skipped for the cooldown, doubled on each consecutive
+# failure (but still tried as the last resort if all endpoints failed):
+BASE_COOLDOWN = 5.0
+MAX_COOLDOWN = 300.0
+
+# Etherlink methods which must not be sent twice (all other are reads):
+NON_IDEMPOTENT_METHODS = ('eth_sendRawTransaction', 'eth_sendTransaction')
+
+# NOTE: hedged requests outlive the call which returned the faster result,
+# so they run in the shared executor instead of the one per call:
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hedge')
+
+
+class EndpointUnavailable(Exception):
+    def __init__(self, url: str, status: int):
+        super().__init__(f'Endpoint {url} is unavailable: HTTP {status}')
+        self.url = url
+        self.status = status
+
+
+def is_unavailable(error: Exception) -> bool:
+    """Returns True if the request failed because of the endpoint (network
+    error, timeout, gateway error) and should be repeated on another one.
+    Node errors (404, failed simulation) are valid responses"""
+
+    if isinstance(error, (EndpointUnavailable, requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in UNAVAILABLE_STATUSES
+    return False
+
+
+def is_unavailable_future(future: Future[Any]) -> bool:
+    if not future.done():
+        return False
+    error = future.exception()
+    return error is not None and is_unavailable(error)  # type: ignore
+
+
+def parse_urls(urls: str) -> list[str]:
+    """Splits comma-separated list of endpoints"""
+
+    result = [url.strip() for url in urls.split(',') if url.strip()]
+    if not result:
+        raise ValueError('At least one endpoint URL is required')
+    return result
+
+
+def replace_path(url: str, path: str, params: Optional[dict[str, Any]] = None) -> str:
+    parts = urlparse(url)._replace(path=path, query=urlencode(params or {}))
+    return urlunparse(parts)
+
+
+def join_path(url: str, path: str, params: Optional[dict[str, Any]] = None) -> str:
+    """Appends the path to the endpoint URL keeping its own path, as Tezos
+    RPC endpoints are often served under a prefix (`/ghostnet/`)"""
+
+    parts = urlparse(url)
+    full_path = parts.path.rstrip('/') + '/' + path.lstrip('/')
+    return urlunparse(parts._replace(path=full_path, query=urlencode(params or {})))
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+    ewma: Optional[float] = None
+    failures: int = 0
+    unavailable_until: float = 0.0
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+
+class EndpointPool:
+    """Pool of interchangeable RPC endpoints of one chain. Each request goes
+    to the healthy endpoint picked at random with the weight inverse to its
+    average latency, and is repeated on the next endpoint if this one is
+    unavailable. With `hedge` enabled, idempotent reads are also sent to the
+    second endpoint if the first one has not answered within its p95
+    latency, and the first answer wins"""
+
+    def __init__(
+        self,
+        urls: list[str],
+        hedge: bool = False,
+        rng: Optional[random.Random] = None,
+    ):
+        if not urls:
+            raise ValueError('At least one endpoint URL is required')
+        self.urls = urls
+        self.hedge = hedge
+        self.stats = {url: EndpointStats(url) for url in urls}
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def record_success(self, url: str, duration: float) -> None:
+        with self._lock:
+            stats = self.stats[url]
+            stats.latencies.append(duration)
+            if stats.ewma is None:
+                stats.ewma = duration
+            else:
+                stats.ewma = EWMA_ALPHA * duration + (1 - EWMA_ALPHA) * stats.ewma
+            stats.failures = 0
+            stats.unavailable_until = 0.0
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            stats = self.stats[url]
+            stats.failures += 1
+            cooldown = min(BASE_COOLDOWN * 2 ** (stats.failures - 1), MAX_COOLDOWN)
+            stats.unavailable_until = time.monotonic() + cooldown
+
+    def is_healthy(self, url: str) -> bool:
+        return self.stats[url].unavailable_until <= time.monotonic()
+
+    def ranked(self) -> list[str]:
+        """Returns endpoints in the order they should be tried: healthy ones
+        shuffled with weights inverse to the latency, then the unhealthy
+        ones. Endpoints without samples are weighted with the mean latency
+        of the measured ones; until any endpoint is measured the configured
+        order is kept, so the first URL is the preferred one"""
+
+        with self._lock:
+            healthy = [url for url in self.urls if self.is_healthy(url)]
+            known = [self.stats[url].ewma for url in healthy if self.stats[url].ewma is not None]
+            mean = sum(known) / len(known) if known else None  # type: ignore
+
+            def key(url: str) -> float:
+                ewma = self.stats[url].ewma
+                if ewma is None:
+                    ewma = mean
+                # NOTE: weighted shuffle, `u ** (1 / weight)` with weight = 1 / ewma:
+                return float(self._rng.random() ** max(ewma or 0.0, 1e-6))
+
+            if mean is not None:
+                healthy = sorted(healthy, key=key, reverse=True)
+            unhealthy = sorted(
+                (url for url in self.urls if not self.is_healthy(url)),
+                key=lambda url: self.stats[url].unavailable_until,
+            )
+            return healthy + unhealthy
+
+    def hedge_delay(self, url: str) -> float:
+        with self._lock:
+            p95 = self.stats[url].p95()
+        return DEFAULT_HEDGE_DELAY if p95 is None else p95
+
+    def _call(self, send: Callable[[str], T], url: str) -> T:
+        started = time.perf_counter()
+        try:
+            result = send(url)
+            if isinstance(result, requests.Response):
+                if result.status_code in UNAVAILABLE_STATUSES:
+                    raise EndpointUnavailable(url, result.status_code)
+        except Exception as error:
+            if is_unavailable(error):
+                self.record_failure(url)
+            else:
+                self.record_success(url, time.perf_counter() - started)
+            raise
+        self.record_success(url, time.perf_counter() - started)
+        return result
+
+    def _hedged(self, send: Callable[[str], T], primary: str, secondary: str) -> T:
+        first = _hedge_executor.submit(self._call, send, primary)
+        done, _ = wait([first], timeout=self.hedge_delay(primary))
+        futures: list[Future[T]] = [first]
+        if not done or is_unavailable_future(first):
+            futures.append(_hedge_executor.submit(self._call, send, secondary))
+
+        pending = set(futures)
+        last_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result()
+                if not is_unavailable(error):  # type: ignore
+                    raise error
+                last_error = error  # type: ignore
+        assert last_error is not None
+        raise last_error
+
+    def request(self, send: Callable[[str], T], idempotent: bool = True) -> T:
+        """Calls `send` with the endpoint URL until one of the endpoints
+        answers, raises the last error if all of them are unavailable"""
+
+        urls = self.ranked()
+        last_error: Optional[Exception] = None
+        if self.hedge and idempotent and len(urls) > 1:
+            try:
+                return self._hedged(send, urls[0], urls[1])
+            except Exception as error:
+                if not is_unavailable(error):
+                    raise
+                last_error, urls = error, urls[2:]
+
+        for url in urls:
+            try:
+                return self._call(send, url)
+            except Exception as error:
+                if not is_unavailable(error):
+                    raise
+                last_error = error
+        assert last_error is not None
+        raise last_error
+
+    def get(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        keep_base_path: bool = False,
+        timeout: float = TEZOS_RPC_TIMEOUT,
+    ) -> requests.Response:
+        """Makes GET request to the path, which replaces the path of the
+        endpoint URL or is appended to it if `keep_base_path` is set"""
+
+        make_url = join_path if keep_base_path else replace_path
+        http = session or requests
+        return self.request(lambda url: http.get(make_url(url, path, params), timeout=timeout))
+
+
+@lru_cache(maxsize=None)
+def get_endpoint_pool(urls: str, hedge: Optional[bool] = None) -> EndpointPool:
+    """Returns the pool for comma-separated list of endpoints, the same pool
+    is returned for the same list, so the health and latency stats are
+    shared by all clients of the process. Hedging is enabled by the
+    `RPC_HEDGE=1` environment variable if not set explicitly"""
+
+    if hedge is None:
+        hedge = os.getenv(HEDGE_ENV_VAR, '') == '1'
+    return EndpointPool(parse_urls(urls), hedge=hedge)
+
+
+class PooledRpcNode(RpcNode):
+    """pytezos RPC node sending each request through the endpoint pool.
+    GET requests and `helpers` (simulation, forging) are idempotent"""
+
+    def __init__(self, pool: EndpointPool, headers: Optional[dict[str, str]] = None):
+        self.pool = pool
+        self.headers = headers or {}
+
+    @property  # type: ignore
+    def uri(self) -> list[str]:
+        return self.pool.ranked()
+
+    def send(self, url: str, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """Same as `RpcNode.request` to one endpoint, but gateway errors are
+        raised as EndpointUnavailable (so the pool fails over) before they
+        are turned into RpcError, which has no HTTP status"""
+
+        timeout = kwargs.pop('timeout', None) or TEZOS_RPC_TIMEOUT
+        response = requests.request(
+            method=method,
+            url=join_path(url, path),
+            headers={'content-type': 'application/json', 'user-agent': 'PyTezos', **self.headers},
+            timeout=timeout,
+            **kwargs,
+        )
+        if response.status_code in UNAVAILABLE_STATUSES:
+            raise EndpointUnavailable(url, response.status_code)
+        if response.status_code in (401, 403):
+            raise RpcForbiddenError(f'{response.reason}: {path}')
+        if response.status_code == 404:
+            raise RpcNotFoundError(f'Not found: {path}')
+        if response.status_code != 200:
+            raise RpcError.from_response(response)
+        return response
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        idempotent = method == 'GET' or '/helpers/' in path
+        return self.pool.request(
+            lambda url: self.send(url, method, path, **kwargs),
+            idempotent=idempotent,
+        )
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """Web3 HTTP provider sending each JSON-RPC request through the endpoint
+    pool, all methods except sending transactions are idempotent"""
+
+    def __init__(self, pool: EndpointPool, request_kwargs: Optional[Any] = None):
+        self.pool = pool
+        self.providers = {url: HTTPProvider(url, request_kwargs) for url in pool.urls}
+        super().__init__(pool.urls[0], request_kwargs)
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        def send(url: str) -> RPCResponse:
+            return self.providers[url].make_request(method, params)
+
+        return self.pool.request(send, idempotent=method not in NON_IDEMPOTENT_METHODS)
@@ -8,6 +8,8 @@ from typing import Optional
 from hexbytes import HexBytes
 from typing import TypeVar, Type, Tuple, Any
 from web3.types import TxReceipt, TxParams
+from scripts.helpers.etherlink.subscriptions import wait_for_transaction_receipt
+from scripts.helpers.tracing import start_span
 
 
 def make_filename(contract_name: str) -> str:
@@ -96,9 +98,13 @@ class EvmContractHelper:
         return cls(contract=contract, web3=web3, account=account, address=address)
 
     def legacy_send(self, params: TxParams) -> TxReceipt:
-        signed_txn = self.web3.eth.account.sign_transaction(params, self.account.key)
-        txn_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        txn_receipt = self.web3.eth.wait_for_transaction_receipt(txn_hash)
+        with start_span('sign', chain='etherlink'):
+            signed_txn = self.web3.eth.account.sign_transaction(params, self.account.key)
+        with start_span('inject', chain='etherlink') as span:
+            txn_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            span.set_attribute('tx_hash', txn_hash.hex())
+        with start_span('wait_for_inclusion', chain='etherlink', tx_hash=txn_hash.hex()):
+            txn_receipt = wait_for_transaction_receipt(self.web3, txn_hash)
         return txn_receipt
 
     @classmethod
@@ -119,7 +125,7 @@ class EvmContractHelper:
             account=account,
             constructor=constructor,
         )
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = wait_for_transaction_receipt(web3, tx_hash)
         address = tx_receipt.contractAddress  # type: ignore
         contract = web3.eth.contract(address=address, abi=Contract.abi)
 
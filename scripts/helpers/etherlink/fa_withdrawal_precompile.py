@@ -3,6 +3,7 @@ from scripts.helpers.etherlink.contract import (
     EvmContractHelper,
     make_filename,
 )
+from scripts.helpers.tracing import start_span
 
 
 class FaWithdrawalPrecompileHelper(EvmContractHelper):
@@ -20,16 +21,18 @@ class FaWithdrawalPrecompileHelper(EvmContractHelper):
     ) -> TxReceipt:
         """Calls FA withdrawal precompile which allows to withdraw tokens from L2 to L1"""
 
-        call = self.contract.functions.withdraw(
-            ticket_owner, routing_info, amount, ticketer, content
-        )
+        # NOTE: building the transaction also estimates gas (simulation)
+        with start_span('build', chain='etherlink'):
+            call = self.contract.functions.withdraw(
+                ticket_owner, routing_info, amount, ticketer, content
+            )
 
-        transaction = call.build_transaction(
-            {
-                'from': self.account.address,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address),
-                'chainId': self.web3.eth.chain_id,
-            }
-        )
+            transaction = call.build_transaction(
+                {
+                    'from': self.account.address,
+                    'nonce': self.web3.eth.get_transaction_count(self.account.address),
+                    'chainId': self.web3.eth.chain_id,
+                }
+            )
 
         return self.legacy_send(transaction)
@@ -0,0 +1,75 @@
+from typing import Any, Iterator
+from web3 import Web3
+from web3.types import FilterParams, LogReceipt
+
+
+# Substrings of the errors returned by the nodes when `eth_getLogs` result
+# or block range exceeds the limits (geth, erigon, infura, alchemy, etc.):
+RESULT_SIZE_ERRORS = [
+    'query returned more than',
+    'block range',
+    'response size exceeded',
+]
+# EIP-1474 "Limit exceeded" code:
+LIMIT_EXCEEDED_CODE = -32005
+# "Invalid params" code, used by some providers for too wide block ranges:
+INVALID_PARAMS_CODE = -32602
+
+
+def to_hex(value: Any) -> str:
+    """Returns 0x-prefixed hex string of given HexBytes or str"""
+
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return str(value) if str(value).startswith('0x') else '0x' + str(value)
+
+
+def to_int(value: Any) -> int:
+    """Returns int from the int or hex string (raw JSON-RPC log)"""
+
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def is_result_size_error(error: Exception) -> bool:
+    """Checks if the node rejected `eth_getLogs` because of the result size
+    or the block range limits, so the request can be retried in chunks"""
+
+    # NOTE: web3 raises ValueError with the JSON-RPC error object as an arg:
+    rpc_error = error.args[0] if error.args and isinstance(error.args[0], dict) else {}
+    code = rpc_error.get('code')
+    message = str(rpc_error.get('message', error)).lower()
+    if code == LIMIT_EXCEEDED_CODE:
+        return True
+    if code == INVALID_PARAMS_CODE and 'range' in message:
+        return True
+    return any(substring in message for substring in RESULT_SIZE_ERRORS)
+
+
+def get_logs_in_chunks(
+    web3: Web3,
+    log_filter: dict[str, Any],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 1000,
+) -> Iterator[LogReceipt]:
+    """Yields logs matching the filter (address, topics) for the block range
+    requested in chunks: chunk is halved each time the node rejects the
+    request because of the result size and doubled back (up to
+    `chunk_size`) after each successful request"""
+
+    current_size = chunk_size
+    block = from_block
+    while block <= to_block:
+        last_block = min(block + current_size - 1, to_block)
+        params: FilterParams = {**log_filter, 'fromBlock': block, 'toBlock': last_block}  # type: ignore
+        try:
+            logs = web3.eth.get_logs(params)
+        except ValueError as error:
+            if current_size == 1 or not is_result_size_error(error):
+                raise
+            current_size = max(1, current_size // 2)
+            continue
+
+        yield from logs
+        block = last_block + 1
+        current_size = min(chunk_size, current_size * 2)
@@ -0,0 +1,289 @@
+import itertools
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Any, Iterator, Optional, Type
+
+from hexbytes import HexBytes
+from web3 import Web3, WebsocketProvider
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.types import TxReceipt
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RECEIPT_TIMEOUT = 120.0
+
+# Put into subscription queues when the connection is closed:
+_CLOSED = object()
+
+
+def is_websocket_url(url: str) -> bool:
+    return url.startswith(('ws://', 'wss://'))
+
+
+class Subscription:
+    """Stream of `eth_subscription` notifications of one subscription"""
+
+    def __init__(self, client: 'EthSubscriptions', kind: str):
+        self.client = client
+        self.kind = kind
+        self.id: Optional[str] = None
+        self.queue: queue.Queue[Any] = queue.Queue()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Returns the next notification, raises `queue.Empty` on timeout and
+        ConnectionError if the connection is closed"""
+
+        item = self.queue.get(timeout=timeout)
+        if item is _CLOSED:
+            self.queue.put(_CLOSED)
+            raise ConnectionError('WebSocket connection is closed')
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                yield self.get()
+            except ConnectionError:
+                return
+
+    def unsubscribe(self) -> None:
+        self.client.request('eth_unsubscribe', [self.id])
+        self.client.forget(self)
+
+
+class EthSubscriptions:
+    """JSON-RPC client over one WebSocket connection with `eth_subscribe`
+    support. The reader thread routes responses to the waiting requests and
+    push notifications to the subscription queues, so it can be shared by
+    many threads"""
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self._connection = connect(url, max_size=None)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._requests: dict[int, Future[Any]] = {}
+        # NOTE: subscription is registered by the reader thread when the
+        # `eth_subscribe` response arrives, so no notification is missed:
+        self._subscribing: dict[int, Subscription] = {}
+        self._subscriptions: dict[str, Subscription] = {}
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _send(
+        self,
+        method: str,
+        params: list[Any],
+        subscription: Optional[Subscription] = None,
+    ) -> Future[Any]:
+        future: Future[Any] = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._requests[request_id] = future
+            if subscription is not None:
+                self._subscribing[request_id] = subscription
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+        try:
+            self._connection.send(json.dumps(message))
+        except ConnectionClosed as error:
+            with self._lock:
+                self._requests.pop(request_id, None)
+                self._subscribing.pop(request_id, None)
+            raise ConnectionError('WebSocket connection is closed') from error
+        return future
+
+    def request(self, method: str, params: Optional[list[Any]] = None) -> Any:
+        return self._send(method, params or []).result(self.timeout)
+
+    def subscribe(self, kind: str, *params: Any) -> Subscription:
+        """Subscribes to `newHeads` or `logs` (with the filter param)"""
+
+        subscription = Subscription(self, kind)
+        self._send('eth_subscribe', [kind, *params], subscription).result(self.timeout)
+        return subscription
+
+    def forget(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.pop(subscription.id or '', None)
+
+    def _read(self) -> None:
+        try:
+            for raw in self._connection:
+                message = json.loads(raw)
+                if message.get('method') == 'eth_subscription':
+                    params = message['params']
+                    with self._lock:
+                        subscription = self._subscriptions.get(params['subscription'])
+                    if subscription is not None:
+                        subscription.queue.put(params['result'])
+                    continue
+
+                with self._lock:
+                    future = self._requests.pop(message['id'], None)
+                    subscription = self._subscribing.pop(message['id'], None)
+                    if subscription is not None and 'result' in message:
+                        subscription.id = message['result']
+                        self._subscriptions[message['result']] = subscription
+                if future is None:
+                    continue
+                if 'error' in message:
+                    future.set_exception(ValueError(message['error']))
+                else:
+                    future.set_result(message['result'])
+        except ConnectionClosed:
+            pass
+        finally:
+            with self._lock:
+                requests, self._requests = self._requests, {}
+                subscriptions, self._subscriptions = self._subscriptions, {}
+            for future in requests.values():
+                future.set_exception(ConnectionError('WebSocket connection is closed'))
+            for subscription in subscriptions.values():
+                subscription.queue.put(_CLOSED)
+
+    @property
+    def closed(self) -> bool:
+        return not self._reader.is_alive()
+
+    def close(self) -> None:
+        self._connection.close()
+        self._reader.join()
+
+    def __enter__(self) -> 'EthSubscriptions':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def format_receipt(receipt: dict[str, Any]) -> TxReceipt:
+    """Formats raw JSON-RPC receipt in the same way as web3 does"""
+
+    return AttributeDict.recursive(receipt_formatter(receipt))  # type: ignore
+
+
+class ReceiptWaiter:
+    """Waits for receipts of many transactions from one `newHeads`
+    subscription instead of polling each transaction: for each new block
+    its transaction hashes are matched with the pending ones, and only the
+    receipts of the included transactions are requested"""
+
+    def __init__(self, client: EthSubscriptions):
+        self.client = client
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future[TxReceipt]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            subscription = self.client.subscribe('newHeads')
+            self._thread = threading.Thread(target=self._run, args=(subscription,), daemon=True)
+            self._thread.start()
+
+    def _run(self, subscription: Subscription) -> None:
+        # NOTE: if the block could not be checked, its transactions are not
+        # known, so all pending receipts are requested with the next block:
+        missed_block = False
+        try:
+            for head in subscription:
+                with self._lock:
+                    pending = set(self._pending)
+                if not pending:
+                    continue
+                try:
+                    if missed_block:
+                        to_check = pending
+                    else:
+                        block = self.client.request('eth_getBlockByHash', [head['hash'], False])
+                        included = {tx_hash.lower() for tx_hash in (block or {}).get('transactions', [])}
+                        to_check = included & pending
+                    for tx_hash in to_check:
+                        self._check(tx_hash)
+                    missed_block = False
+                except (TimeoutError, ValueError):
+                    missed_block = True
+        except ConnectionError:
+            pass
+        finally:
+            with self._lock:
+                futures, self._pending = self._pending, {}
+                self._thread = None
+            for future in futures.values():
+                future.set_exception(ConnectionError('WebSocket connection is closed'))
+
+    def _check(self, tx_hash: str) -> None:
+        receipt = self.client.request('eth_getTransactionReceipt', [tx_hash])
+        if receipt is None:
+            return
+        with self._lock:
+            future = self._pending.pop(tx_hash, None)
+        if future is not None:
+            future.set_result(format_receipt(receipt))
+
+    def submit(self, tx_hash: str) -> Future[TxReceipt]:
+        tx_hash = tx_hash.lower()
+        self._ensure_started()
+        with self._lock:
+            future = self._pending.setdefault(tx_hash, Future())
+        # NOTE: the transaction could be included before it was registered:
+        self._check(tx_hash)
+        return future
+
+    def wait(self, tx_hash: str, timeout: float = DEFAULT_RECEIPT_TIMEOUT) -> TxReceipt:
+        return self.submit(tx_hash).result(timeout)
+
+    def wait_many(
+        self, tx_hashes: list[str], timeout: float = DEFAULT_RECEIPT_TIMEOUT
+    ) -> dict[str, TxReceipt]:
+        """Returns receipts by transaction hash (in lower case)"""
+
+        futures = {tx_hash.lower(): self.submit(tx_hash) for tx_hash in tx_hashes}
+        return {tx_hash: future.result(timeout) for tx_hash, future in futures.items()}
+
+
+def stream_logs(client: EthSubscriptions, log_filter: dict[str, Any]) -> Iterator[Any]:
+    """Subscribes to logs matching the filter and returns the iterator over
+    the logs as they are pushed by the node, logs removed by the reorg are
+    skipped. NOTE: the subscription is made at once, not on iteration"""
+
+    subscription = client.subscribe('logs', log_filter)
+    return (log for log in subscription if not log.get('removed'))
+
+
+_receipt_waiters: dict[str, ReceiptWaiter] = {}
+_receipt_waiters_lock = threading.Lock()
+
+
+def get_receipt_waiter(url: str) -> ReceiptWaiter:
+    """Returns the receipt waiter shared by all transactions sent to the
+    node with the given WebSocket URL (one connection and subscription),
+    the new one is made if the connection of the shared one is closed"""
+
+    with _receipt_waiters_lock:
+        waiter = _receipt_waiters.get(url)
+        if waiter is None or waiter.client.closed:
+            waiter = _receipt_waiters[url] = ReceiptWaiter(EthSubscriptions(url))
+        return waiter
+
+
+def wait_for_transaction_receipt(web3: Web3, tx_hash: HexBytes) -> TxReceipt:
+    """Waits for the receipt from the shared `newHeads` subscription if web3
+    is connected over WebSocket, polls the node over HTTP otherwise"""
+
+    if isinstance(web3.provider, WebsocketProvider):
+        return get_receipt_waiter(str(web3.provider.endpoint_uri)).wait(tx_hash.hex())
+    return web3.eth.wait_for_transaction_receipt(tx_hash)
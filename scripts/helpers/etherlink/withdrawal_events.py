@@ -0,0 +1,75 @@
+from typing import Any, Iterator
+from web3 import Web3
+from pytezos.michelson.forge import unforge_address
+from scripts.helpers.etherlink.subscriptions import (
+    EthSubscriptions,
+    stream_logs,
+)
+from scripts.helpers.etherlink.logs import (
+    get_logs_in_chunks,
+    to_hex,
+    to_int,
+)
+
+
+# Withdrawal event emitted by the kernel, see `IWithdrawalEvent.sol`:
+WITHDRAWAL_EVENT_SIGNATURE = (
+    'Withdrawal(uint256,address,address,bytes22,bytes22,uint256,uint256)'
+)
+WITHDRAWAL_EVENT_TOPIC = Web3.keccak(text=WITHDRAWAL_EVENT_SIGNATURE).hex()
+
+
+def decode_withdrawal_log(log: Any) -> dict[str, Any]:
+    """Decodes kernel withdrawal log: fields from `IWithdrawalEvent.sol`
+    followed by outbox level and index in the last two words of data"""
+
+    data = to_hex(log['data'])[2:]
+    words = [data[i : i + 64] for i in range(0, len(data), 64)]
+    if len(words) < 7:
+        raise ValueError('Unexpected withdrawal event data size')
+
+    return {
+        'transaction_hash': to_hex(log['transactionHash']),
+        'block_number': to_int(log['blockNumber']),
+        'log_index': to_int(log['logIndex']),
+        'ticket_hash': to_hex(log['topics'][1])[2:],
+        'sender': Web3.to_checksum_address('0x' + words[0][24:]),
+        'ticket_owner': Web3.to_checksum_address('0x' + words[1][24:]),
+        'receiver': unforge_address(bytes.fromhex(words[2][:44])),
+        'proxy': unforge_address(bytes.fromhex(words[3][:44])),
+        'amount': int(words[4], 16),
+        'outbox_level': int(words[-2], 16),
+        'outbox_index': int(words[-1], 16),
+    }
+
+
+def get_withdrawal_logs(
+    web3: Web3,
+    kernel_address: str,
+    from_block: int,
+    to_block: int,
+    chunk_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """Yields decoded kernel withdrawal events for the block range using
+    `eth_getLogs` filtered by the kernel address and the event topic"""
+
+    log_filter = {
+        'address': Web3.to_checksum_address(kernel_address),
+        'topics': [WITHDRAWAL_EVENT_TOPIC],
+    }
+    for log in get_logs_in_chunks(web3, log_filter, from_block, to_block, chunk_size):
+        yield decode_withdrawal_log(log)
+
+
+def stream_withdrawal_events(
+    client: EthSubscriptions,
+    kernel_address: str,
+) -> Iterator[dict[str, Any]]:
+    """Subscribes to kernel withdrawal events and returns the iterator over
+    decoded events as they are pushed by the node"""
+
+    log_filter = {
+        'address': Web3.to_checksum_address(kernel_address),
+        'topics': [WITHDRAWAL_EVENT_TOPIC],
+    }
+    return (decode_withdrawal_log(log) for log in stream_logs(client, log_filter))
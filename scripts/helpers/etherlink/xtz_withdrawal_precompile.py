@@ -3,6 +3,7 @@ from scripts.helpers.etherlink.contract import (
     EvmContractHelper,
     make_filename,
 )
+from scripts.helpers.tracing import start_span
 
 
 class XtzWithdrawalPrecompileHelper(EvmContractHelper):
@@ -17,15 +18,17 @@ class XtzWithdrawalPrecompileHelper(EvmContractHelper):
     ) -> TxReceipt:
         """Calls XTZ withdrawal precompile which allows to withdraw XTZ from L2 to L1"""
 
-        call = self.contract.functions.withdraw_base58(receiver)
-        transaction = call.build_transaction(
-            {
-                'from': self.account.address,
-                'value': self.web3.to_wei(wei_amount, 'wei'),
-                'nonce': self.web3.eth.get_transaction_count(self.account.address),
-                'chainId': self.web3.eth.chain_id,
-            }
-        )
+        # NOTE: building the transaction also estimates gas (simulation)
+        with start_span('build', chain='etherlink'):
+            call = self.contract.functions.withdraw_base58(receiver)
+            transaction = call.build_transaction(
+                {
+                    'from': self.account.address,
+                    'value': self.web3.to_wei(wei_amount, 'wei'),
+                    'nonce': self.web3.eth.get_transaction_count(self.account.address),
+                    'chainId': self.web3.eth.chain_id,
+                }
+            )
 
         txn_receipt = self.legacy_send(transaction)
         return txn_receipt
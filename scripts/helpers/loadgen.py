@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import cycle
+from queue import Queue
+from typing import Any, Callable, Iterator, Optional
+
+from pytezos.rpc.errors import RpcError
+
+
+# Actor sends one operation of its kind and returns the number of the block
+# where the operation was included:
+Actor = tuple[str, Callable[[], int]]
+
+# Actors of one account (one per scenario), they take turns and only one
+# operation is in flight for each account, so account counters (Tezos) and
+# nonces (Etherlink) never race:
+Account = list[Actor]
+
+
+@dataclass
+class OperationResult:
+    kind: str
+    submitted_at: float
+    latency: Optional[float] = None
+    block: Optional[int] = None
+    error: Optional[str] = None
+
+
+def describe_error(error: Exception) -> str:
+    """Returns short error description used to group failures"""
+
+    if isinstance(error, RpcError) and error.args and isinstance(error.args[0], dict):
+        return str(error.args[0].get('id', type(error).__name__))
+    return type(error).__name__
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Returns nearest-rank percentile of given values"""
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class RateLimiter:
+    """Spaces operation submissions evenly to keep the target rate"""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(self._next_at, now)
+            self._next_at = start_at + self._interval
+        time.sleep(start_at - now)
+
+
+def run_load(
+    accounts: list[Account],
+    rate: float,
+    concurrency: int,
+    duration: float,
+) -> list[OperationResult]:
+    """Runs actors of the accounts with the target rate of submissions for
+    the given duration using given number of worker threads and returns
+    results of all sent operations"""
+
+    idle_accounts: Queue[Iterator[Actor]] = Queue()
+    for account in accounts:
+        if not account:
+            raise ValueError('Account without actors')
+        idle_accounts.put(cycle(account))
+
+    limiter = RateLimiter(rate)
+    deadline = time.monotonic() + duration
+    results: list[OperationResult] = []
+    lock = threading.Lock()
+
+    def work() -> None:
+        while True:
+            limiter.acquire()
+            if time.monotonic() >= deadline:
+                return
+            account = idle_accounts.get()
+            # NOTE: waiting for the idle account may take until the deadline:
+            if time.monotonic() >= deadline:
+                idle_accounts.put(account)
+                return
+            kind, send = next(account)
+            result = OperationResult(kind=kind, submitted_at=time.monotonic())
+            try:
+                result.block = send()
+                result.latency = time.monotonic() - result.submitted_at
+            except Exception as error:
+                result.error = describe_error(error)
+            finally:
+                idle_accounts.put(account)
+            with lock:
+                results.append(result)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(work) for _ in range(concurrency)]:
+            future.result()
+    return results
+
+
+def make_report(results: list[OperationResult], duration: float) -> dict[str, Any]:
+    """Aggregates results per operation kind: throughput, inclusion latency
+    percentiles, operations per block and failures breakdown"""
+
+    by_kind: dict[str, list[OperationResult]] = defaultdict(list)
+    for result in results:
+        by_kind[result.kind].append(result)
+
+    report = {}
+    for kind, kind_results in sorted(by_kind.items()):
+        succeeded = [r for r in kind_results if r.error is None]
+        latencies = [r.latency for r in succeeded if r.latency is not None]
+        per_block = Counter(r.block for r in succeeded)
+        report[kind] = {
+            'sent': len(kind_results),
+            'succeeded': len(succeeded),
+            'throughput': len(succeeded) / duration,
+            'latency': {
+                f'p{p}': percentile(latencies, p) for p in (50, 90, 99)
+            } if latencies else {},
+            'ops_per_block': {
+                'max': max(per_block.values()),
+                'mean': len(succeeded) / len(per_block),
+            } if per_block else {},
+            'failures': dict(Counter(r.error for r in kind_results if r.error)),
+        }
+    return report
@@ -0,0 +1,99 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Optional, Type
+
+
+COMPRESSIONS = ['none', 'gzip', 'zstd']
+SUFFIX_COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+
+def infer_compression(filename: str) -> str:
+    """Returns compression matching the file suffix, `none` if unknown"""
+
+    return SUFFIX_COMPRESSIONS.get(Path(filename).suffix, 'none')
+
+
+def open_compressed(filename: str, compression: str) -> IO[str]:
+    """Opens text file for writing with given compression. Compression with
+    zstd requires optional `zstandard` package"""
+
+    if compression == 'gzip':
+        return gzip.open(filename, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard  # type: ignore
+        except ImportError as error:
+            raise ValueError('zstd compression requires `zstandard` package') from error
+        return zstandard.open(filename, 'wt', encoding='utf-8')  # type: ignore
+    if compression == 'none':
+        return open(filename, 'w', encoding='utf-8')
+    raise ValueError(f'Unsupported compression: {compression}')
+
+
+class NdjsonWriter:
+    """Streams records as newline delimited JSON, one compact object per line.
+    If `rotate_lines` is set, starts new file each `rotate_lines` records,
+    the file index is inserted before the suffixes: `outbox.00001.jsonl.gz`.
+    Filename `-` writes to stdout without compression and rotation"""
+
+    def __init__(
+        self,
+        filename: str,
+        compression: Optional[str] = None,
+        rotate_lines: Optional[int] = None,
+    ):
+        self.filename = filename
+        self.compression = compression or infer_compression(filename)
+        self.rotate_lines = rotate_lines
+        self.lines_count = 0
+        self.filenames: list[str] = []
+        self._file: Optional[IO[str]] = None
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._file is None or self._should_rotate():
+            self._open_next()
+        assert self._file is not None
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.lines_count += 1
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self) -> 'NdjsonWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _should_rotate(self) -> bool:
+        if self.rotate_lines is None or self.filename == '-':
+            return False
+        return self.lines_count > 0 and self.lines_count % self.rotate_lines == 0
+
+    def _open_next(self) -> None:
+        self.close()
+        if self.filename == '-':
+            self._file = sys.stdout
+            return
+        filename = self.filename
+        if self.rotate_lines is not None:
+            path = Path(self.filename)
+            stem = path.name.split('.')[0]
+            suffixes = path.name[len(stem):]
+            filename = str(path.with_name(f'{stem}.{len(self.filenames):05d}{suffixes}'))
+        self._file = open_compressed(filename, self.compression)
+        self.filenames.append(filename)
@@ -0,0 +1,61 @@
+from typing import Any, Optional
+from pytezos.client import PyTezosClient
+from pytezos.contract.interface import ContractInterface
+
+
+def get_storage_micheline(client: PyTezosClient, address: str, block: str = 'head') -> Any:
+    """Reads raw contract storage at the given block"""
+
+    return client.shell.blocks[block].context.contracts[address].storage()
+
+
+class OfflineViews:
+    """Evaluates on-chain views of the contract locally with the pytezos
+    Michelson interpreter against the given storage, so reading all views
+    of the contract costs one storage read instead of a `run_view`
+    simulation per view. The storage is either read from the node at the
+    pinned block or provided as a snapshot (Python object).
+
+    NOTE: views which use BALANCE, NOW or call views of other contracts are
+    evaluated with the dummy values, big_map values are not available"""
+
+    def __init__(self, contract: ContractInterface, storage: Any):
+        self.contract = contract
+        self.storage = storage
+
+    @classmethod
+    def from_micheline(cls, contract: ContractInterface, storage: Any) -> 'OfflineViews':
+        return cls(contract, contract.storage.decode(storage))
+
+    @classmethod
+    def from_address(
+        cls,
+        client: PyTezosClient,
+        contract: ContractInterface,
+        address: str,
+        block: str = 'head',
+    ) -> 'OfflineViews':
+        """Reads storage of the contract deployed at the address, `contract`
+        is only used for the code and types, so it can be loaded from file"""
+
+        return cls.from_micheline(contract, get_storage_micheline(client, address, block))
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.contract.views)
+
+    def run(self, name: str, parameter: Optional[Any] = None) -> Any:
+        """Returns the view result as a Python object"""
+
+        view = getattr(self.contract.view, name)
+        view_call = view() if parameter is None else view(parameter)
+        return view_call.onchain_view(storage=self.storage)
+
+    def run_all(self) -> dict[str, Any]:
+        """Returns results of all views with `unit` parameter"""
+
+        return {
+            name: self.run(name)
+            for name, view in self.contract.views.items()
+            if view.args[1].prim == 'unit'
+        }
@@ -0,0 +1,91 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Iterator
+from scripts.helpers.rpc_metrics import (
+    InMemorySink,
+    RpcCall,
+    record_rpc_calls,
+)
+
+
+DEFAULT_TOP = 20
+
+
+def make_timeline(calls: list[RpcCall], started_at: float) -> list[dict[str, Any]]:
+    """Returns HTTP requests ordered by start time, `offset` is the time in
+    seconds since the profiled command started"""
+
+    return [
+        {'offset': round(call.started_at - started_at, 6), **asdict(call)}
+        for call in sorted(calls, key=lambda call: call.started_at)
+    ]
+
+
+def format_summary(stats: pstats.Stats, timeline: list[dict[str, Any]], top: int) -> str:
+    """Formats top-N functions by cumulative time, and top-N slowest HTTP
+    requests with the total time spent waiting for them"""
+
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    lines = [stream.getvalue().strip(), '']
+    http_time = sum(item['duration'] for item in timeline)
+    lines.append(f'{len(timeline)} HTTP requests, {http_time:.3f}s in total')
+    slowest = sorted(timeline, key=lambda item: item['duration'], reverse=True)[:top]
+    for item in slowest:
+        status = item['error'] or item['status']
+        lines.append(
+            f'  {item["offset"]:>9.3f}s {item["duration"]:>8.3f}s '
+            f'{item["client"]:<11} {item["method"]} ({status})'
+        )
+    return '\n'.join(lines)
+
+
+class Profile:
+    """Result of the profiled run: cProfile stats and RPC timeline"""
+
+    def __init__(self, profiler: cProfile.Profile, calls: list[RpcCall], started_at: float):
+        self.profiler = profiler
+        self.calls = calls
+        self.started_at = started_at
+
+    @property
+    def timeline(self) -> list[dict[str, Any]]:
+        return make_timeline(self.calls, self.started_at)
+
+    def write(self, prefix: str) -> tuple[str, str]:
+        """Writes `{prefix}.pstats` (open with `python -m pstats` or
+        snakeviz) and `{prefix}.timeline.json`, returns their filenames"""
+
+        pstats_file, timeline_file = f'{prefix}.pstats', f'{prefix}.timeline.json'
+        self.profiler.dump_stats(pstats_file)
+        with open(timeline_file, 'w') as f:
+            json.dump(self.timeline, f, indent=2)
+        return pstats_file, timeline_file
+
+    def summary(self, top: int = DEFAULT_TOP) -> str:
+        return format_summary(pstats.Stats(self.profiler), self.timeline, top)
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Runs the block under cProfile and records all HTTP requests made
+    with `requests` (pytezos, Web3 HTTP provider, rollup node, TzKT).
+
+    NOTE: cProfile only profiles the calling thread, requests made from
+    worker threads are still present in the timeline"""
+
+    sink, profiler = InMemorySink(), cProfile.Profile()
+    result = Profile(profiler, sink.calls, time.time())
+    with record_rpc_calls(sink):
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
@@ -4,6 +4,10 @@ from scripts.helpers.rollup_node.proof import (
     get_cemented_messages,
     get_messages,
 )
+from scripts.helpers.rollup_node.outbox import (
+    decode_outbox_messages,
+    decode_withdrawal_parameters,
+)
 from scripts.helpers.rollup_node.ticket_table import (
     get_durable_storage_value,
     get_tickets_count,
@@ -16,6 +20,8 @@ __all__ = [
     'get_proof',
     'get_cemented_messages',
     'get_messages',
+    'decode_outbox_messages',
+    'decode_withdrawal_parameters',
     'get_durable_storage_value',
     'get_tickets_count',
 ]
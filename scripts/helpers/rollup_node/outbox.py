@@ -0,0 +1,73 @@
+from typing import Any, Iterator, Optional
+from pytezos.michelson.forge import unforge_address
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+# Size of the forged Tezos address, withdrawal routing info consists of two
+# forged addresses: receiver and router
+ADDRESS_SIZE = 22
+
+
+def decode_address(value: dict[str, Any]) -> str:
+    """Decodes Micheline address which can be either in readable (string)
+    or optimized (bytes) form"""
+
+    if 'string' in value:
+        return str(value['string'])
+    return str(unforge_address(bytes.fromhex(value['bytes'])))
+
+
+def decode_withdrawal_parameters(parameters: dict[str, Any]) -> dict[str, Any]:
+    """Decodes `withdraw` entrypoint parameters of the Ticketer / Router:
+    `Pair routing_info (Pair ticketer (Pair content amount))`"""
+
+    routing_info_micheline, ticket_micheline = parameters['args']
+    routing_info = bytes.fromhex(routing_info_micheline['bytes'])
+    if len(routing_info) != 2 * ADDRESS_SIZE:
+        raise ValueError('Unexpected withdrawal routing info size')
+    ticketer_micheline, content_and_amount = ticket_micheline['args']
+    content_micheline, amount_micheline = content_and_amount['args']
+
+    ticketer = decode_address(ticketer_micheline)
+    content = TicketContent.from_micheline(content_micheline)
+    amount = int(amount_micheline['int'])
+    ticket = Ticket(owner=ticketer, ticketer=ticketer, content=content, amount=amount)
+    token_info = content.token_info
+
+    return {
+        'receiver': unforge_address(routing_info[:ADDRESS_SIZE]),
+        'router': unforge_address(routing_info[ADDRESS_SIZE:]),
+        'ticketer': ticketer,
+        'token_id': content.token_id,
+        'token_info': None if token_info is None else token_info.hex(),
+        'amount': amount,
+        'ticket_hash': f'{ticket.hash():064x}',
+    }
+
+
+def decode_outbox_messages(messages: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Flattens outbox messages returned by the rollup node to the records,
+    one record per transaction. Withdrawal transactions are decoded to the
+    receiver, router and ticket fields, other transactions keep the raw
+    parameters"""
+
+    for message in messages:
+        body = message['message']
+        for transaction_index, transaction in enumerate(body.get('transactions', [])):
+            record: dict[str, Any] = {
+                'outbox_level': message['outbox_level'],
+                'message_index': message['message_index'],
+                'transaction_index': transaction_index,
+                'kind': body.get('kind'),
+                'destination': transaction['destination'],
+                'entrypoint': transaction.get('entrypoint'),
+            }
+            parameters: Optional[dict[str, Any]] = transaction.get('parameters')
+            try:
+                if record['entrypoint'] != 'withdraw' or parameters is None:
+                    raise ValueError('Not a withdrawal')
+                record.update(decode_withdrawal_parameters(parameters))
+            except (KeyError, TypeError, ValueError):
+                record['parameters'] = parameters
+            yield record
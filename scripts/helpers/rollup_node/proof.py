@@ -1,6 +1,5 @@
-import requests
 from typing import Any, TypedDict
-from urllib.parse import urlparse, urlunparse, urlencode
+from scripts.helpers.endpoint_pool import get_endpoint_pool
 
 
 class Proof(TypedDict):
@@ -8,34 +7,24 @@ class Proof(TypedDict):
     proof: str
 
 
-# TODO: add RollupNodeProvider and retry in the case of the following errors:
-# - requests.exceptions.ConnectionError: HTTPSConnectionPool
+# NOTE: `rollup_rpc_url` can be a comma-separated list of rollup nodes, the
+# request is repeated on the next node in the case of connection errors
 
 
 def get_proof(rollup_rpc_url: str, outbox_level: int, index: int) -> Proof:
-    parts = urlparse(rollup_rpc_url)
-    parts = parts._replace(
-        path=f'global/block/head/helpers/proofs/outbox/{outbox_level}/messages',
-        query=urlencode(dict(index=index)),
-    )
-    url = urlunparse(parts)
-    proof: Proof = requests.get(url).json()
+    pool = get_endpoint_pool(rollup_rpc_url)
+    path = f'global/block/head/helpers/proofs/outbox/{outbox_level}/messages'
+    proof: Proof = pool.get(path, dict(index=index)).json()
     return proof
 
 
 def get_cemented_messages(rollup_rpc_url: str, outbox_level: int) -> Any:
-    parts = urlparse(rollup_rpc_url)
-    parts = parts._replace(
-        path=f'global/block/cemented/outbox/{outbox_level}/messages',
-    )
-    url = urlunparse(parts)
-    return requests.get(url).json()
+    pool = get_endpoint_pool(rollup_rpc_url)
+    path = f'global/block/cemented/outbox/{outbox_level}/messages'
+    return pool.get(path).json()
 
 
 def get_messages(rollup_rpc_url: str, outbox_level: int) -> Any:
-    parts = urlparse(rollup_rpc_url)
-    parts = parts._replace(
-        path=f'global/block/head/outbox/{outbox_level}/messages',
-    )
-    url = urlunparse(parts)
-    return requests.get(url).json()
+    pool = get_endpoint_pool(rollup_rpc_url)
+    path = f'global/block/head/outbox/{outbox_level}/messages'
+    return pool.get(path).json()
@@ -1,5 +1,4 @@
-from urllib.parse import urlparse, urlunparse, urlencode
-import requests
+from scripts.helpers.endpoint_pool import get_endpoint_pool
 from scripts.helpers.ticket import Ticket
 from typing import Optional
 
@@ -18,13 +17,9 @@ def make_ticket_table_key(ticket: Ticket, owner_address: str) -> str:
 def get_durable_storage_value(rollup_node_url: str, key: str) -> Optional[str]:
     """Get a durable storage value from the given rollup node URL by given key."""
 
-    parts = urlparse(rollup_node_url)
-    parts = parts._replace(
-        path='global/block/head/durable/wasm_2_0_0/value',
-        query=urlencode(dict(key=key)),
-    )
-    url = urlunparse(parts)
-    return requests.get(url).json()  # type: ignore
+    pool = get_endpoint_pool(rollup_node_url)
+    path = 'global/block/head/durable/wasm_2_0_0/value'
+    return pool.get(path, dict(key=key)).json()  # type: ignore
 
 
 def get_tickets_count(rollup_node_url: str, ticket: Ticket, owner_address: str) -> int:
@@ -0,0 +1,244 @@
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, Optional, Protocol
+from urllib.parse import urlparse
+
+import requests
+
+
+# Latency histogram buckets in seconds (upper bounds), the last one is +Inf:
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments replaced with the placeholder, so the calls to the same
+# route with different blocks, addresses, hashes and levels are aggregated:
+ID_SEGMENT_RE = re.compile(r'^(\d+|0x[0-9a-fA-F]+|[1-9A-HJ-NP-Za-km-z]{30,}|head~\d+)$')
+
+TEZOS_PREFIXES = ('/chains/', '/injection/', '/monitor/', '/network/', '/version')
+ROLLUP_NODE_PREFIXES = ('/global/', '/local/', '/health')
+
+
+@dataclass
+class RpcCall:
+    """Single HTTP request made by any client (one attempt, retries are
+    recorded as separate calls marked with `retry`)"""
+
+    client: str  # tezos, etherlink, rollup_node or http
+    method: str  # normalized path or JSON-RPC method
+    url: str
+    started_at: float
+    duration: float
+    request_bytes: int
+    response_bytes: int
+    status: Optional[int] = None
+    error: Optional[str] = None  # exception class name or `http_{status}`
+    retry: bool = False
+
+
+class MetricsSink(Protocol):
+    def record(self, call: RpcCall) -> None: ...
+
+
+def normalize_path(path: str) -> str:
+    segments = ['{id}' if ID_SEGMENT_RE.match(s) else s for s in path.split('/')]
+    return '/'.join(segments) or '/'
+
+
+def classify_request(url: str, body: Optional[bytes]) -> tuple[str, str]:
+    """Returns client name and method of the request: Etherlink JSON-RPC
+    method from the body, Tezos and rollup node routes from the path"""
+
+    parts = urlparse(url)
+    if body and body.lstrip()[:1] in (b'{', b'['):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and 'jsonrpc' in payload:
+            return 'etherlink', str(payload.get('method'))
+        if isinstance(payload, list) and payload and 'jsonrpc' in payload[0]:
+            return 'etherlink', 'batch'
+
+    path = normalize_path(parts.path)
+    if parts.path.startswith(TEZOS_PREFIXES):
+        return 'tezos', path
+    if parts.path.startswith(ROLLUP_NODE_PREFIXES):
+        return 'rollup_node', path
+    return 'http', f'{parts.netloc}{path}'
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@dataclass
+class MethodStats:
+    buckets: list[int]
+    count: int = 0
+    duration_sum: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+class RpcMetrics:
+    """In-memory aggregating sink: per client and method latency histogram,
+    request and response byte counts, retries and error classes. Exported
+    in the Prometheus text format or as JSON"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.stats: dict[tuple[str, str], MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: RpcCall) -> None:
+        with self._lock:
+            key = (call.client, call.method)
+            if key not in self.stats:
+                self.stats[key] = MethodStats(buckets=[0] * (len(self.buckets) + 1))
+            stats = self.stats[key]
+            stats.buckets[bisect_left(self.buckets, call.duration)] += 1
+            stats.count += 1
+            stats.duration_sum += call.duration
+            stats.request_bytes += call.request_bytes
+            stats.response_bytes += call.response_bytes
+            stats.retries += call.retry
+            if call.error is not None:
+                stats.errors[call.error] = stats.errors.get(call.error, 0) + 1
+
+    def to_json(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {'client': client, 'method': method, **asdict(stats)}
+                for (client, method), stats in sorted(self.stats.items())
+            ]
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name, kind, help_text in [
+            ('rpc_request_duration_seconds', 'histogram', 'RPC request latency'),
+            ('rpc_request_bytes_total', 'counter', 'Request body bytes sent'),
+            ('rpc_response_bytes_total', 'counter', 'Response body bytes received'),
+            ('rpc_retries_total', 'counter', 'Requests repeated after a failed attempt'),
+            ('rpc_errors_total', 'counter', 'Failed requests by error class'),
+        ]:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for item in self.to_json():
+                labels = f'client="{item["client"]}",method="{escape_label(item["method"])}"'
+                if name == 'rpc_request_duration_seconds':
+                    cumulative = 0
+                    bounds = [*map(str, self.buckets), '+Inf']
+                    for bound, count in zip(bounds, item['buckets']):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {item["duration_sum"]}')
+                    lines.append(f'{name}_count{{{labels}}} {item["count"]}')
+                elif name == 'rpc_errors_total':
+                    for error, count in sorted(item['errors'].items()):
+                        lines.append(f'{name}{{{labels},error="{error}"}} {count}')
+                else:
+                    key = name[len('rpc_') : -len('_total')]
+                    lines.append(f'{name}{{{labels}}} {item[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, filename: str) -> None:
+        """Writes metrics in the Prometheus text format, or as JSON if the
+        filename ends with `.json`"""
+
+        with open(filename, 'w') as f:
+            if filename.endswith('.json'):
+                json.dump(self.to_json(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+class InMemorySink:
+    """Keeps all recorded calls in the order they finished"""
+
+    def __init__(self) -> None:
+        self.calls: list[RpcCall] = []
+        self._lock = threading.Lock()
+
+    def record(self, call: RpcCall) -> None:
+        with self._lock:
+            self.calls.append(call)
+
+
+_sinks: list[MetricsSink] = []
+_sinks_lock = threading.Lock()
+_original_send = requests.Session.send
+# Signature of the last failed request in the thread, the same request sent
+# right after it is a retry (pytezos and web3 retry by resending it as is):
+_last_failed = threading.local()
+
+
+def _instrumented_send(
+    session: requests.Session,
+    request: requests.PreparedRequest,
+    **kwargs: Any,
+) -> requests.Response:
+    sinks = list(_sinks)
+    if not sinks:
+        return _original_send(session, request, **kwargs)
+
+    body = request.body.encode() if isinstance(request.body, str) else request.body
+    client, method = classify_request(request.url or '', body)
+    signature = (request.method, request.url, body)
+    retry = getattr(_last_failed, 'signature', None) == signature
+
+    def record(response_bytes: int, status: Optional[int], error: Optional[str]) -> None:
+        _last_failed.signature = signature if error else None
+        call = RpcCall(
+            client=client,
+            method=method,
+            url=request.url or '',
+            started_at=started_at,
+            duration=time.perf_counter() - started,
+            request_bytes=len(body or b''),
+            response_bytes=response_bytes,
+            status=status,
+            error=error,
+            retry=retry,
+        )
+        for sink in sinks:
+            sink.record(call)
+
+    started_at, started = time.time(), time.perf_counter()
+    try:
+        response = _original_send(session, request, **kwargs)
+    except Exception as exception:
+        record(0, None, type(exception).__name__)
+        raise
+
+    if kwargs.get('stream'):
+        response_bytes = int(response.headers.get('Content-Length', 0))
+    else:
+        response_bytes = len(response.content)
+    status = response.status_code
+    record(response_bytes, status, f'http_{status}' if status >= 400 else None)
+    return response
+
+
+@contextmanager
+def record_rpc_calls(*sinks: MetricsSink) -> Iterator[None]:
+    """Records all HTTP requests made with `requests` while the context is
+    active: pytezos shell, Web3 HTTP provider, rollup node helpers and
+    TzKT API calls all send requests through `requests.Session.send`, so
+    it is wrapped once for all clients"""
+
+    with _sinks_lock:
+        _sinks.extend(sinks)
+        requests.Session.send = _instrumented_send  # type: ignore
+    try:
+        yield
+    finally:
+        with _sinks_lock:
+            for sink in sinks:
+                _sinks.remove(sink)
+            if not _sinks:
+                requests.Session.send = _original_send  # type: ignore
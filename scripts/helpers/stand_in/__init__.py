@@ -0,0 +1,26 @@
+from os.path import dirname, join
+
+from scripts.helpers.stand_in.server import StandInServer
+from scripts.helpers.stand_in.rollup_node import RollupNodeStandIn
+from scripts.helpers.stand_in.etherlink import (
+    EtherlinkStandIn,
+    EtherlinkWebsocketStandIn,
+)
+from scripts.helpers.stand_in.tezos_node import TezosNodeStandIn
+
+
+def get_fixture_path(name: str) -> str:
+    """Returns path to the recorded fixture shipped with the stand-ins"""
+
+    return join(dirname(__file__), 'fixtures', name)
+
+
+# Allowing reimporting from this module:
+__all__ = [
+    'StandInServer',
+    'RollupNodeStandIn',
+    'EtherlinkStandIn',
+    'EtherlinkWebsocketStandIn',
+    'TezosNodeStandIn',
+    'get_fixture_path',
+]
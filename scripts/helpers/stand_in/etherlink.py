@@ -0,0 +1,214 @@
+import json
+import threading
+from typing import Any, Optional, Union
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+from scripts.helpers.stand_in.server import StandInServer
+
+
+def to_block_number(tag: Optional[str], latest: int) -> int:
+    if tag is None or tag in ('latest', 'safe', 'finalized', 'pending'):
+        return latest
+    if tag == 'earliest':
+        return 0
+    return int(tag, 16)
+
+
+def matches_topics(log: dict[str, Any], topics: list[Union[None, str, list[str]]]) -> bool:
+    """Checks log topics against `eth_getLogs` filter topics where each
+    position is either None (any), single topic or list of alternatives"""
+
+    for position, expected in enumerate(topics):
+        if expected is None:
+            continue
+        if position >= len(log['topics']):
+            return False
+        alternatives = [expected] if isinstance(expected, str) else expected
+        if log['topics'][position].lower() not in [t.lower() for t in alternatives]:
+            return False
+    return True
+
+
+class JsonRpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class EtherlinkStandIn(StandInServer):
+    """Minimal Etherlink JSON-RPC replaying recorded data:
+    - `chain_id`: hex chain id,
+    - `block_number`: hex number of the latest block,
+    - `receipts`: transaction hash -> receipt, receipt logs are also
+      served by `eth_getLogs`.
+    If `max_logs_range` is set, `eth_getLogs` rejects wider block ranges
+    in the same way public nodes do"""
+
+    def __init__(self, data: dict[str, Any], host: str = '127.0.0.1', port: int = 0):
+        super().__init__(host, port)
+        self.max_logs_range: Optional[int] = None
+        self.chain_id: str = data.get('chain_id', '0x1f47b')
+        self.block_number: str = data.get('block_number', '0x0')
+        self.receipts: dict[str, Any] = {
+            tx_hash.lower(): receipt for tx_hash, receipt in data.get('receipts', {}).items()
+        }
+        self.logs: list[dict[str, Any]] = [
+            log for receipt in self.receipts.values() for log in receipt['logs']
+        ]
+
+    @classmethod
+    def from_fixture(cls, filename: str) -> 'EtherlinkStandIn':
+        with open(filename) as f:
+            return cls(json.load(f)['etherlink'])
+
+    def handle_post(self, path: str, body: Any) -> Any:
+        if isinstance(body, list):
+            return [self._handle_call(call) for call in body]
+        return self._handle_call(body)
+
+    def _handle_call(self, call: dict[str, Any]) -> dict[str, Any]:
+        method = getattr(self, f'rpc_{call["method"]}', None)
+        response: dict[str, Any] = {'jsonrpc': '2.0', 'id': call.get('id')}
+        if method is None:
+            response['error'] = {'code': -32601, 'message': 'Method not found'}
+        else:
+            try:
+                response['result'] = method(*call.get('params', []))
+            except JsonRpcError as error:
+                response['error'] = {'code': error.code, 'message': error.message}
+        return response
+
+    def rpc_web3_clientVersion(self) -> str:
+        return 'EtherlinkStandIn'
+
+    def rpc_eth_chainId(self) -> str:
+        return self.chain_id
+
+    def rpc_net_version(self) -> str:
+        return str(int(self.chain_id, 16))
+
+    def rpc_eth_blockNumber(self) -> str:
+        return self.block_number
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash: str) -> Optional[dict[str, Any]]:
+        return self.receipts.get(tx_hash.lower())
+
+    def rpc_eth_getLogs(self, log_filter: dict[str, Any]) -> list[dict[str, Any]]:
+        latest = int(self.block_number, 16)
+        from_block = to_block_number(log_filter.get('fromBlock'), latest)
+        to_block = to_block_number(log_filter.get('toBlock'), latest)
+        if self.max_logs_range is not None and to_block - from_block + 1 > self.max_logs_range:
+            raise JsonRpcError(-32005, f'query exceeds max block range {self.max_logs_range}')
+        addresses = log_filter.get('address')
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        if addresses is not None:
+            addresses = [address.lower() for address in addresses]
+        topics = log_filter.get('topics') or []
+
+        return [
+            log
+            for log in self.logs
+            if from_block <= int(log['blockNumber'], 16) <= to_block
+            and (addresses is None or log['address'].lower() in addresses)
+            and matches_topics(log, topics)
+        ]
+
+
+class EtherlinkWebsocketStandIn(EtherlinkStandIn):
+    """Etherlink stand-in also serving JSON-RPC over WebSocket (`ws_url`)
+    with `eth_subscribe` for `newHeads` and `logs`. Receipts passed to
+    `push_block` are included into the new block and pushed to the
+    subscribers, until then the transactions are pending"""
+
+    def __init__(self, data: dict[str, Any], host: str = '127.0.0.1', port: int = 0):
+        super().__init__(data, host, port)
+        self.blocks: dict[str, dict[str, Any]] = {}
+        self._subscriptions: dict[str, tuple[Any, str, dict[str, Any]]] = {}
+        self._ws_server = serve(self._handle_connection, host, 0)
+        self._ws_thread: Optional[threading.Thread] = None
+
+    @property
+    def ws_url(self) -> str:
+        host, port = self._ws_server.socket.getsockname()[:2]
+        return f'ws://{host}:{port}'
+
+    def start(self) -> 'EtherlinkWebsocketStandIn':
+        super().start()
+        self._ws_thread = threading.Thread(target=self._ws_server.serve_forever, daemon=True)
+        self._ws_thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._ws_server.shutdown()
+        super().stop()
+
+    def _handle_connection(self, connection: Any) -> None:
+        try:
+            for raw in connection:
+                with self._lock:
+                    self.requests_count += 1
+                call = json.loads(raw)
+                if call['method'] == 'eth_subscribe':
+                    kind, *params = call['params']
+                    subscription_id = hex(len(self._subscriptions) + 1)
+                    log_filter = params[0] if params else {}
+                    self._subscriptions[subscription_id] = (connection, kind, log_filter)
+                    response = {'jsonrpc': '2.0', 'id': call['id'], 'result': subscription_id}
+                elif call['method'] == 'eth_unsubscribe':
+                    removed = self._subscriptions.pop(call['params'][0], None) is not None
+                    response = {'jsonrpc': '2.0', 'id': call['id'], 'result': removed}
+                else:
+                    response = self._handle_call(call)
+                connection.send(json.dumps(response))
+        except ConnectionClosed:
+            pass
+
+    def rpc_eth_getBlockByHash(self, block_hash: str, full: bool) -> Optional[dict[str, Any]]:
+        return self.blocks.get(block_hash)
+
+    def push_block(self, receipts: list[dict[str, Any]]) -> dict[str, Any]:
+        """Makes the next block with the given receipts (their block number
+        and hash are replaced) and pushes it to the subscribers"""
+
+        number = hex(int(self.block_number, 16) + 1)
+        block_hash = '0x' + number[2:].rjust(64, '0')
+        block = {'number': number, 'hash': block_hash, 'transactions': []}
+        logs = []
+        for receipt in receipts:
+            receipt = {**receipt, 'blockNumber': number, 'blockHash': block_hash}
+            receipt['logs'] = [
+                {**log, 'blockNumber': number, 'blockHash': block_hash} for log in receipt['logs']
+            ]
+            self.receipts[receipt['transactionHash'].lower()] = receipt
+            self.logs += receipt['logs']
+            logs += receipt['logs']
+            block['transactions'].append(receipt['transactionHash'])
+        self.blocks[block_hash] = block
+        self.block_number = number
+
+        for subscription_id, (connection, kind, log_filter) in list(self._subscriptions.items()):
+            if kind == 'newHeads':
+                results: list[Any] = [{'number': number, 'hash': block_hash}]
+            else:
+                address = log_filter.get('address')
+                results = [
+                    log
+                    for log in logs
+                    if (address is None or log['address'].lower() == address.lower())
+                    and matches_topics(log, log_filter.get('topics') or [])
+                ]
+            for result in results:
+                notification = {
+                    'jsonrpc': '2.0',
+                    'method': 'eth_subscription',
+                    'params': {'subscription': subscription_id, 'result': result},
+                }
+                try:
+                    connection.send(json.dumps(notification))
+                except ConnectionClosed:
+                    self._subscriptions.pop(subscription_id, None)
+        return block
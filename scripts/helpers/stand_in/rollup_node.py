@@ -0,0 +1,54 @@
+import json
+import re
+from typing import Any, Optional
+
+from scripts.helpers.stand_in.server import StandInServer
+
+
+OUTBOX_PATH = re.compile(r'^/global/block/(?P<block>\w+)/outbox/(?P<level>\d+)/messages$')
+PROOF_PATH = re.compile(
+    r'^/global/block/(?P<block>\w+)/helpers/proofs/outbox/(?P<level>\d+)/messages$'
+)
+DURABLE_PATH = re.compile(r'^/global/block/(?P<block>\w+)/durable/wasm_2_0_0/value$')
+
+
+class RollupNodeStandIn(StandInServer):
+    """Replays rollup node RPC from recorded data:
+    - `outbox`: outbox level -> list of messages,
+    - `proofs`: `{level}/{index}` -> commitment and proof,
+    - `durable`: durable storage key -> hex value,
+    - `cemented_level`: the last cemented outbox level, messages above it
+      are not returned by the `cemented` block and have no proofs."""
+
+    def __init__(self, data: dict[str, Any], host: str = '127.0.0.1', port: int = 0):
+        super().__init__(host, port)
+        self.outbox: dict[str, list[Any]] = data.get('outbox', {})
+        self.proofs: dict[str, Any] = data.get('proofs', {})
+        self.durable: dict[str, Optional[str]] = data.get('durable', {})
+        self.cemented_level: Optional[int] = data.get('cemented_level')
+
+    @classmethod
+    def from_fixture(cls, filename: str) -> 'RollupNodeStandIn':
+        with open(filename) as f:
+            return cls(json.load(f)['rollup_node'])
+
+    def is_cemented(self, level: int) -> bool:
+        return self.cemented_level is None or level <= self.cemented_level
+
+    def handle_get(self, path: str, query: dict[str, str]) -> Any:
+        if match := OUTBOX_PATH.match(path):
+            level = int(match['level'])
+            if match['block'] == 'cemented' and not self.is_cemented(level):
+                return []
+            return self.outbox.get(str(level), [])
+
+        if match := PROOF_PATH.match(path):
+            level = int(match['level'])
+            if not self.is_cemented(level):
+                raise KeyError(path)
+            return self.proofs[f'{level}/{query["index"]}']
+
+        if DURABLE_PATH.match(path):
+            return self.durable.get(query['key'])
+
+        raise KeyError(path)
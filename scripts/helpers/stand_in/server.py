@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Optional, Type, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+
+T = TypeVar('T', bound='StandInServer')
+
+
+class StandInServer:
+    """In-process HTTP server running in the background thread which replays
+    recorded responses. Subclasses implement `handle_get` / `handle_post`
+    returning JSON-serializable response or raising KeyError for 404"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.requests_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self: T) -> T:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self: T) -> T:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def handle_get(self, path: str, query: dict[str, str]) -> Any:
+        raise KeyError(path)
+
+    def handle_post(self, path: str, body: Any) -> Any:
+        raise KeyError(path)
+
+    def _make_handler(self) -> Type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # NOTE: keep-alive connections, so clients using sessions are not
+            # limited by the TCP handshake in high request rate scenarios
+            protocol_version = 'HTTP/1.1'
+            # NOTE: headers and body are written separately, so Nagle's
+            # algorithm would delay each response on a kept-alive connection
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                self._respond(lambda: server.handle_get(url.path, query))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'null')
+                self._respond(lambda: server.handle_post(urlparse(self.path).path, body))
+
+            def _respond(self, handle: Any) -> None:
+                with server._lock:
+                    server.requests_count += 1
+                try:
+                    status, response = 200, handle()
+                except KeyError as error:
+                    status, response = 404, {'error': f'Not found: {error}'}
+                body = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
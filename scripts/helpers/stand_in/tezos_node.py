@@ -0,0 +1,62 @@
+import json
+import re
+from typing import Any
+
+from scripts.helpers.stand_in.server import StandInServer
+
+
+BLOCK_PATH = re.compile(r'^/chains/main/blocks/(?P<block>[^/]+)/(?P<rest>.+)$')
+CONTRACT_PATH = re.compile(r'^context/contracts/(?P<address>\w+)/(?P<field>storage|script)$')
+BIG_MAP_PATH = re.compile(r'^context/big_maps/(?P<ptr>\d+)/(?P<key_hash>\w+)$')
+
+
+class TezosNodeStandIn(StandInServer):
+    """Replays Tezos node RPC for the recorded blocks, the last block is the
+    head. Each block has `hash`, `level`, optional `operation_hashes` (list
+    of operation hashes for each validation pass) and the context:
+    - `contracts`: address -> `storage` and `script` Micheline,
+    - `big_maps`: big_map id -> script expression key hash -> value.
+    Blocks can be appended while the server is running to move the head"""
+
+    def __init__(self, data: dict[str, Any], host: str = '127.0.0.1', port: int = 0):
+        super().__init__(host, port)
+        self.blocks: list[dict[str, Any]] = data.get('blocks', [])
+
+    @classmethod
+    def from_fixture(cls, filename: str) -> 'TezosNodeStandIn':
+        with open(filename) as f:
+            return cls(json.load(f)['tezos_node'])
+
+    def get_block(self, block_id: str) -> dict[str, Any]:
+        """Finds block by hash, level, `head` or `head~N`"""
+
+        if block_id == 'head':
+            return self.blocks[-1]
+        if block_id.startswith('head~'):
+            return self.blocks[-1 - int(block_id[5:])]
+        for block in self.blocks:
+            if block_id in (block['hash'], str(block['level'])):
+                return block
+        raise KeyError(block_id)
+
+    def handle_get(self, path: str, query: dict[str, str]) -> Any:
+        match = BLOCK_PATH.match(path)
+        if match is None:
+            raise KeyError(path)
+        block = self.get_block(match['block'])
+        rest = match['rest']
+
+        if rest == 'hash':
+            return block['hash']
+        if rest == 'header':
+            return {'hash': block['hash'], 'level': block['level']}
+        if rest == 'operation_hashes':
+            return block.get('operation_hashes', [[], [], [], []])
+
+        if match := CONTRACT_PATH.match(rest):
+            return block['contracts'][match['address']][match['field']]
+
+        if match := BIG_MAP_PATH.match(rest):
+            return block['big_maps'][match['ptr']][match['key_hash']]
+
+        raise KeyError(path)
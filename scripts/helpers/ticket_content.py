@@ -1,13 +1,90 @@
-from scripts.helpers.utility import to_michelson_type
-from pytezos.michelson.types.base import MichelsonType
 from dataclasses import dataclass
-from scripts.helpers.utility import to_micheline
 from typing import (
     Optional,
     Any,
 )
 
 
+# Binary Micheline tags and primitive codes used in the ticket content layout
+# `(pair nat (option bytes))`, see Tezos `data_encoding` for Micheline:
+INT_TAG = 0x00
+PRIM_NO_ARGS_TAG = 0x03
+PRIM_ONE_ARG_TAG = 0x05
+PRIM_TWO_ARGS_TAG = 0x07
+BYTES_TAG = 0x0A
+PAIR_PRIM = 0x07
+NONE_PRIM = 0x06
+SOME_PRIM = 0x09
+
+PAIR_PREFIX = bytes([PRIM_TWO_ARGS_TAG, PAIR_PRIM])
+NONE_FORGED = bytes([PRIM_NO_ARGS_TAG, NONE_PRIM])
+SOME_BYTES_PREFIX = bytes([PRIM_ONE_ARG_TAG, SOME_PRIM, BYTES_TAG])
+
+
+def forge_nat(value: int) -> bytes:
+    """Forges non-negative integer to the Micheline zarith form: the first
+    byte holds sign bit and 6 bits of the value, next bytes hold 7 bits each"""
+
+    if value < 0:
+        raise ValueError('Ticket content token_id should be a nat')
+    result = bytearray([value & 0x3F])
+    value >>= 6
+    while value:
+        result[-1] |= 0x80
+        result.append(value & 0x7F)
+        value >>= 7
+    return bytes(result)
+
+
+def unforge_nat(data: bytes, offset: int) -> tuple[int, int]:
+    """Reads zarith integer starting from offset, returns the value and the
+    offset after it"""
+
+    if offset >= len(data):
+        raise ValueError('Unexpected end of zarith integer')
+    byte = data[offset]
+    if byte & 0x40:
+        raise ValueError('Ticket content token_id should be a nat')
+    value = byte & 0x3F
+    shift = 6
+    offset += 1
+    while byte & 0x80:
+        if offset >= len(data):
+            raise ValueError('Unexpected end of zarith integer')
+        byte = data[offset]
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        offset += 1
+    return value, offset
+
+
+def forge_ticket_content(token_id: int, token_info: Optional[bytes]) -> bytes:
+    """Forges `(pair nat (option bytes))` value in the same way as pytezos
+    `forge('legacy_optimized')` does, without building MichelsonType"""
+
+    forged = PAIR_PREFIX + bytes([INT_TAG]) + forge_nat(token_id)
+    if token_info is None:
+        return forged + NONE_FORGED
+    return forged + SOME_BYTES_PREFIX + len(token_info).to_bytes(4, 'big') + token_info
+
+
+def unforge_ticket_content(data: bytes) -> tuple[int, Optional[bytes]]:
+    """Parses forged `(pair nat (option bytes))` value"""
+
+    if data[:3] != PAIR_PREFIX + bytes([INT_TAG]):
+        raise ValueError('Unexpected ticket content layout')
+    token_id, offset = unforge_nat(data, 3)
+    if data[offset:] == NONE_FORGED:
+        return token_id, None
+    if data[offset : offset + 3] != SOME_BYTES_PREFIX:
+        raise ValueError('Unexpected ticket content layout')
+    length_bytes = data[offset + 3 : offset + 7]
+    token_info = data[offset + 7 :]
+    if len(length_bytes) != 4 or len(token_info) != int.from_bytes(length_bytes, 'big'):
+        raise ValueError('Unexpected ticket content length')
+    return token_id, token_info
+
+
 @dataclass
 class TicketContent:
     token_id: int
@@ -24,21 +101,26 @@ class TicketContent:
             token_info = bytes.fromhex(content['args'][1]['args'][0]['bytes'])
         return cls(token_id=token_id, token_info=token_info)
 
+    @classmethod
+    def from_bytes_hex(cls, payload: str) -> 'TicketContent':
+        """Parses ticket payload bytes used in L2 Etherlink Bridge contracts"""
+
+        token_id, token_info = unforge_ticket_content(
+            bytes.fromhex(payload.replace('0x', ''))
+        )
+        return cls(token_id=token_id, token_info=token_info)
+
     def to_micheline(self) -> dict[str, Any]:
-        return to_michelson_type(  # type: ignore
-            (self.token_id, self.token_info),
-            self.michelson_type,
-        ).to_micheline_value()
+        token_info: dict[str, Any] = {'prim': 'None'}
+        if self.token_info is not None:
+            token_info = {'prim': 'Some', 'args': [{'bytes': self.token_info.hex()}]}
+        return {'prim': 'Pair', 'args': [{'int': str(self.token_id)}, token_info]}
 
     def to_bytes_hex(self) -> str:
         """This function allows to make ticket payload bytes to be used in
         L2 Etherlink Bridge contracts"""
 
-        michelson_type = MichelsonType.match(to_micheline(self.michelson_type))
-        micheline_value = self.to_micheline()
-        value = michelson_type.from_micheline_value(micheline_value)
-        payload: str = value.forge('legacy_optimized').hex()
-        return payload
+        return forge_ticket_content(self.token_id, self.token_info).hex()
 
     def to_tuple(self) -> tuple[int, Optional[bytes]]:
         return (self.token_id, self.token_info)
@@ -0,0 +1,107 @@
+from dataclasses import dataclass, replace
+from typing import Iterable, Optional, Sequence
+from pytezos.client import PyTezosClient
+from pytezos.operation.group import OperationGroup
+from scripts.helpers.addressable import (
+    Addressable,
+    get_address,
+)
+from scripts.helpers.bulk import (
+    MAX_OPERATION_DATA_LENGTH,
+    send_packed,
+)
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+# Ticket is identified by the ticketer and the content bytes (TicketContent
+# is mutable, so it is not hashable):
+TicketKey = tuple[str, str]
+
+
+def get_ticket_key(ticketer: str, content: TicketContent) -> TicketKey:
+    return (ticketer, content.to_bytes_hex())
+
+
+@dataclass
+class TicketPayout:
+    destination: Addressable
+    ticketer: str
+    content: TicketContent
+    amount: int
+    entrypoint: Optional[str] = None
+
+    @property
+    def ticket_key(self) -> TicketKey:
+        return get_ticket_key(self.ticketer, self.content)
+
+
+@dataclass
+class PlannedTransfer:
+    ticket: Ticket
+    destination: str
+    entrypoint: str
+
+    def make_operation(self) -> OperationGroup:
+        return self.ticket.transfer(self.destination, self.entrypoint)
+
+
+def plan_ticket_transfers(
+    tickets: Iterable[Ticket],
+    payouts: Sequence[TicketPayout],
+) -> list[PlannedTransfer]:
+    """Splits owned tickets (as returned by `get_all_tickets`) into the
+    payouts. Payouts of the same ticket to the same destination and
+    entrypoint are merged into one transfer, transfers are kept in the
+    order of the first payout. Raises ValueError if the owned amount of
+    any ticket is not enough, before any ticket is split"""
+
+    owned: dict[TicketKey, Ticket] = {}
+    for ticket in tickets:
+        key = get_ticket_key(ticket.ticketer, ticket.content)
+        if key in owned:
+            ticket = replace(ticket, amount=owned[key].amount + ticket.amount)
+        owned[key] = ticket
+
+    merged: dict[tuple[str, str, TicketKey], int] = {}
+    required: dict[TicketKey, int] = {}
+    for payout in payouts:
+        if payout.amount <= 0:
+            raise ValueError(f'Payout amount should be positive, got {payout.amount}')
+        transfer_key = (
+            get_address(payout.destination),
+            payout.entrypoint or 'default',
+            payout.ticket_key,
+        )
+        merged[transfer_key] = merged.get(transfer_key, 0) + payout.amount
+        required[payout.ticket_key] = required.get(payout.ticket_key, 0) + payout.amount
+
+    for ticket_key, amount in required.items():
+        available = owned[ticket_key].amount if ticket_key in owned else 0
+        if amount > available:
+            ticketer, content_bytes = ticket_key
+            raise ValueError(
+                f'Not enough tickets of {ticketer} with content {content_bytes}: '
+                + f'required {amount}, owned {available}'
+            )
+
+    transfers = []
+    for (destination, entrypoint, ticket_key), amount in merged.items():
+        ticket, owned[ticket_key] = owned[ticket_key].split(amount)
+        transfers.append(PlannedTransfer(ticket, destination, entrypoint))
+    return transfers
+
+
+def transfer_tickets(
+    client: PyTezosClient,
+    tickets: Iterable[Ticket],
+    payouts: Sequence[TicketPayout],
+    max_size: int = MAX_OPERATION_DATA_LENGTH,
+) -> list[dict]:
+    """Plans the payouts from the owned tickets and sends all
+    `transfer_ticket` operations packed into as few operation groups as
+    the size and gas limits allow. Returns included operation dicts"""
+
+    transfers = plan_ticket_transfers(tickets, payouts)
+    operations = [transfer.make_operation() for transfer in transfers]
+    return send_packed(client, operations, max_size)
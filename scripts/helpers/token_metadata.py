@@ -0,0 +1,214 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Optional
+
+import requests
+from pytezos.client import PyTezosClient
+from pytezos.rpc.errors import RpcError
+
+
+DEFAULT_CACHE_FILENAME = os.path.join(
+    os.path.expanduser('~'), '.cache', 'etherlink-bridge', 'token-metadata.json'
+)
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+DEFAULT_BATCH_SIZE = 50
+
+
+@dataclass
+class TokenMetadata:
+    name: Optional[str] = None
+    symbol: Optional[str] = None
+    decimals: Optional[int] = None
+    standard: Optional[str] = None
+    total_supply: Optional[int] = None
+
+
+def make_asset_id(token_address: str, token_id: int) -> str:
+    """Returns asset id in the `{address}_{token_id}` form"""
+
+    return f'{token_address}_{token_id}'
+
+
+def split_asset_id(asset_id: str) -> tuple[str, int]:
+    """Splits asset id to the token address and token id"""
+
+    token_address, token_id = asset_id.split('_')
+    return token_address, int(token_id)
+
+
+def parse_tzkt_token(token_data: dict[str, Any]) -> TokenMetadata:
+    """Converts TzKT API `/tokens` item to the TokenMetadata"""
+
+    metadata = token_data.get('metadata') or {}
+    decimals = metadata.get('decimals')
+    total_supply = token_data.get('totalSupply')
+    standard = token_data.get('standard')
+    return TokenMetadata(
+        name=metadata.get('name'),
+        symbol=metadata.get('symbol'),
+        decimals=int(decimals) if decimals is not None else None,
+        standard=standard.upper() if standard else None,
+        total_supply=int(total_supply) if total_supply is not None else None,
+    )
+
+
+def parse_token_info(token_info: dict[str, bytes]) -> TokenMetadata:
+    """Converts TZIP-12 on-chain `token_info` map to the TokenMetadata"""
+
+    decoded = {key: value.decode('utf-8') for key, value in token_info.items()}
+    decimals = decoded.get('decimals')
+    return TokenMetadata(
+        name=decoded.get('name'),
+        symbol=decoded.get('symbol'),
+        decimals=int(decimals) if decimals is not None else None,
+    )
+
+
+class TokenMetadataResolver:
+    """Resolves token metadata using TzKT API in batches (`contract.in=`),
+    caches results on disk with TTL and falls back to the on-chain TZIP-12
+    `token_metadata` big_map if the token is not found in the indexer or
+    the indexer request fails"""
+
+    def __init__(
+        self,
+        tzkt_api_url: Optional[str],
+        client: Optional[PyTezosClient] = None,
+        cache_filename: Optional[str] = DEFAULT_CACHE_FILENAME,
+        cache_ttl: int = DEFAULT_CACHE_TTL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self._tzkt_api_url = tzkt_api_url.rstrip('/') if tzkt_api_url else None
+        self._client = client
+        self._cache_filename = cache_filename
+        self._cache_ttl = cache_ttl
+        self._batch_size = batch_size
+        self._session = requests.Session()
+        # NOTE: the same asset id refers to different tokens on different
+        # networks, so cached entries are namespaced by the metadata source:
+        if self._tzkt_api_url is not None:
+            self._cache_namespace = self._tzkt_api_url
+        elif client is not None:
+            self._cache_namespace = ','.join(client.shell.node.uri)
+        else:
+            self._cache_namespace = ''
+        self._cache: dict[str, dict[str, Any]] = self._load_cache()
+
+    def resolve(self, asset_id: str) -> Optional[TokenMetadata]:
+        """Returns metadata for a single asset or None if not found"""
+
+        return self.resolve_many([asset_id]).get(asset_id)
+
+    def resolve_many(self, asset_ids: Iterable[str]) -> dict[str, TokenMetadata]:
+        """Returns metadata for all given assets that could be resolved"""
+
+        resolved: dict[str, TokenMetadata] = {}
+        missing = []
+        for asset_id in dict.fromkeys(asset_ids):
+            cached = self._get_cached(asset_id)
+            if cached is None:
+                missing.append(asset_id)
+            else:
+                resolved[asset_id] = cached
+
+        fetched: dict[str, TokenMetadata] = {}
+        if self._tzkt_api_url is not None:
+            for start in range(0, len(missing), self._batch_size):
+                batch = missing[start : start + self._batch_size]
+                try:
+                    fetched.update(self._fetch_from_tzkt(batch))
+                except requests.RequestException:
+                    # NOTE: assets of the failed batch are resolved on-chain below
+                    continue
+
+        if self._client is not None:
+            for asset_id in missing:
+                if asset_id not in fetched:
+                    metadata = self._fetch_from_chain(asset_id)
+                    if metadata is not None:
+                        fetched[asset_id] = metadata
+
+        if fetched:
+            now = time.time()
+            for asset_id, metadata in fetched.items():
+                self._cache[self._cache_key(asset_id)] = {
+                    'fetched_at': now,
+                    'metadata': asdict(metadata),
+                }
+            self._save_cache()
+
+        return {**resolved, **fetched}
+
+    def _fetch_from_tzkt(self, asset_ids: list[str]) -> dict[str, TokenMetadata]:
+        requested = set(asset_ids)
+        addresses = sorted({split_asset_id(asset_id)[0] for asset_id in asset_ids})
+        token_ids = sorted({str(split_asset_id(asset_id)[1]) for asset_id in asset_ids})
+        response = self._session.get(
+            f'{self._tzkt_api_url}/tokens',
+            params={
+                'contract.in': ','.join(addresses),
+                'tokenId.in': ','.join(token_ids),
+                'limit': 10_000,
+            },
+        )
+        response.raise_for_status()
+
+        fetched = {}
+        for token_data in response.json():
+            asset_id = make_asset_id(
+                token_data['contract']['address'], int(token_data['tokenId'])
+            )
+            # NOTE: `contract.in` and `tokenId.in` filters are independent, so
+            # the response could include pairs that were not requested:
+            if asset_id in requested:
+                fetched[asset_id] = parse_tzkt_token(token_data)
+        return fetched
+
+    def _fetch_from_chain(self, asset_id: str) -> Optional[TokenMetadata]:
+        assert self._client is not None
+        token_address, token_id = split_asset_id(asset_id)
+        try:
+            contract = self._client.contract(token_address)
+            raw_metadata = contract.storage['token_metadata'][token_id]()
+        except (KeyError, AttributeError, RpcError, requests.RequestException):
+            # NOTE: pytezos raises RpcError if the contract is not found
+            return None
+
+        if isinstance(raw_metadata, dict):
+            token_info = raw_metadata['token_info']
+        else:
+            _, token_info = raw_metadata
+        metadata = parse_token_info(token_info)
+        entrypoints = contract.entrypoints
+        if 'update_operators' in entrypoints:
+            metadata.standard = 'FA2'
+        elif 'approve' in entrypoints:
+            metadata.standard = 'FA1.2'
+        return metadata
+
+    def _cache_key(self, asset_id: str) -> str:
+        return f'{self._cache_namespace}|{asset_id}'
+
+    def _get_cached(self, asset_id: str) -> Optional[TokenMetadata]:
+        cached = self._cache.get(self._cache_key(asset_id))
+        if cached is None or time.time() - cached['fetched_at'] > self._cache_ttl:
+            return None
+        return TokenMetadata(**cached['metadata'])
+
+    def _load_cache(self) -> dict[str, dict[str, Any]]:
+        if self._cache_filename is None or not os.path.exists(self._cache_filename):
+            return {}
+        with open(self._cache_filename) as f:
+            cache: dict[str, dict[str, Any]] = json.load(f)
+        return cache
+
+    def _save_cache(self) -> None:
+        if self._cache_filename is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self._cache_filename)), exist_ok=True)
+        tmp_filename = f'{self._cache_filename}.tmp'
+        with open(tmp_filename, 'w') as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_filename, self._cache_filename)
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, Optional, Protocol
+
+
+# Tracing API follows the subset of the OpenTelemetry tracer API used in the
+# scripts: `tracer.start_as_current_span(name, attributes=...)` returning a
+# span with `set_attribute`, so OpenTelemetry tracer can be used as is.
+TRACER_NAME = 'etherlink-bridge'
+
+
+class Tracer(Protocol):
+    def start_as_current_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> Any: ...
+
+
+class NoOpSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class NoOpTracer:
+    """Default tracer which does nothing"""
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> Iterator[NoOpSpan]:
+        yield NoOpSpan()
+
+
+@dataclass
+class RecordedSpan:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    start_time_unix_nano: int
+    end_time_unix_nano: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = 'OK'
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = 'ERROR'
+        self.events.append({
+            'name': 'exception',
+            'time_unix_nano': time.time_ns(),
+            'attributes': {
+                'exception.type': type(exception).__name__,
+                'exception.message': str(exception),
+            },
+        })
+
+
+class SpanExporter(Protocol):
+    def export(self, span: RecordedSpan) -> None: ...
+
+
+class InMemorySpanExporter:
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+
+    def export(self, span: RecordedSpan) -> None:
+        self.spans.append(span)
+
+
+class FileSpanExporter:
+    """Appends finished spans to the file, one JSON object per line"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def export(self, span: RecordedSpan) -> None:
+        line = json.dumps({**asdict(span), 'duration': span.duration})
+        with self._lock, open(self.filename, 'a') as f:
+            f.write(line + '\n')
+
+
+_current_span: ContextVar[Optional[RecordedSpan]] = ContextVar('current_span', default=None)
+
+
+class RecordingTracer:
+    """Minimal tracer recording spans with parent links and passing finished
+    spans to the exporter. Exceptions raised inside the span are recorded
+    and mark the span as failed"""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> Iterator[RecordedSpan]:
+        parent = _current_span.get()
+        span = RecordedSpan(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent.span_id if parent else None,
+            start_time_unix_nano=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exception:
+            span.record_exception(exception)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time_unix_nano = time.time_ns()
+            self.exporter.export(span)
+
+
+_tracer: Tracer = NoOpTracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Sets the global tracer and returns the previous one"""
+
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def use_opentelemetry() -> None:
+    """Sends spans to the OpenTelemetry tracer provider configured by the
+    application, requires optional `opentelemetry-api` package"""
+
+    try:
+        from opentelemetry import trace  # type: ignore
+    except ImportError as error:
+        raise ValueError('OpenTelemetry tracing requires `opentelemetry-api` package') from error
+    set_tracer(trace.get_tracer(TRACER_NAME))
+
+
+@contextmanager
+def trace_to_file(filename: str) -> Iterator[None]:
+    """Records spans to the file while the context is active"""
+
+    previous = set_tracer(RecordingTracer(FileSpanExporter(filename)))
+    try:
+        yield
+    finally:
+        set_tracer(previous)
+
+
+def start_span(name: str, **attributes: Any) -> Any:
+    """Starts the span with the global tracer, shortcut for the stages"""
+
+    return get_tracer().start_as_current_span(name, attributes=attributes)
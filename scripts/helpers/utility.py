@@ -2,18 +2,41 @@ from pytezos.client import PyTezosClient
 from pytezos import pytezos
 from pytezos.contract.interface import ContractInterface
 from pytezos.operation.group import OperationGroup
+from pytezos.rpc.shell import ShellQuery
+import hashlib
+import os
+import pickle
+import threading
+from copy import deepcopy
+from functools import lru_cache
 from os.path import dirname
 from os.path import join
 from pytezos.michelson.parse import michelson_to_micheline
 from pytezos.michelson.types.base import MichelsonType
-from typing import Any
+from typing import Any, Optional, Type
 from web3 import Web3
 from eth_account.signers.local import LocalAccount
+from scripts.helpers.endpoint_pool import (
+    PooledHTTPProvider,
+    PooledRpcNode,
+    get_endpoint_pool,
+    parse_urls,
+)
+from scripts.helpers.etherlink.subscriptions import is_websocket_url
+from scripts.helpers.tracing import start_span
 
 
 # Default address used as a placeholder in the contract storage
 DEFAULT_ADDRESS = 'tz1burnburnburnburnburnburnburjAYjjX'
 
+# Directory with pickled parsed Micheline of the contract files, the on-disk
+# cache is used only if the directory is set:
+CONTRACTS_CACHE_DIR_ENV = 'CONTRACTS_CACHE_DIR'
+
+# Parsed contracts by absolute path: (modification time, size, contract)
+_contracts_cache: dict[str, tuple[int, int, ContractInterface]] = {}
+_contracts_cache_lock = threading.Lock()
+
 
 def pkh(client: PyTezosClient) -> str:
     """Returns public key hash of given client"""
@@ -28,14 +51,24 @@ def find_op_by_hash(client: PyTezosClient, opg: OperationGroup) -> dict:
     return op  # type: ignore
 
 
+def get_addresses_from_op(op: dict) -> list[str]:
+    """Returns all originated contract addresses from given operation dict
+    in the order of the operation contents"""
+
+    addresses: list[str] = []
+    for content in op['contents']:
+        op_result: dict = content['metadata']['operation_result']
+        addresses.extend(op_result.get('originated_contracts', []))
+    return addresses
+
+
 def get_address_from_op(op: dict) -> str:
     """Returns originated contract address from given operation dict"""
 
     contents = op['contents']
-    assert len(contents) == 1, 'multiple origination not supported'
-    op_result: dict = contents[0]['metadata']['operation_result']
-    contracts = op_result['originated_contracts']
-    assert len(contracts) == 1, 'multiple origination not supported'
+    assert len(contents) == 1, 'multiple origination not supported, use get_addresses_from_op'
+    contracts = get_addresses_from_op(op)
+    assert len(contracts) == 1, 'multiple origination not supported, use get_addresses_from_op'
     originated_contract = contracts[0]
     assert isinstance(originated_contract, str)
     return originated_contract
@@ -57,20 +90,35 @@ def load_contract_from_address(
     return contract
 
 
+@lru_cache(maxsize=256)
+def parse_type_expression(type_expression: str) -> dict:
+    """Parses Michelson type expression string to Micheline expression once
+    per expression, the result is shared and should not be modified"""
+
+    return michelson_to_micheline(type_expression)  # type: ignore
+
+
+@lru_cache(maxsize=256)
+def match_michelson_type(type_expression: str) -> Type[MichelsonType]:
+    """Returns MichelsonType class matched for given type expression, the
+    class is built once per expression"""
+
+    return MichelsonType.match(parse_type_expression(type_expression))
+
+
 def to_micheline(type_expression: str) -> dict:
     """Converts Michelson type expression string to Micheline expression
     (reusing pytezos.michelson.parse.michelson_to_micheline) with
     type checking
     """
 
-    return michelson_to_micheline(type_expression)  # type: ignore
+    return deepcopy(parse_type_expression(type_expression))
 
 
 def to_michelson_type(object: Any, type_expression: str) -> MichelsonType:
     """Converts Python object to Michelson type using given type expression"""
 
-    micheline_expression = to_micheline(type_expression)
-    michelson_type = MichelsonType.match(micheline_expression)
+    michelson_type = match_michelson_type(type_expression)
     return michelson_type.from_python_object(object)
 
 
@@ -80,6 +128,22 @@ def pack(object: Any, type_expression: str) -> bytes:
     return to_michelson_type(object, type_expression).pack()
 
 
+def pack_string_bytes_map(items: dict[str, bytes]) -> bytes:
+    """Packs `map string bytes` without building MichelsonType, the result
+    is the same as `pack(items, 'map string bytes')`. Packed map is the
+    `0x05` prefix followed by the forged sequence of `Elt key value` sorted
+    by key bytes. Michelson strings are ASCII only, so non-ASCII key raises
+    ValueError (UnicodeEncodeError) as pytezos would reject it too"""
+
+    elements = bytearray()
+    for key, value in sorted((key.encode('ascii'), value) for key, value in items.items()):
+        # Elt primitive with two args, string key and bytes value:
+        elements += b'\x07\x04'
+        elements += b'\x01' + len(key).to_bytes(4, 'big') + key
+        elements += b'\x0a' + len(value).to_bytes(4, 'big') + value
+    return b'\x05\x02' + len(elements).to_bytes(4, 'big') + bytes(elements)
+
+
 # TODO: rename tezos_address_to_bytes_hex, make entity Addressable, move to addressable.py, reuse tezos_address_to_bytes
 def make_address_bytes(address: str) -> str:
     """Forges Tezos contract address (KT1, tz1, tz2, tz3) to bytes hex.
@@ -90,30 +154,114 @@ def make_address_bytes(address: str) -> str:
     return pack(address, 'address')[-22:].hex()
 
 
+def load_micheline_from_file(filename: str, cache_dir: Optional[str] = None) -> Any:
+    """Parses Michelson file to Micheline. If `cache_dir` is provided, the
+    result is pickled there by the file content hash and reused by the next
+    processes. ContractInterface itself can not be pickled (pytezos builds
+    its types dynamically), so the parsed Micheline is cached"""
+
+    with open(filename, 'rb') as f:
+        source = f.read()
+    if cache_dir is None:
+        return michelson_to_micheline(source.decode())
+
+    cache_filename = join(cache_dir, hashlib.sha256(source).hexdigest() + '.pickle')
+    try:
+        with open(cache_filename, 'rb') as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    micheline = michelson_to_micheline(source.decode())
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_filename + '.tmp', 'wb') as f:
+        pickle.dump(micheline, f)
+    os.replace(cache_filename + '.tmp', cache_filename)
+    return micheline
+
+
+def load_contract_interface(filename: str, cache_dir: Optional[str] = None) -> ContractInterface:
+    """Returns parsed contract from the file, the contract is parsed once per
+    process and reparsed only if the file is modified. Returned contract is
+    shared, use `.using(...)` to get the contract bound to the client"""
+
+    cache_dir = cache_dir or os.environ.get(CONTRACTS_CACHE_DIR_ENV)
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    with _contracts_cache_lock:
+        cached = _contracts_cache.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    micheline = load_micheline_from_file(path, cache_dir)
+    contract = ContractInterface.from_micheline(micheline)
+    with _contracts_cache_lock:
+        _contracts_cache[path] = (stat.st_mtime_ns, stat.st_size, contract)
+    return contract
+
+
 def originate_from_file(
     filename: str, client: PyTezosClient, storage: Any
 ) -> OperationGroup:
     """Deploys contract from filename with given storage
     using given client and returns OperationGroup"""
 
-    raw_contract = ContractInterface.from_file(filename)
+    raw_contract = load_contract_interface(filename)
     contract = raw_contract.using(key=client.key, shell=client.shell)
     return contract.originate(initial_storage=storage)
 
 
-def get_tezos_client(shell: str, key: str) -> PyTezosClient:
-    """Returns PyTezosClient using given shell and key"""
+def send_operation(opg: OperationGroup) -> OperationGroup:
+    """Sends operation group in the same way as `OperationGroup.send` does,
+    with a tracing span for each stage: autofill (simulation), sign and
+    inject"""
+
+    ttl = opg.context.get_operations_ttl()
+    with start_span('autofill', chain='tezos'):
+        opg = opg.autofill(ttl=ttl)
+    with start_span('sign', chain='tezos'):
+        opg = opg.sign()
+    with start_span('inject', chain='tezos') as span:
+        result = opg.inject(num_blocks_wait=ttl)
+        span.set_attribute('operation_hash', result['hash'])
+    return opg._spawn(opg_hash=result['hash'], opg_result=result)  # type: ignore
 
-    client: PyTezosClient = pytezos.using(shell=shell, key=key)
+
+def wait_for_operation(client: PyTezosClient, opg: OperationGroup) -> None:
+    """Waits for the operation group inclusion within the tracing span"""
+
+    with start_span('wait_for_inclusion', chain='tezos', operation_hash=opg.opg_hash):
+        client.wait(opg)
+
+
+def get_tezos_client(shell: str, key: Optional[str] = None) -> PyTezosClient:
+    """Returns PyTezosClient using given shell and key, the shell can be
+    a comma-separated list of endpoints used with failover. The key can be
+    omitted if the client is only used to read the chain"""
+
+    urls = parse_urls(shell)
+    if len(urls) > 1:
+        node = PooledRpcNode(get_endpoint_pool(shell))
+        client: PyTezosClient = pytezos.using(shell=ShellQuery(node=node), key=key)
+    else:
+        client = pytezos.using(shell=shell, key=key)
     # TODO: validate balance, validate that account revealed (reuse logic from bootstrap?)
 
     return client
 
 
 def get_etherlink_web3(shell: str) -> Web3:
-    """Returns Web3 instance using given shell"""
-
-    web3 = Web3(Web3.HTTPProvider(shell))
+    """Returns Web3 instance using given shell, the shell can be
+    a comma-separated list of endpoints used with failover or a WebSocket
+    URL (`ws://` or `wss://`), then receipts are awaited by subscription"""
+
+    urls = parse_urls(shell)
+    if is_websocket_url(shell):
+        web3 = Web3(Web3.WebsocketProvider(shell))
+    elif len(urls) > 1:
+        web3 = Web3(PooledHTTPProvider(get_endpoint_pool(shell)))
+    else:
+        web3 = Web3(Web3.HTTPProvider(shell))
     if not web3.is_connected():
         raise Exception(f'Failed to connect to Etherlink node: {shell}')
     # TODO: validate balance (reuse logic from bootstrap?)
@@ -0,0 +1,55 @@
+import random
+import time
+from typing import Any, Callable, Iterator, TypeVar
+
+
+T = TypeVar('T')
+
+
+class WaitTimeout(TimeoutError):
+    """Raised when the condition is not met before the deadline, keeps the
+    last checked result so the caller can report what was observed"""
+
+    def __init__(self, message: str, last_result: Any = None):
+        super().__init__(message)
+        self.last_result = last_result
+
+
+def backoff_delays(
+    initial_delay: float = 0.5,
+    max_delay: float = 10,
+    factor: float = 2,
+    jitter: float = 0.2,
+) -> Iterator[float]:
+    """Yields exponentially growing delays capped by `max_delay`, each
+    delay is randomized by ±`jitter` fraction"""
+
+    delay = initial_delay
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, max_delay)
+
+
+def wait_until(
+    check: Callable[[], T],
+    condition: Callable[[T], bool] = bool,
+    timeout: float = 60,
+    initial_delay: float = 0.5,
+    max_delay: float = 10,
+    factor: float = 2,
+    jitter: float = 0.2,
+) -> T:
+    """Calls `check` until `condition` is met for its result and returns the
+    result. The first check is made immediately, then delays grow with
+    exponential backoff. Raises WaitTimeout when the deadline is passed"""
+
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays(initial_delay, max_delay, factor, jitter)
+    while True:
+        result = check()
+        if condition(result):
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise WaitTimeout(f'Condition is not met in {timeout} seconds', result)
+        time.sleep(min(next(delays), remaining))
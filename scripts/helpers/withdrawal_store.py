@@ -0,0 +1,251 @@
+import sqlite3
+import time
+from types import TracebackType
+from typing import Any, Optional, Type
+
+
+# Withdrawal lifecycle statuses in the order of the steps, status never goes
+# back, so repeating earlier step (or failed re-execution) does not reset it:
+INITIATED = 'initiated'  # L2 withdrawal transaction is sent
+OUTBOX_KNOWN = 'outbox_known'  # outbox level and index are parsed from the event
+PROVED = 'proved'  # commitment and proof are received from the rollup node
+FAILED = 'failed'  # outbox message execution failed
+EXECUTED = 'executed'  # outbox message is executed on L1
+STATUSES = [INITIATED, OUTBOX_KNOWN, PROVED, FAILED, EXECUTED]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS withdrawals (
+    id INTEGER PRIMARY KEY,
+    tx_hash TEXT UNIQUE,
+    sender TEXT,
+    ticket_owner TEXT,
+    receiver TEXT,
+    proxy TEXT,
+    amount TEXT,
+    ticket_hash TEXT,
+    ticketer_bytes TEXT,
+    content_bytes TEXT,
+    outbox_level INTEGER,
+    outbox_index INTEGER,
+    commitment TEXT,
+    proof TEXT,
+    l1_op_hash TEXT,
+    error TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (outbox_level, outbox_index)
+);
+-- Ready to execute: proved messages ordered by the outbox level
+CREATE INDEX IF NOT EXISTS withdrawals_status_level
+    ON withdrawals (status, outbox_level);
+-- Stuck: not executed withdrawals which were not updated for a long time
+CREATE INDEX IF NOT EXISTS withdrawals_status_updated_at
+    ON withdrawals (status, updated_at);
+CREATE INDEX IF NOT EXISTS withdrawals_proof
+    ON withdrawals (proof);
+'''
+
+# Fields which can be provided for each step, status is set by the step:
+FIELDS = [
+    'tx_hash',
+    'sender',
+    'ticket_owner',
+    'receiver',
+    'proxy',
+    'amount',
+    'ticket_hash',
+    'ticketer_bytes',
+    'content_bytes',
+    'outbox_level',
+    'outbox_index',
+    'commitment',
+    'proof',
+    'l1_op_hash',
+    'error',
+]
+
+
+class WithdrawalStore:
+    """SQLite store of the withdrawal lifecycle linking L2 transaction hash,
+    withdrawal event fields, outbox level and index, commitment and proof,
+    and L1 execution operation hash. Each step updates the same row found
+    by the tx hash, the outbox coordinates or the proof, so steps can be
+    recorded in any order and repeated (rows recorded under different keys
+    are merged once a step links them)"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._connection = sqlite3.connect(filename)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> 'WithdrawalStore':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def record_withdrawal(self, tx_hash: str, **fields: Any) -> dict[str, Any]:
+        """Records sent L2 withdrawal transaction"""
+
+        return self._upsert(INITIATED, tx_hash=tx_hash, **fields)
+
+    def record_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Records parsed withdrawal event, the event should contain at least
+        outbox_level and outbox_index"""
+
+        fields = {key: event[key] for key in FIELDS if event.get(key) is not None}
+        if 'transaction_hash' in event:
+            fields['tx_hash'] = event['transaction_hash']
+        return self._upsert(OUTBOX_KNOWN, **fields)
+
+    def record_proof(
+        self, outbox_level: int, outbox_index: int, commitment: str, proof: str
+    ) -> dict[str, Any]:
+        """Records the commitment and the proof of the outbox message"""
+
+        return self._upsert(
+            PROVED,
+            outbox_level=outbox_level,
+            outbox_index=outbox_index,
+            commitment=commitment,
+            proof=proof,
+        )
+
+    def record_execution(
+        self,
+        commitment: str,
+        proof: str,
+        l1_op_hash: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Records the result of the outbox message execution on L1"""
+
+        return self._upsert(
+            FAILED if error else EXECUTED,
+            commitment=commitment,
+            proof=proof,
+            l1_op_hash=l1_op_hash,
+            error=error,
+        )
+
+    def get(self, tx_hash: str) -> Optional[dict[str, Any]]:
+        row = self._connection.execute(
+            'SELECT * FROM withdrawals WHERE tx_hash = ?', (tx_hash,)
+        ).fetchone()
+        return None if row is None else dict(row)
+
+    def get_ready_to_execute(self, cemented_level: Optional[int] = None) -> list[dict[str, Any]]:
+        """Returns proved withdrawals which are not executed yet, if the
+        cemented level is provided, only messages at or below it"""
+
+        query = 'SELECT * FROM withdrawals WHERE status = ?'
+        params: list[Any] = [PROVED]
+        if cemented_level is not None:
+            query += ' AND outbox_level <= ?'
+            params.append(cemented_level)
+        query += ' ORDER BY outbox_level, outbox_index'
+        return [dict(row) for row in self._connection.execute(query, params)]
+
+    def get_stuck(self, older_than: float, now: Optional[float] = None) -> list[dict[str, Any]]:
+        """Returns withdrawals which are not executed and were not updated
+        for more than `older_than` seconds"""
+
+        now = time.time() if now is None else now
+        statuses = [status for status in STATUSES if status != EXECUTED]
+        query = (
+            f'SELECT * FROM withdrawals WHERE status IN ({", ".join("?" * len(statuses))}) '
+            'AND updated_at < ? ORDER BY updated_at'
+        )
+        rows = self._connection.execute(query, [*statuses, now - older_than])
+        return [dict(row) for row in rows]
+
+    def _find(self, fields: dict[str, Any]) -> list[sqlite3.Row]:
+        """Returns rows matching any of the keys in the fields, there are
+        several if the steps were first recorded under different keys"""
+
+        lookups = [
+            ('tx_hash = ?', ['tx_hash']),
+            ('outbox_level = ? AND outbox_index = ?', ['outbox_level', 'outbox_index']),
+            ('proof = ?', ['proof']),
+        ]
+        rows: dict[int, sqlite3.Row] = {}
+        for condition, keys in lookups:
+            if all(fields.get(key) is not None for key in keys):
+                for row in self._connection.execute(
+                    f'SELECT * FROM withdrawals WHERE {condition}',
+                    [fields[key] for key in keys],
+                ):
+                    rows[row['id']] = row
+        return [rows[row_id] for row_id in sorted(rows)]
+
+    def _merge(self, rows: list[sqlite3.Row]) -> sqlite3.Row:
+        """Merges rows of the same withdrawal into the oldest one, e.g. the
+        row of the withdrawal transaction (by tx hash) and the row of the
+        proof (by outbox level and index) when the event links them"""
+
+        merged, *others = rows
+        values = {
+            key: next((row[key] for row in rows if row[key] is not None), None)
+            for key in FIELDS
+        }
+        status = max((row['status'] for row in rows), key=STATUSES.index)
+        created_at = min(row['created_at'] for row in rows)
+        # NOTE: other rows are deleted first, so unique keys can be moved:
+        self._connection.executemany(
+            'DELETE FROM withdrawals WHERE id = ?', [(row['id'],) for row in others]
+        )
+        assignments = ', '.join(f'{key} = ?' for key in values)
+        self._connection.execute(
+            f'UPDATE withdrawals SET {assignments}, status = ?, created_at = ? WHERE id = ?',
+            [*values.values(), status, created_at, merged['id']],
+        )
+        result: sqlite3.Row = self._connection.execute(
+            'SELECT * FROM withdrawals WHERE id = ?', (merged['id'],)
+        ).fetchone()
+        return result
+
+    def _upsert(self, status: str, **fields: Any) -> dict[str, Any]:
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown withdrawal fields: {", ".join(sorted(unknown))}')
+        # NOTE: amounts may not fit to the SQLite integer, so they are stored as text
+        fields = {
+            key: str(value) if key == 'amount' else value
+            for key, value in fields.items()
+            if value is not None
+        }
+        now = time.time()
+        with self._connection:
+            rows = self._find(fields)
+            existing = self._merge(rows) if len(rows) > 1 else next(iter(rows), None)
+            if existing is None:
+                columns = [*fields, 'status', 'created_at', 'updated_at']
+                cursor = self._connection.execute(
+                    f'INSERT INTO withdrawals ({", ".join(columns)}) '
+                    f'VALUES ({", ".join("?" for _ in columns)})',
+                    [*fields.values(), status, now, now],
+                )
+                row_id = cursor.lastrowid
+            else:
+                row_id = existing['id']
+                status = max(status, existing['status'], key=STATUSES.index)
+                assignments = ', '.join(f'{key} = ?' for key in fields)
+                self._connection.execute(
+                    f'UPDATE withdrawals SET {assignments}, status = ?, updated_at = ? '
+                    'WHERE id = ?',
+                    [*fields.values(), status, now, row_id],
+                )
+        row = self._connection.execute(
+            'SELECT * FROM withdrawals WHERE id = ?', (row_id,)
+        ).fetchone()
+        return dict(row)
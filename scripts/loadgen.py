@@ -0,0 +1,233 @@
+import json
+import click
+from dataclasses import replace
+from typing import Any, Optional
+from pytezos.client import PyTezosClient
+from pytezos.operation.group import OperationGroup
+from pytezos.sandbox.node import sandbox_port
+from scripts import cli_options
+from scripts.defaults import SMART_ROLLUP_ADDRESS
+from scripts.helpers.contracts import TokenBridgeHelper
+from scripts.helpers.etherlink import FaWithdrawalPrecompileHelper
+from scripts.helpers.loadgen import (
+    Account,
+    Actor,
+    make_report,
+    run_load,
+)
+from scripts.helpers.utility import (
+    get_etherlink_account,
+    get_etherlink_web3,
+    get_tezos_client,
+    make_address_bytes,
+)
+from scripts.helpers.formatting import (
+    accent,
+    echo_variable,
+    wrap,
+)
+
+
+SCENARIOS = ['deposit', 'ticket_transfer', 'withdraw']
+
+# Keys of the sandboxed node and anvil default accounts:
+SANDBOX_KEYS = 'bootstrap1,bootstrap2,bootstrap3,bootstrap4,bootstrap5'
+ANVIL_KEYS = 'ac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80'
+
+
+def get_head_level(client: PyTezosClient) -> int:
+    level: int = client.shell.head.header()['level']
+    return level
+
+
+def get_inclusion_level(client: PyTezosClient, opg_hash: str, from_level: int) -> int:
+    """Returns the level of the block which includes the operation, blocks
+    are checked from `from_level` (the head when the wait started) to the
+    current head, as the head may already be ahead when the wait returns"""
+
+    for level in range(from_level, get_head_level(client) + 1):
+        passes = client.shell.blocks[level].operation_hashes()
+        if any(opg_hash in hashes for hashes in passes):
+            return level
+    raise RuntimeError(f'Operation {opg_hash} is not found in blocks since {from_level}')
+
+
+def wait_for_inclusion(client: PyTezosClient, opg: OperationGroup) -> int:
+    """Waits for the operation group and returns its inclusion level"""
+
+    from_level = get_head_level(client)
+    client.wait(opg)
+    return get_inclusion_level(client, opg.opg_hash, from_level)  # type: ignore
+
+
+def make_deposit_actor(
+    client: PyTezosClient,
+    helper_address: str,
+    smart_rollup_address: str,
+    receiver: bytes,
+    amount: int,
+) -> Actor:
+    helper = TokenBridgeHelper.from_address(client, helper_address)
+    token = helper.get_ticketer().get_token()
+
+    def send() -> int:
+        opg = client.bulk(
+            token.disallow(client, helper),
+            token.allow(client, helper),
+            helper.deposit(smart_rollup_address, receiver, amount),
+        ).send()
+        return wait_for_inclusion(client, opg)
+
+    return 'deposit', send
+
+
+def make_ticket_transfer_actor(
+    client: PyTezosClient,
+    helper_address: str,
+    destination: str,
+    amount: int,
+) -> Actor:
+    ticketer = TokenBridgeHelper.from_address(client, helper_address).get_ticketer()
+    ticket = ticketer.read_ticket(client)
+    if ticket.amount < amount:
+        raise click.ClickException(
+            f'Account {client.key.public_key_hash()} has no tickets to transfer'
+        )
+    ticket = replace(ticket, amount=amount)
+
+    def send() -> int:
+        opg = ticket.transfer(destination).send()
+        return wait_for_inclusion(client, opg)
+
+    return 'ticket_transfer', send
+
+
+def make_withdraw_actor(
+    precompile: FaWithdrawalPrecompileHelper,
+    erc20_proxy_address: str,
+    routing_info: bytes,
+    ticketer: bytes,
+    content: bytes,
+    amount: int,
+) -> Actor:
+    def send() -> int:
+        receipt = precompile.withdraw(
+            ticket_owner=erc20_proxy_address,
+            routing_info=routing_info,
+            amount=amount,
+            ticketer=ticketer,
+            content=content,
+        )
+        if receipt['status'] != 1:
+            raise RuntimeError('Transaction reverted')
+        block_number: int = receipt['blockNumber']
+        return block_number
+
+    return 'withdraw', send
+
+
+def echo_report(report: dict[str, Any]) -> None:
+    for kind, stats in report.items():
+        click.echo(wrap(accent(kind)) + ':')
+        echo_variable('  - ', 'Sent', str(stats['sent']))
+        echo_variable('  - ', 'Succeeded', str(stats['succeeded']))
+        echo_variable('  - ', 'Throughput', f'{stats["throughput"]:.2f} ops/s')
+        for name, value in stats['latency'].items():
+            echo_variable('  - ', f'Latency {name}', f'{value:.2f} s')
+        if stats['ops_per_block']:
+            echo_variable('  - ', 'Max ops per block', str(stats['ops_per_block']['max']))
+            echo_variable('  - ', 'Mean ops per block', f'{stats["ops_per_block"]["mean"]:.2f}')
+        for error, count in stats['failures'].items():
+            echo_variable('  - ', f'Failed with {error}', str(count))
+
+
+@click.command()
+@click.option('--scenario', 'scenarios', multiple=True, type=click.Choice(SCENARIOS), default=['deposit'], show_default=True, help='Operations to generate, can be provided multiple times.')
+@click.option('--rate', default=1.0, show_default=True, help='Target rate of submitted operations per second for all scenarios.')
+@click.option('--concurrency', default=4, show_default=True, help='Number of operations in flight.')
+@click.option('--duration', default=60.0, show_default=True, help='Duration of the load in seconds.')
+@click.option('--amount', default=1, show_default=True, help='Amount of tokens or tickets in each operation.')
+@click.option('--tezos-private-keys', default=SANDBOX_KEYS, envvar='TEZOS_PRIVATE_KEYS', show_default=True, help='Comma-separated Tezos account pool, each account sends one operation at a time.')
+@click.option('--tezos-rpc-url', default=f'http://localhost:{sandbox_port()}', envvar='TEZOS_RPC_URL', show_default=True, help='Tezos RPC shell URL.')
+@click.option('--token-bridge-helper-address', default=None, help='Token Bridge Helper used in deposit and ticket_transfer scenarios.')
+@click.option('--smart-rollup-address', default=SMART_ROLLUP_ADDRESS, envvar='SMART_ROLLUP_ADDRESS', show_default=True, help='The address of the Smart Rollup deposits are sent to.')
+@click.option('--etherlink-receiver-address', default='0x' + '00' * 20, show_default=True, help='Etherlink receiver of deposits.')
+@click.option('--etherlink-private-keys', default=ANVIL_KEYS, envvar='ETHERLINK_PRIVATE_KEYS', show_default=True, help='Comma-separated Etherlink account pool, each account sends one transaction at a time.')
+@click.option('--etherlink-rpc-url', default='http://localhost:8545', envvar='ETHERLINK_RPC_URL', show_default=True, help='Etherlink RPC URL.')
+@click.option('--erc20-proxy-address', default=None, help='ERC20 Proxy used in withdraw scenario.')
+@click.option('--ticketer-address', default=None, help='Ticketer of the withdrawn tickets, it is also used as the withdrawal router.')
+@click.option('--ticket-content-bytes', default=None, help='Content of the withdrawn tickets in the forged form, see `get_ticketer_params` command.')
+@cli_options.withdraw_precompile
+@click.option('--report-file', default=None, type=click.Path(dir_okay=False), help='Save the report to the JSON file.')
+@cli_options.profile
+def loadgen(
+    scenarios: tuple[str, ...],
+    rate: float,
+    concurrency: int,
+    duration: float,
+    amount: int,
+    tezos_private_keys: str,
+    tezos_rpc_url: str,
+    token_bridge_helper_address: Optional[str],
+    smart_rollup_address: str,
+    etherlink_receiver_address: str,
+    etherlink_private_keys: str,
+    etherlink_rpc_url: str,
+    erc20_proxy_address: Optional[str],
+    ticketer_address: Optional[str],
+    ticket_content_bytes: Optional[str],
+    withdraw_precompile: str,
+    report_file: Optional[str],
+) -> dict[str, Any]:
+    """Generates sustained deposit, ticket transfer and FA withdrawal load
+    and reports throughput, inclusion latency and failures. Intended to run
+    against a local sandboxed node and a local EVM node (anvil)."""
+
+    tezos_clients = [
+        get_tezos_client(tezos_rpc_url, key) for key in tezos_private_keys.split(',')
+    ]
+    # NOTE: each Tezos account runs all selected Tezos scenarios in turn:
+    tezos_accounts: list[Account] = [[] for _ in tezos_clients]
+    etherlink_accounts: list[Account] = []
+
+    if 'deposit' in scenarios or 'ticket_transfer' in scenarios:
+        if token_bridge_helper_address is None:
+            raise click.BadParameter('Required for deposit and ticket_transfer scenarios', param_hint='--token-bridge-helper-address')
+    if 'deposit' in scenarios:
+        receiver = bytes.fromhex(etherlink_receiver_address.replace('0x', ''))
+        for account, client in zip(tezos_accounts, tezos_clients):
+            account.append(make_deposit_actor(client, token_bridge_helper_address, smart_rollup_address, receiver, amount))  # type: ignore
+    if 'ticket_transfer' in scenarios:
+        # NOTE: tickets are passed around the pool, so the balances are kept
+        destinations = [c.key.public_key_hash() for c in tezos_clients[1:] + tezos_clients[:1]]
+        for account, client, destination in zip(tezos_accounts, tezos_clients, destinations):
+            account.append(make_ticket_transfer_actor(client, token_bridge_helper_address, destination, amount))  # type: ignore
+    if 'withdraw' in scenarios:
+        if erc20_proxy_address is None or ticketer_address is None or ticket_content_bytes is None:
+            raise click.BadParameter('Required for withdraw scenario', param_hint='--erc20-proxy-address, --ticketer-address, --ticket-content-bytes')
+        web3 = get_etherlink_web3(etherlink_rpc_url)
+        withdrawal_receiver = tezos_clients[0].key.public_key_hash()
+        routing_info = bytes.fromhex(make_address_bytes(withdrawal_receiver) + make_address_bytes(ticketer_address))
+        ticketer = bytes.fromhex(make_address_bytes(ticketer_address))
+        content = bytes.fromhex(ticket_content_bytes.replace('0x', ''))
+        for key in etherlink_private_keys.split(','):
+            precompile = FaWithdrawalPrecompileHelper.from_address(
+                web3=web3,
+                account=get_etherlink_account(web3, key),
+                address=withdraw_precompile,
+            )
+            etherlink_accounts.append([make_withdraw_actor(precompile, erc20_proxy_address, routing_info, ticketer, content, amount)])
+
+    accounts = [account for account in tezos_accounts + etherlink_accounts if account]
+    click.echo(
+        'Generating load: ' + wrap(accent(', '.join(scenarios)))
+        + f' at {rate} ops/s for {duration} s using {len(accounts)} accounts'
+    )
+    results = run_load(accounts, rate, concurrency, duration)
+    report = make_report(results, duration)
+    echo_report(report)
+
+    if report_file is not None:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
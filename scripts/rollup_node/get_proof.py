@@ -1,7 +1,10 @@
 import click
+from scripts.helpers.formatting import accent
 from scripts.helpers.rollup_node import get_proof as get_proof_from_rpc, Proof
+from scripts.helpers.tracing import start_span
+from scripts.helpers.withdrawal_store import WithdrawalStore
 from scripts import cli_options
-from scripts.helpers.formatting import accent
+from typing import Optional
 
 
 @click.command()
@@ -9,21 +12,30 @@ from scripts.helpers.formatting import accent
 @click.option('--index', required=True, type=int, help='The index of the message.')
 @cli_options.etherlink_rollup_node_url
 @cli_options.silent
+@cli_options.withdrawal_store
+@cli_options.rpc_metrics
+@cli_options.trace_file
+@cli_options.profile
 def get_proof(
     level: int,
     index: int,
     etherlink_rollup_node_url: str,
     silent: bool,
+    withdrawal_store: Optional[str] = None,
 ) -> Proof:
     """Makes call to the RPC and returns proof info required to execute outbox_message"""
 
     level_and_index = 'level ' + accent(str(level)) + ', index ' + accent(str(index))
-    proof = get_proof_from_rpc(etherlink_rollup_node_url, level, index)
+    with start_span('fetch_proof', chain='rollup_node', level=level, index=index):
+        proof = get_proof_from_rpc(etherlink_rollup_node_url, level, index)
     if 'commitment' in proof:
         if not silent:
             click.echo('Outbox message at ' + level_and_index + ':')
             click.echo('  - Commitment: `' + accent(proof['commitment']) + '`')
             click.echo('  - Proof: `' + accent(proof['proof']) + '`')
+        if withdrawal_store is not None:
+            with WithdrawalStore(withdrawal_store) as store:
+                store.record_proof(level, index, proof['commitment'], proof['proof'])
         return proof
 
     click.echo('Failed to get proof for outbox message at ' + level_and_index + '.')
@@ -1,7 +1,9 @@
 import click
-from scripts.helpers.rollup_node import get_messages
-from scripts import cli_options
+from typing import Optional
 from scripts.helpers.formatting import accent
+from scripts.helpers.rollup_node import decode_outbox_messages, get_messages
+from scripts.helpers.ndjson import COMPRESSIONS, NdjsonWriter
+from scripts import cli_options
 import time
 import json
 
@@ -31,17 +33,50 @@ import json
     help='Time between requests in seconds.',
     show_default=True,
 )
+@click.option(
+    '--export-file',
+    default=None,
+    help='Stream decoded messages to the file as NDJSON (one JSON object per transaction), `-` writes to stdout.',
+)
+@click.option(
+    '--compression',
+    default=None,
+    type=click.Choice(COMPRESSIONS),
+    help='Export file compression, inferred from the file suffix (.gz, .zst) if not set.',
+)
+@click.option(
+    '--rotate-lines',
+    default=None,
+    type=int,
+    help='Start new export file each given number of lines.',
+)
 @cli_options.etherlink_rollup_node_url
 @cli_options.silent
+@cli_options.rpc_metrics
+@cli_options.profile
 def scan_outbox(
     level_from: int,
     max_levels: int,
     sleep_time: int,
     echo_content: bool,
+    export_file: Optional[str],
+    compression: Optional[str],
+    rotate_lines: Optional[int],
     etherlink_rollup_node_url: str,
     silent: bool,
 ) -> None:
-    """Echoes all outbox messages in the specified range of levels."""
+    """Echoes all outbox messages in the specified range of levels or
+    exports them decoded to the NDJSON file."""
+
+    if export_file is not None:
+        export_outbox(
+            etherlink_rollup_node_url,
+            level_from,
+            max_levels,
+            sleep_time,
+            NdjsonWriter(export_file, compression, rotate_lines),
+        )
+        return
 
     level_to = level_from + max_levels
     click.echo(
@@ -56,3 +91,29 @@ def scan_outbox(
         info = json.dumps(messages, indent=2) if echo_content else str(len(messages))
         click.echo(accent(str(level)) + ': ' + info)
         time.sleep(sleep_time)
+
+
+def export_outbox(
+    rollup_node_url: str,
+    level_from: int,
+    max_levels: int,
+    sleep_time: float,
+    writer: NdjsonWriter,
+) -> None:
+    """Streams decoded outbox messages level by level, so the records are
+    written as soon as the level is fetched"""
+
+    try:
+        with writer:
+            for level in range(level_from, level_from + max_levels):
+                for record in decode_outbox_messages(get_messages(rollup_node_url, level)):
+                    writer.write(record)
+                writer.flush()
+                time.sleep(sleep_time)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    if writer.filename != '-':
+        click.echo(
+            f'Exported {writer.lines_count} records to '
+            + ', '.join(accent(f) for f in writer.filenames)
+        )
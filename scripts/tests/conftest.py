@@ -8,6 +8,7 @@ from scripts.tests.dto import Bridge
 from scripts.tests.dto import Native
 from scripts.tests.dto import Token
 from scripts.tests.dto import Wallet
+from scripts.tests.indexer_waiter import IndexerWaiter
 
 
 def pytest_collection_modifyitems(items):
@@ -148,3 +149,11 @@ def indexer() -> SyncClientSession:
     )
     with Client(transport=transport) as session:
         yield session
+
+
+@pytest.fixture(scope='session')
+def indexer_waiter(indexer: SyncClientSession) -> IndexerWaiter:
+    return IndexerWaiter(
+        indexer,
+        subscriptions_url='wss://etherlink-bridge-indexer.dipdup.net/v1/graphql',
+    )
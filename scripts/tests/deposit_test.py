@@ -1,9 +1,6 @@
 from random import randint
-from time import sleep
-
 import pytest
 from gql import gql
-from gql.client import SyncClientSession
 from graphql import DocumentNode
 from pytezos import pytezos
 
@@ -15,6 +12,7 @@ from scripts.tests.dto import Bridge
 from scripts.tests.dto import Native
 from scripts.tests.dto import Token
 from scripts.tests.dto import Wallet
+from scripts.tests.indexer_waiter import IndexerWaiter
 from scripts.tezos import deposit
 
 
@@ -92,7 +90,7 @@ class TestDeposit:
         bridge: Bridge,
         wallet: Wallet,
         token: Token,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_deposit_query: gql,
     ):
         amount = randint(10, 20)
@@ -111,13 +109,12 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_deposit_query, variable_values=query_params)
-            indexed_operations = response['bridge_deposit']
-            if len(indexed_operations) and indexed_operations[-1]['l2_transaction'] is not None:
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_deposit_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']) and r['bridge_deposit'][-1]['l2_transaction'] is not None,
+        )
+        indexed_operations = response['bridge_deposit']
 
         assert indexed_operations == [{
             'l1_transaction': {
@@ -143,7 +140,7 @@ class TestDeposit:
         bridge: Bridge,
         wallet: Wallet,
         token: Token,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_deposit_query: gql,
         batch_operations_matching_order_query: gql,
     ):
@@ -173,13 +170,12 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_deposit_query, variable_values=query_params)
-            indexed_operations = response['bridge_deposit']
-            if len(indexed_operations) and indexed_operations[-1]['l2_transaction'] is not None:
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_deposit_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']) and r['bridge_deposit'][-1]['l2_transaction'] is not None,
+        )
+        indexed_operations = response['bridge_deposit']
 
         assert len(indexed_operations) == batch_count
         for _ in range(batch_count):
@@ -202,13 +198,12 @@ class TestDeposit:
                 }
             }
 
-        matched_operations = []
-        for _ in range(20):
-            response = indexer.execute(batch_operations_matching_order_query, variable_values=query_params)
-            matched_operations = response['bridge_deposit']
-            if len(matched_operations):
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            batch_operations_matching_order_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']),
+        )
+        matched_operations = response['bridge_deposit']
 
         assert len(matched_operations) == batch_count
         for i in range(1, batch_count):
@@ -243,7 +238,7 @@ class TestDeposit:
         token: Token,
         ticket_router_tester_address: str,
         routing_info_proxy: str,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_operation_query: gql,
         expected_status: str,
         expected_is_completed_flag: bool,
@@ -288,21 +283,15 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_operation_query, variable_values=query_params)
-            indexed_operations = response['bridge_operation']
-            try:
-                if len(indexed_operations) == 0:
-                    raise ValueError
-                if expected_is_completed_flag and indexed_operations[0]['status'] == 'CREATED':
-                    raise ValueError
-            except ValueError:
-                sleep(3)
-                continue
-            else:
-                assert len(indexed_operations) == 1
-                break
+        response = indexer_waiter.wait(
+            bridge_operation_query,
+            query_params,
+            lambda r: bool(r['bridge_operation']) and not (
+                expected_is_completed_flag and r['bridge_operation'][0]['status'] == 'CREATED'
+            ),
+        )
+        indexed_operations = response['bridge_operation']
+        assert len(indexed_operations) == 1
 
         indexed_operation = indexed_operations[0]
         assert indexed_operation['deposit']['l1_transaction'] == {
@@ -323,7 +312,7 @@ class TestDeposit:
         wallet: Wallet,
         token: Token,
         ticket_router_tester_address: str,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_operation_query: gql,
     ):
         amount = randint(3, 20)
@@ -366,14 +355,13 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_operation_query, variable_values=query_params)
-            indexed_operations = response['bridge_operation']
-            if len(indexed_operations):
-                assert len(indexed_operations) == 1
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_operation_query,
+            query_params,
+            lambda r: bool(r['bridge_operation']),
+        )
+        indexed_operations = response['bridge_operation']
+        assert len(indexed_operations) == 1
 
         indexed_operation = indexed_operations[0]
         assert indexed_operation['deposit']['l1_transaction'] == {
@@ -393,7 +381,7 @@ class TestDeposit:
         wallet: Wallet,
         native_asset: Native,
         ticket_router_tester_address: str,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_deposit_query: gql,
     ):
         amount = randint(1, 5_000_000)
@@ -415,13 +403,12 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_deposit_query, variable_values=query_params)
-            indexed_operations = response['bridge_deposit']
-            if len(indexed_operations):
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_deposit_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']),
+        )
+        indexed_operations = response['bridge_deposit']
 
         assert indexed_operations == [{
             'l1_transaction': {
@@ -448,7 +435,7 @@ class TestDeposit:
         wallet: Wallet,
         native_asset: Native,
         ticket_router_tester_address: str,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_deposit_query: gql,
         batch_operations_matching_order_query: gql,
     ):
@@ -474,13 +461,12 @@ class TestDeposit:
 
         query_params = {'operation_hash': operation_hash}
 
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_deposit_query, variable_values=query_params)
-            indexed_operations = response['bridge_deposit']
-            if len(indexed_operations):
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_deposit_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']),
+        )
+        indexed_operations = response['bridge_deposit']
 
         assert len(indexed_operations) == batch_count
         for _ in range(batch_count):
@@ -503,13 +489,12 @@ class TestDeposit:
                 }
             }
 
-        matched_operations = []
-        for _ in range(20):
-            response = indexer.execute(batch_operations_matching_order_query, variable_values=query_params)
-            matched_operations = response['bridge_deposit']
-            if len(matched_operations):
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            batch_operations_matching_order_query,
+            query_params,
+            lambda r: bool(r['bridge_deposit']),
+        )
+        matched_operations = response['bridge_deposit']
 
         assert len(matched_operations) == batch_count
         for i in range(1, batch_count):
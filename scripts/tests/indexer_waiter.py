@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Callable, Optional
+
+from gql import Client
+from gql.client import SyncClientSession
+from gql.transport.exceptions import TransportError
+from graphql import DocumentNode
+from graphql import OperationDefinitionNode
+from graphql import OperationType
+
+from scripts.helpers.waiter import WaitTimeout
+from scripts.helpers.waiter import wait_until
+
+
+Condition = Callable[[dict[str, Any]], bool]
+
+
+def to_subscription(query: DocumentNode, operation_name: Optional[str] = None) -> DocumentNode:
+    """Converts GraphQL query document to the subscription with the same
+    selection, Hasura pushes the new result each time it changes"""
+
+    definitions = []
+    for definition in query.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            if operation_name is not None and definition.name and definition.name.value != operation_name:
+                continue
+            definition = OperationDefinitionNode(
+                operation=OperationType.SUBSCRIPTION,
+                name=definition.name,
+                variable_definitions=definition.variable_definitions,
+                directives=definition.directives,
+                selection_set=definition.selection_set,
+            )
+        definitions.append(definition)
+    return DocumentNode(definitions=tuple(definitions))
+
+
+class IndexerWaiter:
+    """Waits until indexer query result meets the condition: using GraphQL
+    subscription when `subscriptions_url` is provided, otherwise (or if the
+    subscription fails) polling with exponential backoff and jitter"""
+
+    def __init__(
+        self,
+        session: SyncClientSession,
+        subscriptions_url: Optional[str] = None,
+        timeout: float = 60,
+    ):
+        self._session = session
+        self._subscriptions_url = subscriptions_url
+        self._timeout = timeout
+
+    def wait(
+        self,
+        query: DocumentNode,
+        variables: dict[str, Any],
+        condition: Condition,
+        operation_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_delay: float = 10,
+    ) -> dict[str, Any]:
+        """Returns the first query result which meets the condition. If the
+        deadline is passed, returns the last result so the test assertion
+        shows what was indexed"""
+
+        timeout = timeout or self._timeout
+        if self._subscriptions_url is not None:
+            try:
+                return asyncio.run(
+                    self._subscribe(query, variables, condition, operation_name, timeout)
+                )
+            except WaitTimeout as error:
+                if error.last_result is not None:
+                    return error.last_result  # type: ignore
+                return self._execute(query, variables, operation_name)
+            except (ImportError, OSError, TransportError):
+                # NOTE: falling back to polling if subscriptions are not available
+                pass
+
+        try:
+            return wait_until(
+                lambda: self._execute(query, variables, operation_name),
+                condition,
+                timeout=timeout,
+                max_delay=max_delay,
+            )
+        except WaitTimeout as error:
+            last_result: dict[str, Any] = error.last_result
+            return last_result
+
+    def _execute(
+        self,
+        query: DocumentNode,
+        variables: dict[str, Any],
+        operation_name: Optional[str],
+    ) -> dict[str, Any]:
+        return self._session.execute(
+            query, variable_values=variables, operation_name=operation_name
+        )
+
+    async def _subscribe(
+        self,
+        query: DocumentNode,
+        variables: dict[str, Any],
+        condition: Condition,
+        operation_name: Optional[str],
+        timeout: float,
+    ) -> dict[str, Any]:
+        from gql.transport.websockets import WebsocketsTransport
+
+        last_result: Optional[dict[str, Any]] = None
+
+        async def receive() -> dict[str, Any]:
+            nonlocal last_result
+            transport = WebsocketsTransport(url=self._subscriptions_url)
+            async with Client(transport=transport) as session:
+                subscription = to_subscription(query, operation_name)
+                async for result in session.subscribe(
+                    subscription, variable_values=variables, operation_name=operation_name
+                ):
+                    last_result = result
+                    if condition(result):
+                        return result
+            raise WaitTimeout('Subscription is closed before condition is met', last_result)
+
+        try:
+            return await asyncio.wait_for(receive(), timeout)
+        except asyncio.TimeoutError:
+            raise WaitTimeout(f'Condition is not met in {timeout} seconds', last_result)
@@ -1,6 +1,5 @@
 import subprocess
 from random import randint
-from time import sleep
 
 import pytest
 from eth_utils import to_checksum_address
@@ -14,6 +13,7 @@ from scripts.helpers.utility import make_address_bytes
 from scripts.tests.dto import Bridge
 from scripts.tests.dto import Token
 from scripts.tests.dto import Wallet
+from scripts.tests.indexer_waiter import IndexerWaiter
 
 
 class TestWithdraw:
@@ -90,7 +90,7 @@ class TestWithdraw:
         bridge: Bridge,
         wallet: Wallet,
         token: Token,
-        indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_withdrawal_query: gql,
         bridge_pending_withdrawal_query: gql,
     ):
@@ -112,13 +112,12 @@ class TestWithdraw:
         assert transaction_hash
 
         query_params = {'transaction_hash': transaction_hash}
-        indexed_operations = []
-        for _ in range(20):
-            response = indexer.execute(bridge_withdrawal_query, variable_values=query_params)
-            indexed_operations = response['bridge_withdrawal']
-            if len(indexed_operations):
-                break
-            sleep(3)
+        response = indexer_waiter.wait(
+            bridge_withdrawal_query,
+            query_params,
+            lambda r: bool(r['bridge_withdrawal']),
+        )
+        indexed_operations = response['bridge_withdrawal']
 
         assert indexed_operations == [
             {
@@ -150,6 +149,7 @@ class TestWithdraw:
         wallet: Wallet,
         token: Token,
         indexer: SyncClientSession,
+        indexer_waiter: IndexerWaiter,
         bridge_pending_withdrawal_query: gql,
     ):
         query_params = {
@@ -165,18 +165,22 @@ class TestWithdraw:
         l2_operation_id = response['bridge_withdrawal'][0]['l2_transaction_id']
         assert l2_operation_id
 
+        def is_cemented(response: dict) -> bool:
+            outbox_message = response['bridge_withdrawal'][0]['l2_transaction']['outbox_message']
+            return bool(outbox_message['proof'] and outbox_message['commitment'])
+
+        # NOTE: the proof is available once the commitment is cemented, so it
+        # is never checked more often than once per block:
         query_params = {'l2_transaction_id': l2_operation_id}
-        for _ in range(bridge.rollup_challenge_window+bridge.rollup_commitment_period*2):
-            response = indexer.execute(
-                bridge_pending_withdrawal_query,
-                variable_values=query_params,
-                operation_name='FetchOutboxMessageProof'
-            )
-            cemented_withdrawal = response['bridge_withdrawal'][0]['l2_transaction']
-            if cemented_withdrawal['outbox_message']['proof'] and cemented_withdrawal['outbox_message']['commitment']:
-                break
-
-            sleep(bridge.l1_time_between_blocks)
+        response = indexer_waiter.wait(
+            bridge_pending_withdrawal_query,
+            query_params,
+            is_cemented,
+            operation_name='FetchOutboxMessageProof',
+            timeout=(bridge.rollup_challenge_window + bridge.rollup_commitment_period * 2) * bridge.l1_time_between_blocks,
+            max_delay=bridge.l1_time_between_blocks,
+        )
+        cemented_withdrawal = response['bridge_withdrawal'][0]['l2_transaction']
 
         assert cemented_withdrawal
 
@@ -1,81 +1,237 @@
 import click
+import hashlib
+import json
+import re
 import subprocess
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from scripts import cli_options
 
 
-@click.command()
-@click.option(
-    '--ligo-version',
-    default='1.3.0',
-    help='LIGO compiler version used to compile Tezos side contracts, default: 1.3.0',
-)
-def build_contracts(
-    ligo_version: str,
-) -> None:
-    """Compiles Tezos side contracts using dockerized LIGO compiler."""
-
-    def compile_contract(
-        contract_path: str,
-        module_name: str,
-        output_path: str,
-    ) -> None:
-        print(f'- Compiling {module_name} contract')
-        cwd = os.path.join(os.getcwd(), 'tezos')
-        result = subprocess.run(
-            [
-                'docker',
-                'run',
-                '--rm',
-                '-v',
-                f'{cwd}:{cwd}',
-                '-w',
-                cwd,
-                f'ligolang/ligo:{ligo_version}',
-                'compile',
-                'contract',
-                contract_path,
-                '-m',
-                module_name,
-                '-o',
-                output_path,
-            ],
-            # check=True,
-            cwd=cwd,
-        )
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-
-    if not os.path.exists('tezos/build'):
-        os.makedirs('tezos/build')
-
-    # TODO: consider removing everything from build directory before compiling
-
-    print('Compiling Tezos side contracts:')
-    compile_contract(
+# Contract source, module name and output path relative to the `tezos` dir:
+CONTRACTS = [
+    (
         'contracts/ticket-router-tester/ticket-router-tester.mligo',
         'TicketRouterTester',
         'build/ticket-router-tester.tz',
-    )
-    compile_contract(
+    ),
+    (
         'contracts/token-bridge-helper/token-bridge-helper.mligo',
         'TokenBridgeHelper',
         'build/token-bridge-helper.tz',
-    )
-    compile_contract(
+    ),
+    (
         'contracts/rollup-mock/rollup-mock.mligo',
         'RollupMock',
         'build/rollup-mock.tz',
-    )
-    compile_contract(
+    ),
+    (
         'contracts/ticketer/ticketer.mligo',
         'Ticketer',
         'build/ticketer.tz',
-    )
-    compile_contract(
+    ),
+    (
         'contracts/metadata-tracker/metadata-tracker.mligo',
         'MetadataTracker',
         'build/metadata-tracker.tz',
+    ),
+]
+
+MANIFEST_PATH = 'build/manifest.json'
+IMPORT_RE = re.compile(r'^\s*#(?:import|include)\s+"([^"]+)"', re.MULTILINE)
+
+# Compiles contract and returns the compiler output, raises on failure:
+CompileFunction = Callable[[str, str, str, str, str], str]
+
+
+def collect_sources(cwd: str, contract_path: str) -> list[str]:
+    """Returns contract source and all sources it imports (recursively)
+    as sorted paths relative to `cwd`"""
+
+    sources: set[str] = set()
+    stack = [os.path.normpath(contract_path)]
+    while stack:
+        path = stack.pop()
+        if path in sources:
+            continue
+        sources.add(path)
+        with open(os.path.join(cwd, path)) as f:
+            for imported in IMPORT_RE.findall(f.read()):
+                stack.append(os.path.normpath(os.path.join(os.path.dirname(path), imported)))
+    return sorted(sources)
+
+
+def get_ligo_image_id(ligo_version: str) -> str:
+    """Returns local LIGO docker image id, so rebuilt images with the same
+    tag are detected, or the version itself if the image is not pulled"""
+
+    try:
+        result = subprocess.run(
+            ['docker', 'image', 'inspect', '--format', '{{.Id}}', f'ligolang/ligo:{ligo_version}'],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return ligo_version
+    return result.stdout.strip() if result.returncode == 0 else ligo_version
+
+
+def hash_contract(cwd: str, contract_path: str, module_name: str, ligo_id: str) -> str:
+    """Hashes contract sources (including imported ones), module name and
+    LIGO compiler identity"""
+
+    sha = hashlib.sha256()
+    sha.update(f'{ligo_id}\0{module_name}\0'.encode())
+    for source in collect_sources(cwd, contract_path):
+        sha.update(source.encode() + b'\0')
+        with open(os.path.join(cwd, source), 'rb') as f:
+            sha.update(f.read() + b'\0')
+    return sha.hexdigest()
+
+
+def load_manifest(cwd: str) -> dict[str, dict[str, str]]:
+    try:
+        with open(os.path.join(cwd, MANIFEST_PATH)) as f:
+            manifest: dict[str, dict[str, str]] = json.load(f)
+            return manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(cwd: str, manifest: dict[str, dict[str, str]]) -> None:
+    path = os.path.join(cwd, MANIFEST_PATH)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def compile_contract(
+    cwd: str,
+    ligo_version: str,
+    contract_path: str,
+    module_name: str,
+    output_path: str,
+) -> str:
+    result = subprocess.run(
+        [
+            'docker',
+            'run',
+            '--rm',
+            '-v',
+            f'{cwd}:{cwd}',
+            '-w',
+            cwd,
+            f'ligolang/ligo:{ligo_version}',
+            'compile',
+            'contract',
+            contract_path,
+            '-m',
+            module_name,
+            '-o',
+            output_path,
+        ],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
     )
+    output = (result.stdout or '') + (result.stderr or '')
+    if result.returncode != 0:
+        raise RuntimeError(output)
+    return output
+
+
+def build(
+    cwd: str,
+    ligo_version: str,
+    contracts: list[tuple[str, str, str]] = CONTRACTS,
+    jobs: Optional[int] = None,
+    force: bool = False,
+    ligo_id: Optional[str] = None,
+    compile: CompileFunction = compile_contract,
+) -> dict[str, str]:
+    """Compiles contracts concurrently, skipping contracts which sources and
+    compiler did not change since the last build recorded in the manifest.
+    Returns status of each contract: `compiled`, `skipped` or `failed`"""
+
+    os.makedirs(os.path.join(cwd, 'build'), exist_ok=True)
+    ligo_id = ligo_id or get_ligo_image_id(ligo_version)
+    manifest = load_manifest(cwd)
+    hashes = {
+        output_path: hash_contract(cwd, contract_path, module_name, ligo_id)
+        for contract_path, module_name, output_path in contracts
+    }
+
+    statuses: dict[str, str] = {}
+    outdated = []
+    for contract in contracts:
+        contract_path, module_name, output_path = contract
+        is_built = os.path.exists(os.path.join(cwd, output_path))
+        is_same = manifest.get(output_path, {}).get('hash') == hashes[output_path]
+        if is_built and is_same and not force:
+            print(f'- Skipping {module_name} contract, sources are not changed')
+            statuses[module_name] = 'skipped'
+        else:
+            outdated.append(contract)
+
+    def run(contract: tuple[str, str, str]) -> None:
+        contract_path, module_name, output_path = contract
+        try:
+            output = compile(cwd, ligo_version, contract_path, module_name, output_path)
+        except RuntimeError as error:
+            print(f'- Failed to compile {module_name} contract:\n{error}')
+            manifest.pop(output_path, None)
+            statuses[module_name] = 'failed'
+            return
+        print(f'- Compiled {module_name} contract' + (f':\n{output}' if output else ''))
+        manifest[output_path] = {
+            'hash': hashes[output_path],
+            'source': contract_path,
+            'module': module_name,
+            'ligo_version': ligo_version,
+        }
+        statuses[module_name] = 'compiled'
+
+    if outdated:
+        with ThreadPoolExecutor(jobs or len(outdated)) as executor:
+            list(executor.map(run, outdated))
+        save_manifest(cwd, manifest)
+    return statuses
+
+
+@click.command()
+@click.option(
+    '--ligo-version',
+    default='1.3.0',
+    help='LIGO compiler version used to compile Tezos side contracts, default: 1.3.0',
+)
+@click.option(
+    '--jobs',
+    default=None,
+    type=int,
+    help='Number of contracts compiled concurrently, all outdated contracts at once if not set.',
+)
+@click.option(
+    '--force',
+    is_flag=True,
+    default=False,
+    help='Compile all contracts even if their sources are not changed.',
+)
+@cli_options.profile
+def build_contracts(
+    ligo_version: str,
+    jobs: Optional[int],
+    force: bool,
+) -> None:
+    """Compiles Tezos side contracts using dockerized LIGO compiler. Contracts
+    which sources (including imports) and compiler are not changed since the
+    last build (see build/manifest.json) are skipped."""
+
+    # TODO: consider removing everything from build directory before compiling
+
+    print('Compiling Tezos side contracts:')
+    cwd = os.path.join(os.getcwd(), 'tezos')
+    statuses = build(cwd, ligo_version, jobs=jobs, force=force)
+    if 'failed' in statuses.values():
+        raise click.ClickException('Some contracts failed to compile')
     print('Done')
@@ -42,6 +42,7 @@ def make_extra_metadata(
 @cli_options.tezos_rpc_url
 @cli_options.skip_confirm
 @cli_options.silent
+@cli_options.profile
 def deploy_ticketer(
     token_address: str,
     token_type: str,
@@ -19,6 +19,7 @@ from scripts import cli_options
 @cli_options.tezos_rpc_url
 @cli_options.skip_confirm
 @cli_options.silent
+@cli_options.profile
 def deploy_token(
     token_type: str,
     token_id: int,
@@ -17,6 +17,7 @@ from scripts import cli_options
 @cli_options.token_symbol
 @cli_options.skip_confirm
 @cli_options.silent
+@cli_options.profile
 def deploy_token_bridge_helper(
     ticketer_address: str,
     erc20_proxy_address: str,
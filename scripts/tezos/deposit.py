@@ -1,6 +1,11 @@
 import click
 from scripts.helpers.contracts import TokenBridgeHelper
-from scripts.helpers.utility import get_tezos_client
+from scripts.helpers.utility import (
+    get_tezos_client,
+    send_operation,
+    wait_for_operation,
+)
+from scripts.helpers.tracing import start_span
 from scripts.helpers.formatting import (
     accent,
     echo_variable,
@@ -17,7 +22,10 @@ from scripts import cli_options
 @cli_options.smart_rollup_address
 @cli_options.tezos_private_key
 @cli_options.tezos_rpc_url
+@cli_options.rpc_metrics
+@cli_options.trace_file
 # TODO: consider renaming to fa_deposit
+@cli_options.profile
 def deposit(
     token_bridge_helper_address: str,
     amount: int,
@@ -50,12 +58,14 @@ def deposit(
     echo_variable('      * ', 'Receiver address', receiver_address)
     echo_variable('      * ', 'Amount', format_int(amount))
 
-    opg = manager.bulk(
-        token.disallow(manager, token_bridge_helper),
-        token.allow(manager, token_bridge_helper),
-        token_bridge_helper.deposit(smart_rollup_address, receiver_bytes, amount),
-    ).send()
-    manager.wait(opg)
+    with start_span('build', chain='tezos'):
+        bulk = manager.bulk(
+            token.disallow(manager, token_bridge_helper),
+            token.allow(manager, token_bridge_helper),
+            token_bridge_helper.deposit(smart_rollup_address, receiver_bytes, amount),
+        )
+    opg = send_operation(bulk)
+    wait_for_operation(manager, opg)
     operation_hash: str = opg.hash()
     click.echo(
         'Successfully executed Deposit, tx hash: ' + wrap(accent(operation_hash))
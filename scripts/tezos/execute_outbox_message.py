@@ -1,7 +1,14 @@
 import click
-from scripts.helpers.utility import get_tezos_client
+from scripts.helpers.utility import (
+    get_tezos_client,
+    send_operation,
+    wait_for_operation,
+)
+from scripts.helpers.tracing import start_span
 from scripts.helpers.formatting import accent
+from scripts.helpers.withdrawal_store import WithdrawalStore
 from scripts import cli_options
+from typing import Optional
 
 
 @click.command()
@@ -21,12 +28,17 @@ from scripts import cli_options
 @cli_options.smart_rollup_address
 @cli_options.tezos_private_key
 @cli_options.tezos_rpc_url
+@cli_options.withdrawal_store
+@cli_options.rpc_metrics
+@cli_options.trace_file
+@cli_options.profile
 def execute_outbox_message(
     commitment: str,
     proof: str,
     smart_rollup_address: str,
     tezos_private_key: str,
     tezos_rpc_url: str,
+    withdrawal_store: Optional[str] = None,
 ) -> str:
     """Executes outbox message using provided `commitment` and `proof`"""
 
@@ -38,11 +50,22 @@ def execute_outbox_message(
     click.echo('  - Executor: `' + accent(manager.key.public_key_hash()) + '`')
     click.echo('  - Tezos RPC node: `' + accent(tezos_rpc_url) + '`')
 
-    opg = manager.smart_rollup_execute_outbox_message(
-        smart_rollup_address, commitment, bytes.fromhex(proof)
-    ).send()
-    manager.wait(opg)
+    try:
+        with start_span('build', chain='tezos'):
+            execute = manager.smart_rollup_execute_outbox_message(
+                smart_rollup_address, commitment, bytes.fromhex(proof)
+            )
+        opg = send_operation(execute)
+        wait_for_operation(manager, opg)
+    except Exception as error:
+        if withdrawal_store is not None:
+            with WithdrawalStore(withdrawal_store) as store:
+                store.record_execution(commitment, proof, error=str(error))
+        raise
     operation_hash: str = opg.hash()
+    if withdrawal_store is not None:
+        with WithdrawalStore(withdrawal_store) as store:
+            store.record_execution(commitment, proof, l1_op_hash=operation_hash)
     click.echo(
         'Successfully executed outbox message, tx hash: `'
         + accent(operation_hash)
@@ -13,6 +13,7 @@ from scripts import cli_options
 @cli_options.tezos_private_key
 @cli_options.tezos_rpc_url
 @cli_options.silent
+@cli_options.profile
 def get_ticketer_params(
     ticketer_address: str,
     tezos_private_key: str,
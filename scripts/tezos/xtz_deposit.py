@@ -1,5 +1,10 @@
 import click
-from scripts.helpers.utility import get_tezos_client
+from scripts.helpers.utility import (
+    get_tezos_client,
+    send_operation,
+    wait_for_operation,
+)
+from scripts.helpers.tracing import start_span
 from scripts.helpers.formatting import (
     accent,
     echo_variable,
@@ -16,6 +21,9 @@ from scripts import cli_options
 @cli_options.smart_rollup_address
 @cli_options.tezos_private_key
 @cli_options.tezos_rpc_url
+@cli_options.rpc_metrics
+@cli_options.trace_file
+@cli_options.profile
 def xtz_deposit(
     xtz_ticket_helper: str,
     amount: int,
@@ -40,17 +48,15 @@ def xtz_deposit(
     echo_variable('      * ', 'Receiver address', receiver_address)
     echo_variable('      * ', 'Amount (mutez)', format_int(amount))
 
-    opg = (
-        helper.deposit(
+    with start_span('build', chain='tezos'):
+        call = helper.deposit(
             {
                 'evm_address': smart_rollup_address,
                 'l2_address': receiver_bytes,
             }
-        )
-        .with_amount(amount)
-        .send()
-    )
-    manager.wait(opg)
+        ).with_amount(amount)
+    opg = send_operation(call.as_transaction())
+    wait_for_operation(manager, opg)
     operation_hash: str = opg.hash()
     click.echo(
         'Successfully executed XTZ deposit, tx hash: ' + wrap(accent(operation_hash))
@@ -0,0 +1,112 @@
+import json
+import click
+from contextlib import ExitStack
+from itertools import chain
+from typing import Any, Optional
+from scripts.helpers.formatting import (
+    accent,
+    echo_variable,
+)
+from scripts.helpers.deposit_tracker import (
+    DepositTracker,
+    stream_deposit_events,
+)
+from scripts.helpers.etherlink.subscriptions import (
+    EthSubscriptions,
+    is_websocket_url,
+)
+from scripts.helpers.utility import (
+    get_etherlink_web3,
+    get_tezos_client,
+)
+from scripts import cli_options
+
+
+# Number of L1 blocks scanned back from the head if `--l1-from-level` is not set:
+DEFAULT_L1_DEPTH = 120
+
+
+@click.command()
+@click.option('--operation-hash', 'operation_hashes', multiple=True, help='L1 deposit operation hash, can be provided multiple times.')
+@click.option('--operation-hashes-file', default=None, type=click.File(), help='File with L1 deposit operation hashes, one per line.')
+@click.option('--l1-from-level', default=None, type=int, help=f'The first L1 level to look for the operations, {DEFAULT_L1_DEPTH} levels before the head if not set.')
+@click.option('--l1-to-level', default=None, type=int, help='The last L1 level to look for the operations, the head if not set.')
+@click.option('--l2-from-block', required=True, type=int, help='The first Etherlink block to look for the deposit events.')
+@click.option('--l2-to-block', default=None, type=int, help='The last Etherlink block to look for the deposit events, the latest if not set.')
+@click.option('--chunk-size', default=1000, show_default=True, help='Max number of blocks in one `eth_getLogs` request.')
+@click.option('--follow', is_flag=True, default=False, help='Wait for pending deposits on the events pushed by the node, requires WebSocket `--etherlink-rpc-url` (`ws://` or `wss://`).')
+@cli_options.smart_rollup_address
+@cli_options.tezos_rpc_url
+@cli_options.etherlink_rpc_url
+@cli_options.rpc_metrics
+@cli_options.profile
+def track_deposits(
+    operation_hashes: tuple[str, ...],
+    operation_hashes_file: Optional[Any],
+    l1_from_level: Optional[int],
+    l1_to_level: Optional[int],
+    l2_from_block: int,
+    l2_to_block: Optional[int],
+    chunk_size: int,
+    follow: bool,
+    smart_rollup_address: str,
+    tezos_rpc_url: str,
+    etherlink_rpc_url: str,
+) -> list[dict[str, Any]]:
+    """Follows L1 deposit operations (made by `deposit` or any other way of
+    sending tickets to the rollup) to the matching L2 deposit events and
+    echoes matched deposits as one JSON object per line. XTZ deposits
+    (`xtz_deposit`) emit no L2 deposit event, so they are reported and
+    skipped"""
+
+    hashes = list(operation_hashes)
+    if operation_hashes_file is not None:
+        hashes += [line.strip() for line in operation_hashes_file if line.strip()]
+    if not hashes:
+        raise click.BadParameter('No operation hashes provided', param_hint='--operation-hash')
+
+    # NOTE: the client is only used to read blocks, so no key is required:
+    client = get_tezos_client(tezos_rpc_url)
+    head_level: int = client.shell.head.header()['level']
+    l1_to_level = head_level if l1_to_level is None else l1_to_level
+    l1_from_level = l1_to_level - DEFAULT_L1_DEPTH if l1_from_level is None else l1_from_level
+
+    tracker = DepositTracker(smart_rollup_address)
+    missing = tracker.add_operations(client, hashes, l1_from_level, l1_to_level)
+    for operation_hash in sorted(missing):
+        echo_variable('', 'Operation not found in L1 blocks', operation_hash)
+    for deposit in tracker.unmatchable:
+        echo_variable('', 'XTZ deposit has no L2 deposit event, skipped', deposit.operation_hash)
+
+    if follow and not is_websocket_url(etherlink_rpc_url):
+        raise click.BadParameter(
+            'WebSocket URL is required to follow events', param_hint='--etherlink-rpc-url'
+        )
+
+    with ExitStack() as stack:
+        # NOTE: subscribed before reading the range, so no events are missed:
+        if follow:
+            subscriptions = stack.enter_context(EthSubscriptions(etherlink_rpc_url))
+            pushed_events = stream_deposit_events(subscriptions)
+
+        web3 = get_etherlink_web3(etherlink_rpc_url)
+        l2_to_block = web3.eth.block_number if l2_to_block is None else l2_to_block
+        deposit_matches = tracker.match_logs(web3, l2_from_block, l2_to_block, chunk_size)
+        if follow:
+            new_events = (event for event in pushed_events if event['block_number'] > l2_to_block)
+            deposit_matches = chain(deposit_matches, tracker.match_stream(new_events))
+
+        matches = []
+        for deposit_match in deposit_matches:
+            match_dict = deposit_match.as_dict()
+            click.echo(json.dumps(match_dict))
+            matches.append(match_dict)
+
+    for deposit in tracker.pending:
+        echo_variable('', 'Deposit is not found on L2 yet', deposit.operation_hash)
+    click.echo(
+        f'Matched {accent(str(len(matches)))} deposits, '
+        + f'{accent(str(len(tracker.pending)))} pending, '
+        + f'{accent(str(len(tracker.unmatchable)))} skipped'
+    )
+    return matches
@@ -1,6 +1,10 @@
+import os
 from pytezos.client import PyTezosClient
+from pytezos.crypto.key import Key
 from pytezos.operation.group import OperationGroup
+from pytezos.sandbox.node import SandboxedNodeContainer
 from pytezos.sandbox.node import SandboxedNodeTestCase
+from pytezos.sandbox.node import sandbox_port
 from pytezos.contract.result import ContractCallResult
 from pytezos.operation.result import OperationResult
 from scripts.helpers.contracts import (
@@ -15,21 +19,86 @@ from scripts.helpers.contracts import (
     TokenBridgeHelper,
 )
 from scripts.helpers.contracts.tokens import TokenInfo
+from scripts.helpers.utility import (
+    find_op_by_hash,
+    get_addresses_from_op,
+)
 from typing import Optional
 from scripts.helpers.addressable import Addressable
 
 
+# Sandboxed node shared by all test cases of the session, it is stopped by the
+# pytezos atexit hook when the session ends:
+_session_node: Optional[SandboxedNodeContainer] = None
+
+# Number of fresh accounts created for each test and the amount of mutez
+# transferred to each of them:
+NAMESPACE_SIZE = 5
+FRESH_ACCOUNT_BALANCE = 1_000_000_000
+
+
+def worker_port() -> int:
+    """Returns sandboxed node port for the current pytest-xdist worker: the
+    worker `gwN` runs its own node on the `sandbox_port() + N` port"""
+
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker is None:
+        return sandbox_port()
+    return sandbox_port() + int(worker.removeprefix('gw'))
+
+
 class BaseTestCase(SandboxedNodeTestCase):
+    # NOTE: each xdist worker runs its own node, so bootstrap accounts are
+    # never shared between workers:
+    PORT = worker_port()
     accounts: list = []
+    _namespace: list[PyTezosClient] = []
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Starts sandboxed node once per session and reuses it for all
+        test cases, so protocol activation is not repeated for each class"""
+
+        global _session_node
+        if _session_node is None:
+            super().setUpClass()
+            _session_node = cls.node_container
+        cls.node_container = _session_node
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # NOTE: the node is kept running for the next test cases
+        pass
+
+    def fresh_accounts(self, count: int) -> list[PyTezosClient]:
+        """Creates given number of new funded and revealed accounts, all
+        transfers are sent in one operation group and all reveals are
+        included in one block, so it takes two blocks for any count"""
+
+        funder = self.client
+        accounts = [funder.using(key=Key.generate(export=False)) for _ in range(count)]
+        funder.bulk(
+            *[
+                funder.transaction(destination=pkh, amount=FRESH_ACCOUNT_BALANCE)
+                for pkh in (account.key.public_key_hash() for account in accounts)
+            ]
+        ).send()
+        self.bake_block()
+        for account in accounts:
+            account.reveal().send()
+        self.bake_block()
+        return accounts
 
-    def bootstrap_account(self, n: Optional[int] = None) -> PyTezosClient:
-        """Creates bootstrap account with given number"""
+    def bootstrap_account(self) -> PyTezosClient:
+        """Returns the next account of the test namespace: accounts are
+        created for each test, so balances, counters and tickets of the
+        accounts never leak from one test to another on the shared node"""
 
-        accs_count = n or len(self.accounts)
-        bootstrap: PyTezosClient = self.client.using(key=f'bootstrap{accs_count + 1}')
-        bootstrap.reveal()
-        self.accounts.append(bootstrap)
-        return bootstrap
+        if not self._namespace:
+            self._namespace = self.fresh_accounts(1)
+        account = self._namespace.pop(0)
+        self.accounts.append(account)
+        return account
 
     def deploy_fa2(self, balances: dict[Addressable, int], token_id: int = 0) -> FA2:
         """Deploys FA2 contract with given balances"""
@@ -87,6 +156,7 @@ class BaseTestCase(SandboxedNodeTestCase):
 
     def setUp(self) -> None:
         self.accounts = []
+        self._namespace = self.fresh_accounts(NAMESPACE_SIZE)
         self.manager = self.bootstrap_account()
 
     def default_setup(
@@ -99,18 +169,29 @@ class BaseTestCase(SandboxedNodeTestCase):
 
         alice = self.bootstrap_account()
 
+        # NOTE: token and tester are originated in one operation group, the
+        # allowance requires the ticketer address, so setup takes three blocks:
         if token_type == 'FA2':
-            token: TokenHelper = self.deploy_fa2(
-                balances={alice: balance},
-                token_id=token_id,
+            token_cls: type[TokenHelper] = FxhashToken
+            token_opg = FxhashToken.originate(
+                self.manager, {alice: balance}, token_id
             )
         elif token_type == 'FA1.2':
-            token = self.deploy_fa12(balances={alice: balance})
+            token_cls = CtezToken
+            token_opg = CtezToken.originate(self.manager, {alice: balance})
         else:
             raise ValueError(f'Unknown token type: {token_type}')
 
+        tester_opg = TicketRouterTester.originate(self.manager)
+        opg = self.manager.bulk(token_opg, tester_opg).send()
+        self.bake_block()
+        token_address, tester_address = get_addresses_from_op(
+            find_op_by_hash(self.manager, opg)
+        )
+        token = token_cls.from_address(self.manager, token_address, token_id=token_id)
+        tester = TicketRouterTester.from_address(self.manager, tester_address)
+
         ticketer = self.deploy_ticketer(token, extra_metadata)
-        tester = self.deploy_ticket_router_tester()
         token.using(alice).allow(alice, ticketer).send()
         self.bake_block()
         return alice, token, ticketer, tester
@@ -0,0 +1,108 @@
+import unittest
+from os.path import dirname, join
+from typing import Any
+from pytezos import pytezos
+from pytezos.michelson.types.big_map import BigMapType
+from scripts.helpers.contracts.tokens import (
+    CtezToken,
+    FxhashToken,
+    TokenHelper,
+)
+from scripts.helpers.stand_in import TezosNodeStandIn
+from scripts.helpers.utility import (
+    DEFAULT_ADDRESS,
+    load_contract_interface,
+)
+
+
+TOKENS_DIR = join(dirname(__file__), '..', '..', 'scripts', 'helpers', 'contracts', 'tokens')
+TOKEN_ADDRESS = 'KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi'
+LEDGER_ID = 5
+TOKEN_ID = 7
+OWNERS = [
+    'tz1burnburnburnburnburnburnburjAYjjX',
+    'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU',
+    'tz1aSkwEot3L2kmUvcoxzjMomb9mvBNuzFK6',
+    'KT1SjXiUX63QvdNMcM2m492f7kuf8JxXRLp4',
+]
+
+
+def make_token(cls: type[TokenHelper], filename: str, url: str) -> Any:
+    return cls(
+        contract=load_contract_interface(join(TOKENS_DIR, filename)),
+        client=pytezos.using(shell=url),
+        address=TOKEN_ADDRESS,
+        token_id=TOKEN_ID,
+    )
+
+
+def make_block(
+    token: TokenHelper,
+    level: int,
+    storage: dict[str, Any],
+    balances: dict[Any, int],
+) -> dict[str, Any]:
+    ledger = type(token.contract.storage.data).from_micheline_value(
+        token.contract.storage.encode(storage)
+    )['ledger']
+    assert isinstance(ledger, BigMapType)
+    return {
+        'hash': f'BL{level:049d}',
+        'level': level,
+        'contracts': {TOKEN_ADDRESS: {'storage': token.contract.storage.encode(storage)}},
+        'big_maps': {
+            str(LEDGER_ID): {
+                ledger.get_key_hash(key): {'int': str(amount)}
+                for key, amount in balances.items()
+            }
+        },
+    }
+
+
+class TestBalances(unittest.TestCase):
+    node: TezosNodeStandIn
+
+    def setUp(self) -> None:
+        self.node = TezosNodeStandIn({}).start()
+
+    def tearDown(self) -> None:
+        self.node.stop()
+
+    def test_should_read_fa2_balances_at_pinned_block(self) -> None:
+        token = make_token(FxhashToken, 'fa2/fxhash.tz', self.node.url)
+        storage = {
+            **FxhashToken.default_storage,
+            'ledger': LEDGER_ID,
+            'metadata': 1,
+            'operators': 2,
+            'token_data': 3,
+            'token_metadata': 4,
+        }
+        self.node.blocks = [
+            make_block(token, 1, storage, {(OWNERS[0], TOKEN_ID): 10, (OWNERS[1], 0): 20}),
+            make_block(token, 2, storage, {(OWNERS[0], TOKEN_ID): 11, (OWNERS[1], TOKEN_ID): 21}),
+        ]
+
+        balances = token.get_balances(OWNERS[:3], block='1')
+        self.assertEqual(balances, {OWNERS[0]: 10, OWNERS[1]: 0, OWNERS[2]: 0})
+        # NOTE: block hash, storage and one request per owner:
+        self.assertEqual(self.node.requests_count, 2 + 3)
+
+        balances = token.get_balances([*OWNERS[:2], OWNERS[0]], concurrency=1)
+        self.assertEqual(balances, {OWNERS[0]: 11, OWNERS[1]: 21})
+
+    def test_should_read_fa12_balances(self) -> None:
+        token = make_token(CtezToken, 'fa12/Ctez.tz', self.node.url)
+        storage = {
+            **CtezToken.default_storage,
+            'ledger': LEDGER_ID,
+            'allowances': 1,
+            'admin': DEFAULT_ADDRESS,
+            'metadata': 2,
+            'token_metadata': 3,
+        }
+        balances = {owner: index * 100 for index, owner in enumerate(OWNERS) if index}
+        self.node.blocks = [make_block(token, 1, storage, balances)]
+
+        self.assertEqual(token.get_balances(OWNERS), {OWNERS[0]: 0, **balances})
+        self.assertEqual(token.get_balance(OWNERS[2]), 200)
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from os.path import dirname, join
+from scripts.tezos.build_contracts import (
+    CONTRACTS,
+    build,
+    collect_sources,
+)
+
+
+TEZOS_DIR = join(dirname(__file__), '..')
+
+
+class TestBuildContracts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = join(self.directory.name, 'tezos')
+        shutil.copytree(join(TEZOS_DIR, 'contracts'), join(self.cwd, 'contracts'))
+        self.compiled: list[str] = []
+        self.lock = threading.Lock()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def compile(self, cwd: str, ligo_version: str, contract_path: str, module_name: str, output_path: str) -> str:
+        if module_name == 'Broken':
+            raise RuntimeError('Syntax error')
+        with open(join(cwd, output_path), 'w') as f:
+            f.write('parameter unit;')
+        with self.lock:
+            self.compiled.append(module_name)
+        return ''
+
+    def test_should_collect_imported_sources(self) -> None:
+        sources = collect_sources(TEZOS_DIR, 'contracts/ticketer/ticketer.mligo')
+        assert 'contracts/ticketer/storage.mligo' in sources
+        assert 'contracts/common/tokens/fa2.mligo' in sources
+        assert 'contracts/common/errors.mligo' in sources
+        assert 'contracts/rollup-mock/tickets.mligo' not in sources
+
+    def test_should_skip_unchanged_contracts(self) -> None:
+        statuses = build(self.cwd, '1.3.0', ligo_id='ligo', compile=self.compile)
+        assert set(statuses.values()) == {'compiled'}
+        assert sorted(self.compiled) == sorted(module for _, module, _ in CONTRACTS)
+
+        self.compiled.clear()
+        with open(join(self.cwd, 'contracts/common/tokens/fa12.mligo'), 'a') as f:
+            f.write('\n')
+        statuses = build(self.cwd, '1.3.0', ligo_id='ligo', compile=self.compile)
+        # NOTE: fa12 is imported by the ticketer and the token bridge helper:
+        assert sorted(self.compiled) == ['Ticketer', 'TokenBridgeHelper']
+        assert statuses['RollupMock'] == 'skipped'
+
+        self.compiled.clear()
+        build(self.cwd, '1.4.0', ligo_id='ligo-1.4.0', compile=self.compile)
+        assert len(self.compiled) == len(CONTRACTS)
+
+    def test_should_rebuild_failed_and_removed_contracts(self) -> None:
+        contracts = CONTRACTS[:1] + [('contracts/ticketer/ticketer.mligo', 'Broken', 'build/broken.tz')]
+        statuses = build(self.cwd, '1.3.0', contracts, ligo_id='ligo', compile=self.compile)
+        assert statuses == {'TicketRouterTester': 'compiled', 'Broken': 'failed'}
+
+        os.remove(join(self.cwd, CONTRACTS[0][2]))
+        statuses = build(self.cwd, '1.3.0', contracts, ligo_id='ligo', compile=self.compile)
+        assert statuses == {'TicketRouterTester': 'compiled', 'Broken': 'failed'}
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import Mock
+from scripts.helpers.bulk import chunk_operations, estimate_content_size
+from scripts.helpers.utility import (
+    get_address_from_op,
+    get_addresses_from_op,
+    get_build_dir,
+    load_contract_interface,
+)
+from os.path import join
+
+
+def make_origination_op(filename: str) -> Mock:
+    """Creates operation group mock with single origination content in the
+    form it takes after `bulk` reset"""
+
+    contract = load_contract_interface(join(get_build_dir(), filename))
+    content = {
+        'kind': 'origination',
+        'source': '',
+        'fee': '0',
+        'counter': '0',
+        'gas_limit': '0',
+        'storage_limit': '0',
+        'balance': '0',
+        'script': {
+            'code': contract.to_micheline(),
+            'storage': {'prim': 'Unit'},
+        },
+    }
+    return Mock(contents=[content])
+
+
+class TestBulkOriginations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = Mock()
+        self.client.key.public_key_hash.return_value = (
+            'tz1burnburnburnburnburnburnburjAYjjX'
+        )
+
+    def test_should_return_all_originated_addresses_in_order(self) -> None:
+        op = {
+            'contents': [
+                {'metadata': {'operation_result': {'originated_contracts': ['KT1A']}}},
+                {'metadata': {'operation_result': {}}},
+                {'metadata': {'operation_result': {'originated_contracts': ['KT1B']}}},
+            ]
+        }
+        assert get_addresses_from_op(op) == ['KT1A', 'KT1B']
+        with self.assertRaises(AssertionError):
+            get_address_from_op(op)
+
+    def test_should_pack_originations_by_size_limit(self) -> None:
+        ticketer = make_origination_op('ticketer.tz')
+        size = estimate_content_size(self.client, ticketer.contents[0])
+
+        operations = [ticketer] * 10
+        assert chunk_operations(self.client, operations) == [operations]
+
+        chunks = chunk_operations(self.client, operations, max_size=size * 3 + 200)
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+        assert sum(chunks, []) == operations
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest.mock import patch
+from pytezos import pytezos
+from pytezos.contract.interface import ContractInterface
+from scripts.helpers import utility
+from scripts.helpers.utility import (
+    get_build_dir,
+    load_contract_interface,
+    originate_from_file,
+)
+
+
+class TestContractCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = join(self.directory.name, 'ticketer.tz')
+        shutil.copy(join(get_build_dir(), 'ticketer.tz'), self.filename)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_should_parse_contract_once_until_file_is_modified(self) -> None:
+        contract = load_contract_interface(self.filename)
+        assert load_contract_interface(self.filename) is contract
+
+        shutil.copy(join(get_build_dir(), 'rollup-mock.tz'), self.filename)
+        os.utime(self.filename, ns=(0, os.stat(self.filename).st_mtime_ns + 1))
+        reloaded = load_contract_interface(self.filename)
+        assert reloaded is not contract
+        assert reloaded.to_micheline() == ContractInterface.from_file(self.filename).to_micheline()
+
+    def test_should_reuse_pickled_micheline_from_disk(self) -> None:
+        cache_dir = join(self.directory.name, 'cache')
+        expected = utility.load_micheline_from_file(self.filename, cache_dir)
+        with patch.object(utility, 'michelson_to_micheline') as parse:
+            assert utility.load_micheline_from_file(self.filename, cache_dir) == expected
+            parse.assert_not_called()
+        assert len(os.listdir(cache_dir)) == 1
+
+    def test_should_originate_same_script_as_pytezos(self) -> None:
+        client = pytezos.using(shell='http://localhost:0')
+        filename = join(get_build_dir(), 'metadata-tracker.tz')
+        cached = originate_from_file(filename, client, None)
+        expected = ContractInterface.from_file(filename).using(
+            key=client.key, shell=client.shell
+        ).originate(initial_storage=None)
+        assert cached.contents == expected.contents
+        assert originate_from_file(filename, client, None).contents == expected.contents
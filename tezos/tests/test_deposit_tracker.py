@@ -0,0 +1,112 @@
+import unittest
+from typing import Any, Iterator
+from web3 import Web3
+from scripts.defaults import (
+    ERC20_PROXY_ADDRESS,
+    SMART_ROLLUP_ADDRESS,
+    TICKETER_ADDRESS,
+)
+from scripts.helpers.deposit_tracker import (
+    DEPOSIT_EVENT_TOPIC,
+    DepositTracker,
+    find_rollup_deposits,
+)
+from scripts.helpers.stand_in import EtherlinkStandIn
+from scripts.helpers.ticket_content import TicketContent
+
+
+RECEIVER = '0xbefd2c6ffc36249ebebd21d6df6376ecf3bac448'
+CONTENT = TicketContent(0, b'info')
+LEVEL = 100
+
+
+def make_operation(operation_hash: str, amounts: list[int], router: bool = True) -> dict[str, Any]:
+    routing_info = RECEIVER[2:] + (ERC20_PROXY_ADDRESS[2:].lower() if router else '')
+    ticket = {
+        'prim': 'Pair',
+        'args': [{'string': TICKETER_ADDRESS}, {'prim': 'Pair', 'args': [CONTENT.to_micheline(), {'int': '0'}]}],
+    }
+    results = []
+    for amount in amounts:
+        ticket['args'][1]['args'][1] = {'int': str(amount)}  # type: ignore
+        value = {'prim': 'Pair', 'args': [{'bytes': routing_info}, ticket]}
+        results.append({
+            'kind': 'transaction',
+            'destination': SMART_ROLLUP_ADDRESS,
+            'parameters': {'entrypoint': 'default', 'value': {'prim': 'Left', 'args': [{'prim': 'Left', 'args': [value]}]}},
+            'result': {'status': 'applied'},
+        })
+        ticket = {**ticket, 'args': [ticket['args'][0], {'prim': 'Pair', 'args': list(ticket['args'][1]['args'])}]}  # type: ignore
+    return {
+        'hash': operation_hash,
+        'contents': [{'kind': 'transaction', 'metadata': {'internal_operation_results': results}}],
+    }
+
+
+def make_deposit_log(ticket_hash: int, amount: int, inbox_msg_id: int, block: int) -> dict[str, Any]:
+    words = [
+        '00' * 12 + ERC20_PROXY_ADDRESS[2:].lower(),
+        '00' * 12 + RECEIVER[2:],
+        f'{amount:064x}',
+        f'{LEVEL:064x}',
+        f'{inbox_msg_id:064x}',
+    ]
+    return {
+        'address': ERC20_PROXY_ADDRESS,
+        'topics': [DEPOSIT_EVENT_TOPIC, f'0x{ticket_hash:064x}'],
+        'data': '0x' + ''.join(words),
+        'blockNumber': hex(block),
+        'transactionHash': f'0x{inbox_msg_id:064x}',
+        'logIndex': '0x0',
+    }
+
+
+class TestDepositTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tracker = DepositTracker(SMART_ROLLUP_ADDRESS)
+        for index, operation_hash in enumerate(['op1', 'op2']):
+            operation = make_operation(operation_hash, [5, 7] if index == 0 else [5])
+            for deposit in find_rollup_deposits(operation, LEVEL, index, SMART_ROLLUP_ADDRESS):
+                self.tracker.add(deposit)
+        self.ticket_hash = self.tracker.pending[0].ticket_hash
+
+    def test_should_decode_deposits_sent_to_rollup(self) -> None:
+        [first, second, third] = sorted(self.tracker.pending, key=lambda d: d.position)
+        assert (first.operation_hash, first.amount, first.position) == ('op1', 5, (0, 0, 0))
+        assert (second.amount, second.position) == (7, (0, 0, 1))
+        assert third.operation_hash == 'op2'
+        assert first.receiver == RECEIVER
+        assert first.router == ERC20_PROXY_ADDRESS.lower()
+        assert first.content == CONTENT
+
+    def test_should_match_same_deposits_in_inbox_order(self) -> None:
+        logs = [
+            make_deposit_log(self.ticket_hash, 5, inbox_msg_id=3, block=10),
+            make_deposit_log(self.ticket_hash, 7, inbox_msg_id=4, block=10),
+            make_deposit_log(self.ticket_hash, 5, inbox_msg_id=5, block=11),
+            make_deposit_log(self.ticket_hash, 5, inbox_msg_id=6, block=11),
+        ]
+        with EtherlinkStandIn({'block_number': '0xb', 'receipts': {'0x00': {'logs': logs}}}) as etherlink:
+            web3 = Web3(Web3.HTTPProvider(etherlink.url))
+            matches = list(self.tracker.match_logs(web3, 0, 11, chunk_size=5))
+        assert [(m.deposit.operation_hash, m.event['inbox_msg_id']) for m in matches] == [
+            ('op1', 3),
+            ('op1', 4),
+            ('op2', 5),
+        ]
+        assert self.tracker.pending == []
+
+    def test_should_skip_xtz_deposits(self) -> None:
+        tracker = DepositTracker(SMART_ROLLUP_ADDRESS)
+        operation = make_operation('op3', [1_000_000], router=False)
+        for deposit in find_rollup_deposits(operation, LEVEL, 0, SMART_ROLLUP_ADDRESS):
+            tracker.add(deposit)
+
+        assert tracker.pending == []
+        assert [deposit.operation_hash for deposit in tracker.unmatchable] == ['op3']
+        def stream() -> Iterator[dict[str, Any]]:
+            raise AssertionError('Stream is read without pending deposits')
+            yield {}
+
+        # NOTE: nothing is waited for, so the stream is not read at all:
+        assert list(tracker.match_stream(stream())) == []
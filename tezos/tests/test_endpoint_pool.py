@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scripts.defaults import TEZOS_PRIVATE_KEY
+from scripts.helpers.endpoint_pool import EndpointPool, get_endpoint_pool
+from scripts.helpers.rollup_node import get_messages
+from scripts.helpers.stand_in import (
+    EtherlinkStandIn,
+    RollupNodeStandIn,
+    TezosNodeStandIn,
+    get_fixture_path,
+)
+from scripts.helpers.utility import get_etherlink_web3, get_tezos_client
+
+
+# NOTE: nothing listens on the port 1, so the connection is refused at once:
+DEAD_URL = 'http://127.0.0.1:1'
+OUTBOX_LEVEL = 5_242_880
+STALL_DURATION = 1.0
+
+
+class GatewayErrorHandler(BaseHTTPRequestHandler):
+    """Proxy in front of the restarting node answering 503 to everything"""
+
+    def do_GET(self) -> None:
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_POST = do_GET
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class StalledHandler(GatewayErrorHandler):
+    """Node which accepted the connection but does not answer in time"""
+
+    def do_GET(self) -> None:
+        time.sleep(STALL_DURATION)
+        super().do_GET()
+
+
+class TestEndpointPool(unittest.TestCase):
+    def test_should_prefer_faster_endpoints(self) -> None:
+        pool = EndpointPool(['fast', 'slow'], rng=random.Random(42))
+        for _ in range(10):
+            pool.record_success('fast', 0.05)
+            pool.record_success('slow', 0.5)
+
+        first = [pool.ranked()[0] for _ in range(1000)]
+        # NOTE: with weights 1/0.05 and 1/0.5 the fast one is first in ~91%:
+        assert 850 < first.count('fast') < 970
+
+    def test_should_keep_configured_order_until_measured(self) -> None:
+        pool = EndpointPool(['a', 'b', 'c'])
+        assert all(pool.ranked() == ['a', 'b', 'c'] for _ in range(100))
+
+    def test_should_rank_unmeasured_endpoint_with_mean_latency(self) -> None:
+        pool = EndpointPool(['new', 'fast', 'slow'], rng=random.Random(7))
+        for _ in range(10):
+            pool.record_success('fast', 0.01)
+            pool.record_success('slow', 1.0)
+
+        first = [pool.ranked()[0] for _ in range(1000)]
+        # NOTE: the new endpoint is weighted as the average of two, so it
+        # does not always win over the measured fast one:
+        assert first.count('fast') > 900
+        assert 0 < first.count('new') < 100
+
+    def test_should_skip_failed_endpoint_until_cooldown(self) -> None:
+        pool = EndpointPool(['a', 'b'])
+        pool.record_failure('a')
+        assert pool.ranked() == ['b', 'a']
+        pool.stats['a'].unavailable_until = 0.0
+        assert set(pool.ranked()) == {'a', 'b'}
+        assert pool.stats['a'].failures == 1
+
+    def test_should_hedge_idempotent_reads_after_p95(self) -> None:
+        pool = EndpointPool(['slow', 'fast'], hedge=True)
+        for _ in range(10):
+            pool.record_success('slow', 0.001)
+            pool.record_success('fast', 100.0)
+
+        def send(url: str) -> str:
+            if url == 'slow':
+                time.sleep(0.5)
+            return url
+
+        started = time.perf_counter()
+        assert pool.request(send) == 'fast'
+        assert time.perf_counter() - started < 0.4
+        # NOTE: transactions are never sent twice:
+        assert pool.request(send, idempotent=False) == 'slow'
+
+
+class TestEndpointFailover(unittest.TestCase):
+    rollup_node: RollupNodeStandIn
+    etherlink: EtherlinkStandIn
+    tezos_node: TezosNodeStandIn
+    gateway: ThreadingHTTPServer
+    gateway_url: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        cls.rollup_node = RollupNodeStandIn.from_fixture(fixture).start()
+        cls.etherlink = EtherlinkStandIn.from_fixture(fixture).start()
+        cls.tezos_node = TezosNodeStandIn(
+            {'blocks': [{'hash': 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2', 'level': 1}]}
+        ).start()
+        cls.gateway = ThreadingHTTPServer(('127.0.0.1', 0), GatewayErrorHandler)
+        cls.gateway_url = f'http://127.0.0.1:{cls.gateway.server_address[1]}'
+        threading.Thread(target=cls.gateway.serve_forever, daemon=True).start()
+        cls.stalled = ThreadingHTTPServer(('127.0.0.1', 0), StalledHandler)
+        cls.stalled_url = f'http://127.0.0.1:{cls.stalled.server_address[1]}'
+        threading.Thread(target=cls.stalled.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.rollup_node.stop()
+        cls.etherlink.stop()
+        cls.tezos_node.stop()
+        cls.gateway.shutdown()
+        cls.gateway.server_close()
+        cls.stalled.shutdown()
+        cls.stalled.server_close()
+
+    def test_should_fail_over_rollup_node_requests(self) -> None:
+        urls = f'{DEAD_URL},{self.rollup_node.url}'
+        for _ in range(3):
+            assert get_messages(urls, OUTBOX_LEVEL) == get_messages(
+                self.rollup_node.url, OUTBOX_LEVEL
+            )
+
+        pool = get_endpoint_pool(urls)
+        assert not pool.is_healthy(DEAD_URL)
+        # NOTE: the dead node is not requested again during the cooldown:
+        assert pool.stats[DEAD_URL].failures == 1
+
+    def test_should_fail_over_stalled_rollup_node(self) -> None:
+        pool = EndpointPool([self.stalled_url, self.rollup_node.url])
+        path = f'global/block/head/outbox/{OUTBOX_LEVEL}/messages'
+        response = pool.get(path, timeout=STALL_DURATION / 5)
+        assert response.json() == get_messages(self.rollup_node.url, OUTBOX_LEVEL)
+        assert not pool.is_healthy(self.stalled_url)
+
+    def test_should_fail_over_tezos_and_etherlink_clients(self) -> None:
+        # NOTE: unmeasured endpoints are tried in the configured order, so
+        # the dead one is always requested first:
+        client = get_tezos_client(f'{DEAD_URL},{self.tezos_node.url}', TEZOS_PRIVATE_KEY)
+        assert client.shell.head.hash() == 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2'
+        assert client.shell.node.uri == [self.tezos_node.url, DEAD_URL]
+
+        web3 = get_etherlink_web3(f'{DEAD_URL},{self.etherlink.url}')
+        assert web3.eth.block_number == int(self.etherlink.block_number, 16)
+
+    def test_should_fail_over_tezos_gateway_errors(self) -> None:
+        urls = f'{self.gateway_url},{self.tezos_node.url}'
+        client = get_tezos_client(urls)
+        assert client.shell.head.hash() == 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2'
+        pool = get_endpoint_pool(urls)
+        assert pool.stats[self.gateway_url].failures == 1
+        assert not pool.is_healthy(self.gateway_url)
@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+from itertools import count
+from pytezos.rpc.errors import RpcError
+from scripts.helpers.loadgen import (
+    OperationResult,
+    make_report,
+    percentile,
+    run_load,
+)
+from scripts.helpers.stand_in import TezosNodeStandIn
+from scripts.helpers.utility import get_tezos_client
+from scripts.loadgen import get_inclusion_level
+
+
+class TestLoadgen(unittest.TestCase):
+    def test_should_run_each_actor_one_operation_at_a_time(self) -> None:
+        in_flight = {'a': 0, 'b': 0}
+        max_in_flight = {'a': 0, 'b': 0}
+        lock = threading.Lock()
+        blocks = count()
+
+        def make_send(name: str):  # type: ignore
+            def send() -> int:
+                with lock:
+                    in_flight[name] += 1
+                    max_in_flight[name] = max(max_in_flight[name], in_flight[name])
+                # NOTE: other workers are free meanwhile, so they would send
+                # from the same actor if it was not taken out of the pool:
+                time.sleep(0.01)
+                with lock:
+                    in_flight[name] -= 1
+                return next(blocks) // 3
+
+            return send
+
+        accounts = [[('deposit', make_send('a'))], [('deposit', make_send('b'))]]
+        results = run_load(accounts, rate=200, concurrency=4, duration=0.2)
+        assert 10 < len(results) <= 41
+        assert max_in_flight == {'a': 1, 'b': 1}
+
+    def test_should_rotate_scenarios_of_one_account(self) -> None:
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+        kinds = []
+
+        def make_send(kind: str):  # type: ignore
+            def send() -> int:
+                nonlocal in_flight, max_in_flight
+                with lock:
+                    in_flight += 1
+                    max_in_flight = max(max_in_flight, in_flight)
+                    kinds.append(kind)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+                return 1
+
+            return send
+
+        # NOTE: deposit and ticket transfer are sent from the same Tezos
+        # account, so they must not be in flight at the same time:
+        account = [('deposit', make_send('deposit')), ('ticket_transfer', make_send('ticket_transfer'))]
+        results = run_load([account], rate=200, concurrency=4, duration=0.2)
+        assert max_in_flight == 1
+        assert len(results) == len(kinds) > 4
+        assert kinds[:4] == ['deposit', 'ticket_transfer'] * 2
+
+    def test_should_not_send_after_deadline(self) -> None:
+        def send() -> int:
+            time.sleep(0.15)
+            return 1
+
+        started = time.monotonic()
+        results = run_load([[('deposit', send)]], rate=100, concurrency=2, duration=0.2)
+        # NOTE: the second worker gets the actor at 0.15s, the first one
+        # at 0.3s, after the deadline:
+        assert len(results) == 2
+        assert all(result.submitted_at < started + 0.2 for result in results)
+
+    def test_should_return_inclusion_level(self) -> None:
+        blocks = [
+            {'hash': f'BL{level}', 'level': level, 'operation_hashes': [[], [], [], hashes]}
+            for level, hashes in [(1, []), (2, ['oo1', 'oo2']), (3, ['oo3'])]
+        ]
+        with TezosNodeStandIn({'blocks': blocks}) as tezos_node:
+            client = get_tezos_client(tezos_node.url)
+            assert get_inclusion_level(client, 'oo2', from_level=1) == 2
+            assert get_inclusion_level(client, 'oo3', from_level=1) == 3
+            with self.assertRaises(RuntimeError):
+                get_inclusion_level(client, 'oo1', from_level=3)
+
+    def test_should_report_latency_blocks_and_failures(self) -> None:
+        error = RpcError({'id': 'proto.alpha.counter_in_the_past'})
+        results = [
+            OperationResult('deposit', 0, latency=1.0, block=1),
+            OperationResult('deposit', 0, latency=2.0, block=1),
+            OperationResult('deposit', 0, latency=3.0, block=2),
+            OperationResult('deposit', 0, error='proto.alpha.counter_in_the_past'),
+        ]
+        report = make_report(results, duration=2)['deposit']
+        assert report['sent'] == 4
+        assert report['throughput'] == 1.5
+        assert report['latency'] == {'p50': 2.0, 'p90': 3.0, 'p99': 3.0}
+        assert report['ops_per_block'] == {'max': 2, 'mean': 1.5}
+        assert report['failures'] == {error.args[0]['id']: 1}
+        assert percentile([5.0], 99) == 5.0
@@ -0,0 +1,73 @@
+import unittest
+from typing import Any
+from pytezos import pytezos
+from scripts.helpers.contracts import Ticketer
+from scripts.helpers.offline_views import OfflineViews
+from scripts.helpers.stand_in import TezosNodeStandIn
+
+
+TOKEN_ADDRESS = 'KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi'
+TICKETERS = [
+    'KT1SjXiUX63QvdNMcM2m492f7kuf8JxXRLp4',
+    'KT1PmYUomF3HDxsGWYQUCbLi2X8WvT7ZHv8o',
+    'KT1H7if3gSZE1pZSK48W3NzGpKmbWyBxWDHe',
+]
+
+
+def make_storage(index: int) -> dict[str, Any]:
+    token = {'fa12': TOKEN_ADDRESS} if index % 2 else {'fa2': (TOKEN_ADDRESS, index)}
+    return {
+        'content': (index, b'\x05\x02\x00\x00\x00\x00'),
+        'token': token,
+        'total_supply': index * 1000,
+        'metadata': index,
+    }
+
+
+class TestOfflineViews(unittest.TestCase):
+    node: TezosNodeStandIn
+
+    def setUp(self) -> None:
+        contract = Ticketer.load_contract()
+        self.node = TezosNodeStandIn({
+            'blocks': [{
+                'hash': 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2',
+                'level': 1,
+                'contracts': {
+                    address: {'storage': contract.storage.encode(make_storage(index))}
+                    for index, address in enumerate(TICKETERS)
+                },
+            }],
+        }).start()
+        self.client = pytezos.using(shell=self.node.url)
+
+    def tearDown(self) -> None:
+        self.node.stop()
+
+    def test_should_evaluate_views_from_snapshot(self) -> None:
+        views = OfflineViews(Ticketer.load_contract(), make_storage(1))
+        self.assertEqual(views.run('get_total_supply'), 1000)
+        self.assertEqual(views.run('get_content'), (1, b'\x05\x02\x00\x00\x00\x00'))
+        self.assertEqual(views.run('get_token'), {'fa12': TOKEN_ADDRESS})
+
+    def test_should_read_each_ticketer_storage_once(self) -> None:
+        results = Ticketer.read_views_many(self.client, TICKETERS * 2)
+
+        # NOTE: block hash and one storage read per Ticketer:
+        self.assertEqual(self.node.requests_count, 1 + len(TICKETERS))
+        self.assertEqual(list(results), TICKETERS)
+        self.assertEqual(results[TICKETERS[2]], {
+            'get_total_supply': 2000,
+            'get_content': (2, b'\x05\x02\x00\x00\x00\x00'),
+            'get_token': {'fa2': (TOKEN_ADDRESS, 2)},
+        })
+
+    def test_should_evaluate_views_of_ticketer_helper(self) -> None:
+        ticketer = Ticketer(
+            contract=Ticketer.load_contract(),
+            client=self.client,
+            address=TICKETERS[1],
+        )
+        views = ticketer.get_offline_views()
+        self.assertEqual(views.run_all()['get_total_supply'], 1000)
+        self.assertEqual(self.node.requests_count, 1)
@@ -0,0 +1,96 @@
+import gzip
+import json
+import tempfile
+import unittest
+from os.path import join
+from click.testing import CliRunner
+from scripts.defaults import TICKETER_ADDRESS
+from scripts.rollup_node import scan_outbox
+from scripts.helpers.ndjson import NdjsonWriter
+from scripts.helpers.rollup_node import decode_outbox_messages, get_messages
+from scripts.helpers.stand_in import RollupNodeStandIn, get_fixture_path
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+LEVEL = 5242880
+
+
+class TestOutboxExport(unittest.TestCase):
+    rollup_node: RollupNodeStandIn
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        cls.rollup_node = RollupNodeStandIn.from_fixture(fixture).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.rollup_node.stop()
+
+    def test_should_decode_withdrawal_message(self) -> None:
+        messages = get_messages(self.rollup_node.url, LEVEL)
+        [record] = list(decode_outbox_messages(messages))
+        content = TicketContent(0, bytes.fromhex('0502000000'))
+        ticket = Ticket(TICKETER_ADDRESS, TICKETER_ADDRESS, content, 7)
+        assert record == {
+            'outbox_level': LEVEL,
+            'message_index': 0,
+            'transaction_index': 0,
+            'kind': 'untyped',
+            'destination': TICKETER_ADDRESS,
+            'entrypoint': 'withdraw',
+            'receiver': 'tz1VQ1ByPgZRG3HtRF7aEpozkkJrm6Wgk8oW',
+            'router': TICKETER_ADDRESS,
+            'ticketer': TICKETER_ADDRESS,
+            'token_id': 0,
+            'token_info': '0502000000',
+            'amount': 7,
+            'ticket_hash': f'{ticket.hash():064x}',
+        }
+
+    def test_should_keep_parameters_of_unknown_transactions(self) -> None:
+        message = {
+            'outbox_level': 1,
+            'message_index': 2,
+            'message': {
+                'kind': 'untyped',
+                'transactions': [
+                    {'destination': TICKETER_ADDRESS, 'entrypoint': 'default', 'parameters': {'int': '1'}}
+                ],
+            },
+        }
+        [record] = list(decode_outbox_messages([message]))
+        assert record['parameters'] == {'int': '1'}
+        assert 'ticketer' not in record
+
+    def test_should_export_compressed_ndjson(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            result = CliRunner().invoke(
+                scan_outbox,
+                [
+                    '--level-from', str(LEVEL - 1),
+                    '--max-levels', '3',
+                    '--sleep-time', '0',
+                    '--export-file', join(directory, 'outbox.jsonl.gz'),
+                    '--etherlink-rollup-node-url', self.rollup_node.url,
+                ],
+            )
+            assert result.exit_code == 0, result.output
+            with gzip.open(join(directory, 'outbox.jsonl.gz'), 'rt') as f:
+                lines = f.read().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])['amount'] == 7
+
+    def test_should_rotate_files(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            with NdjsonWriter(join(directory, 'outbox.jsonl'), rotate_lines=2) as writer:
+                for index in range(5):
+                    writer.write({'index': index})
+            assert [f.rsplit('/', 1)[1] for f in writer.filenames] == [
+                'outbox.00000.jsonl',
+                'outbox.00001.jsonl',
+                'outbox.00002.jsonl',
+            ]
+            with open(writer.filenames[-1]) as f:
+                assert f.read() == '{"index":4}\n'
@@ -0,0 +1,76 @@
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from scripts.helpers.profiling import make_timeline, profile
+from scripts.helpers.rollup_node import get_messages
+from scripts.helpers.rpc_metrics import RpcCall
+from scripts.helpers.stand_in import RollupNodeStandIn, get_fixture_path
+from scripts.rollup_node import get_proof
+
+
+OUTBOX_LEVEL = 5_242_880
+
+
+def make_call(started_at: float) -> RpcCall:
+    return RpcCall(
+        client='tezos',
+        method='/chains/main/blocks/head/hash',
+        url='http://node/chains/main/blocks/head/hash',
+        started_at=started_at,
+        duration=0.5,
+        request_bytes=0,
+        response_bytes=54,
+        status=200,
+    )
+
+
+class TestProfiling(unittest.TestCase):
+    rollup_node: RollupNodeStandIn
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        cls.rollup_node = RollupNodeStandIn.from_fixture(fixture).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.rollup_node.stop()
+
+    def test_should_order_timeline_by_start_time(self) -> None:
+        # NOTE: calls are recorded when they finish, so the order may differ:
+        timeline = make_timeline([make_call(12.0), make_call(10.5)], started_at=10.0)
+        self.assertEqual([item['offset'] for item in timeline], [0.5, 2.0])
+        self.assertEqual(timeline[0]['response_bytes'], 54)
+
+    def test_should_profile_code_and_record_requests(self) -> None:
+        with profile() as result:
+            get_messages(self.rollup_node.url, OUTBOX_LEVEL)
+            get_messages(self.rollup_node.url, OUTBOX_LEVEL)
+
+        self.assertEqual(len(result.timeline), 2)
+        summary = result.summary(top=5)
+        self.assertIn('get_messages', summary)
+        self.assertIn('2 HTTP requests', summary)
+
+    def test_should_write_profile_from_cli_option(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, 'get_proof')
+            get_proof.callback(
+                level=OUTBOX_LEVEL,
+                index=0,
+                etherlink_rollup_node_url=self.rollup_node.url,
+                silent=True,
+                profile=True,
+                profile_output=prefix,
+            )  # type: ignore
+
+            stats = pstats.Stats(prefix + '.pstats')
+            functions = {name for _, _, name in stats.stats}  # type: ignore
+            self.assertIn('get_proof', functions)
+            with open(prefix + '.timeline.json') as f:
+                timeline = json.load(f)
+        self.assertEqual(len(timeline), 1)
+        self.assertEqual(timeline[0]['client'], 'rollup_node')
+        self.assertGreaterEqual(timeline[0]['offset'], 0)
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+import requests
+from pytezos import pytezos
+from web3 import Web3
+from scripts.defaults import KERNEL_ADDRESS
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.rollup_node import get_messages, get_proof
+from scripts.helpers.rpc_metrics import (
+    InMemorySink,
+    RpcMetrics,
+    classify_request,
+    record_rpc_calls,
+)
+from scripts.helpers.stand_in import (
+    EtherlinkStandIn,
+    RollupNodeStandIn,
+    TezosNodeStandIn,
+    get_fixture_path,
+)
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+OUTBOX_LEVEL = 5_242_880
+
+
+class TestRpcMetrics(unittest.TestCase):
+    rollup_node: RollupNodeStandIn
+    etherlink: EtherlinkStandIn
+    tezos_node: TezosNodeStandIn
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        cls.rollup_node = RollupNodeStandIn.from_fixture(fixture).start()
+        cls.etherlink = EtherlinkStandIn.from_fixture(fixture).start()
+        cls.tezos_node = TezosNodeStandIn(
+            {'blocks': [{'hash': 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2', 'level': 1}]}
+        ).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.rollup_node.stop()
+        cls.etherlink.stop()
+        cls.tezos_node.stop()
+
+    def test_should_classify_requests_by_client_and_method(self) -> None:
+        assert classify_request(
+            'http://node/chains/main/blocks/BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2/context/contracts/KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi/storage',
+            None,
+        ) == ('tezos', '/chains/main/blocks/{id}/context/contracts/{id}/storage')
+        assert classify_request(
+            'http://node/global/block/head/outbox/42/messages', None
+        ) == ('rollup_node', '/global/block/head/outbox/{id}/messages')
+        assert classify_request(
+            'http://node', b'{"jsonrpc": "2.0", "method": "eth_getLogs", "id": 1}'
+        ) == ('etherlink', 'eth_getLogs')
+        assert classify_request('https://api.tzkt.io/v1/tokens', None) == (
+            'http',
+            'api.tzkt.io/v1/tokens',
+        )
+
+    def test_should_record_calls_of_all_clients(self) -> None:
+        metrics, memory = RpcMetrics(), InMemorySink()
+        with record_rpc_calls(metrics, memory):
+            get_messages(self.rollup_node.url, OUTBOX_LEVEL)
+            get_proof(self.rollup_node.url, OUTBOX_LEVEL, 0)
+            Web3(Web3.HTTPProvider(self.etherlink.url)).eth.block_number
+            pytezos.using(shell=self.tezos_node.url).shell.head.hash()
+            for _ in range(2):
+                requests.get(f'{self.rollup_node.url}/global/block/head/unknown')
+        # NOTE: requests made outside of the context are not recorded:
+        get_messages(self.rollup_node.url, OUTBOX_LEVEL)
+
+        assert [(call.client, call.retry) for call in memory.calls] == [
+            ('rollup_node', False),
+            ('rollup_node', False),
+            ('etherlink', False),
+            ('tezos', False),
+            ('rollup_node', False),
+            ('rollup_node', True),
+        ]
+        stats = {(item['client'], item['method']): item for item in metrics.to_json()}
+        assert set(stats) == {
+            ('rollup_node', '/global/block/head/outbox/{id}/messages'),
+            ('rollup_node', '/global/block/head/helpers/proofs/outbox/{id}/messages'),
+            ('rollup_node', '/global/block/head/unknown'),
+            ('etherlink', 'eth_blockNumber'),
+            ('tezos', '/chains/main/blocks/head/hash'),
+        }
+        messages = stats[('rollup_node', '/global/block/head/outbox/{id}/messages')]
+        assert messages['count'] == 1 and messages['response_bytes'] > 0
+        assert sum(messages['buckets']) == 1
+        unknown = stats[('rollup_node', '/global/block/head/unknown')]
+        assert unknown['errors'] == {'http_404': 2} and unknown['retries'] == 1
+        assert stats[('etherlink', 'eth_blockNumber')]['request_bytes'] > 0
+
+    def test_should_write_metrics_from_cli_option(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            prometheus_file = os.path.join(directory, 'metrics.prom')
+            json_file = os.path.join(directory, 'metrics.json')
+            for filename in (prometheus_file, json_file):
+                parse_withdrawal_event.callback(
+                    tx_hash=TX_HASH,
+                    etherlink_rpc_url=self.etherlink.url,
+                    kernel_address=KERNEL_ADDRESS,
+                    rpc_metrics_file=filename,
+                )  # type: ignore
+
+            with open(json_file) as f:
+                methods = {item['method']: item['count'] for item in json.load(f)}
+            assert methods['eth_getTransactionReceipt'] == 1
+            with open(prometheus_file) as f:
+                text = f.read()
+            assert '# TYPE rpc_request_duration_seconds histogram' in text
+            assert (
+                'rpc_request_duration_seconds_count{client="etherlink",method="eth_getTransactionReceipt"} 1'
+                in text
+            )
+            assert 'le="+Inf"' in text
@@ -0,0 +1,78 @@
+import unittest
+from web3 import Web3
+from scripts.defaults import (
+    ERC20_PROXY_ADDRESS,
+    KERNEL_ADDRESS,
+    TICKETER_ADDRESS,
+)
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.rollup_node import (
+    get_cemented_messages,
+    get_messages,
+    get_proof,
+    get_tickets_count,
+)
+from scripts.helpers.stand_in import (
+    EtherlinkStandIn,
+    RollupNodeStandIn,
+    get_fixture_path,
+)
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+
+
+class TestStandIns(unittest.TestCase):
+    rollup_node: RollupNodeStandIn
+    etherlink: EtherlinkStandIn
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        cls.rollup_node = RollupNodeStandIn.from_fixture(fixture).start()
+        cls.etherlink = EtherlinkStandIn.from_fixture(fixture).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.rollup_node.stop()
+        cls.etherlink.stop()
+
+    def test_should_replay_withdrawal_from_etherlink_to_rollup_node(self) -> None:
+        event = parse_withdrawal_event.callback(
+            tx_hash=TX_HASH,
+            etherlink_rpc_url=self.etherlink.url,
+            kernel_address=KERNEL_ADDRESS,
+        )  # type: ignore
+        level, index = event['outbox_level'], event['outbox_index']
+
+        messages = get_messages(self.rollup_node.url, level)
+        assert [m['message_index'] for m in messages] == [index]
+        assert get_cemented_messages(self.rollup_node.url, level) == messages
+        proof = get_proof(self.rollup_node.url, level, index)
+        assert proof['commitment'].startswith('src1')
+
+    def test_should_not_return_messages_above_cemented_level(self) -> None:
+        level = self.rollup_node.cemented_level + 1  # type: ignore
+        self.rollup_node.outbox[str(level)] = [{'message_index': 0}]
+        self.addCleanup(self.rollup_node.outbox.pop, str(level))
+        assert get_cemented_messages(self.rollup_node.url, level) == []
+        assert len(get_messages(self.rollup_node.url, level)) == 1
+
+    def test_should_read_ticket_table_from_durable_storage(self) -> None:
+        ticket = Ticket(
+            owner=ERC20_PROXY_ADDRESS,
+            ticketer=TICKETER_ADDRESS,
+            content=TicketContent(0, bytes.fromhex('0502000000')),
+            amount=0,
+        )
+        assert get_tickets_count(self.rollup_node.url, ticket, ERC20_PROXY_ADDRESS) == 100
+        assert get_tickets_count(self.rollup_node.url, ticket, KERNEL_ADDRESS) == 0
+
+    def test_should_filter_logs_by_address_and_blocks(self) -> None:
+        web3 = Web3(Web3.HTTPProvider(self.etherlink.url))
+        assert web3.eth.chain_id == 128123
+        kernel_logs = web3.eth.get_logs({'address': KERNEL_ADDRESS, 'fromBlock': 0})
+        assert len(kernel_logs) == 1
+        assert web3.eth.get_logs({'address': KERNEL_ADDRESS, 'fromBlock': 421}) == []
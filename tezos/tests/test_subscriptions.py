@@ -0,0 +1,111 @@
+import threading
+import unittest
+from typing import Any
+from hexbytes import HexBytes
+from scripts.defaults import KERNEL_ADDRESS
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.etherlink.subscriptions import (
+    EthSubscriptions,
+    ReceiptWaiter,
+    get_receipt_waiter,
+    wait_for_transaction_receipt,
+)
+from scripts.helpers.etherlink.withdrawal_events import stream_withdrawal_events
+from scripts.helpers.stand_in import EtherlinkWebsocketStandIn, get_fixture_path
+from scripts.helpers.stand_in.etherlink import JsonRpcError
+from scripts.helpers.utility import get_etherlink_web3
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+
+
+class TestSubscriptions(unittest.TestCase):
+    etherlink: EtherlinkWebsocketStandIn
+
+    def setUp(self) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        self.etherlink = EtherlinkWebsocketStandIn.from_fixture(fixture).start()  # type: ignore
+        self.receipt = self.etherlink.receipts.pop(TX_HASH)
+        self.etherlink.logs = []
+
+    def tearDown(self) -> None:
+        self.etherlink.stop()
+
+    def make_receipt(self, index: int) -> dict[str, Any]:
+        tx_hash = '0x' + f'{index:x}'.rjust(64, 'a')
+        logs = [{**log, 'transactionHash': tx_hash} for log in self.receipt['logs']]
+        return {**self.receipt, 'transactionHash': tx_hash, 'logs': logs}
+
+    def test_should_wait_receipts_from_one_stream(self) -> None:
+        receipts = [self.make_receipt(index) for index in range(5)]
+        with EthSubscriptions(self.etherlink.ws_url) as client:
+            waiter = ReceiptWaiter(client)
+            futures = [waiter.submit(receipt['transactionHash']) for receipt in receipts]
+            self.etherlink.push_block(receipts[:3])
+            self.etherlink.push_block([])
+            self.etherlink.push_block(receipts[3:])
+            results = [future.result(5) for future in futures]
+
+        assert [result['blockNumber'] for result in results] == [0x1A5] * 3 + [0x1A7] * 2
+        assert results[0]['transactionHash'] == HexBytes(receipts[0]['transactionHash'])
+        # NOTE: subscription, one check of each transaction when submitted,
+        # one block read for each block and receipts of included ones:
+        assert self.etherlink.requests_count == 1 + 5 + 3 + 5
+
+    def test_should_keep_waiting_after_failed_block_request(self) -> None:
+        get_block = self.etherlink.rpc_eth_getBlockByHash
+        errors = [JsonRpcError(-32000, 'header not found')]
+
+        def get_block_once_failed(block_hash: str, full: bool) -> Any:
+            if errors:
+                raise errors.pop()
+            return get_block(block_hash, full)
+
+        self.etherlink.rpc_eth_getBlockByHash = get_block_once_failed  # type: ignore
+        receipt = self.make_receipt(0)
+        with EthSubscriptions(self.etherlink.ws_url) as client:
+            future = ReceiptWaiter(client).submit(receipt['transactionHash'])
+            self.etherlink.push_block([receipt])
+            # NOTE: the block with the transaction was missed, so all pending
+            # receipts are requested with the next one:
+            self.etherlink.push_block([])
+            assert future.result(5)['blockNumber'] == 0x1A5
+
+    def test_should_replace_shared_waiter_when_connection_closed(self) -> None:
+        waiter = get_receipt_waiter(self.etherlink.ws_url)
+        future = waiter.submit(self.make_receipt(0)['transactionHash'])
+        waiter.client.close()
+        with self.assertRaises(ConnectionError):
+            future.result(5)
+        assert get_receipt_waiter(self.etherlink.ws_url) is not waiter
+
+    def test_should_wait_receipt_with_websocket_provider(self) -> None:
+        web3 = get_etherlink_web3(self.etherlink.ws_url)
+        assert web3.eth.block_number == 0x1A4
+        receipt = self.make_receipt(0)
+        timer = threading.Timer(0.2, self.etherlink.push_block, [[receipt]])
+        timer.start()
+        result = wait_for_transaction_receipt(web3, HexBytes(receipt['transactionHash']))
+        timer.join()
+        assert result['status'] == 1 and result['blockNumber'] == 0x1A5
+
+    def test_should_stream_withdrawal_events(self) -> None:
+        with EthSubscriptions(self.etherlink.ws_url) as client:
+            events = stream_withdrawal_events(client, KERNEL_ADDRESS)
+            self.etherlink.push_block([self.make_receipt(0), self.make_receipt(1)])
+            first, second = next(events), next(events)
+
+        assert first['transaction_hash'] == self.make_receipt(0)['transactionHash']
+        assert second['block_number'] == 0x1A5
+        assert (first['outbox_level'], first['outbox_index']) == (5_242_880, 0)
+        # NOTE: the stream ends when the connection is closed:
+        assert list(events) == []
+
+    def test_should_parse_withdrawal_event_over_websocket(self) -> None:
+        self.etherlink.receipts[TX_HASH] = self.receipt
+        event = parse_withdrawal_event.callback(
+            tx_hash=TX_HASH,
+            etherlink_rpc_url=self.etherlink.ws_url,
+            kernel_address=KERNEL_ADDRESS,
+        )  # type: ignore
+        assert event == {'outbox_level': 5_242_880, 'outbox_index': 0}
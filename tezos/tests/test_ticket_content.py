@@ -0,0 +1,58 @@
+import random
+import unittest
+from typing import Optional
+from pytezos.michelson.types.base import MichelsonType
+from scripts.helpers.ticket_content import TicketContent
+from scripts.helpers.utility import to_micheline, to_michelson_type
+
+
+def make_random_contents(seed: int, count: int = 200) -> list[TicketContent]:
+    rng = random.Random(seed)
+    contents = []
+    for _ in range(count):
+        bits = rng.choice([0, 6, 7, 13, 14, 64, 256, 1024])
+        token_id = rng.getrandbits(bits) if bits else 0
+        token_info: Optional[bytes] = None
+        if rng.random() < 0.8:
+            token_info = rng.randbytes(rng.choice([0, 1, 63, 64, 300, 70_000]))
+        contents.append(TicketContent(token_id, token_info))
+    return contents
+
+
+def pytezos_micheline(content: TicketContent) -> dict:
+    return to_michelson_type(  # type: ignore
+        content.to_tuple(), content.michelson_type
+    ).to_micheline_value()
+
+
+def pytezos_bytes_hex(content: TicketContent) -> str:
+    michelson_type = MichelsonType.match(to_micheline(content.michelson_type))
+    value = michelson_type.from_micheline_value(pytezos_micheline(content))
+    return value.forge('legacy_optimized').hex()  # type: ignore
+
+
+class TestTicketContentCodec(unittest.TestCase):
+    def test_should_match_pytezos_micheline(self) -> None:
+        for content in make_random_contents(seed=1):
+            with self.subTest(content=content.token_id):
+                assert content.to_micheline() == pytezos_micheline(content)
+
+    def test_should_match_pytezos_forged_bytes(self) -> None:
+        for content in make_random_contents(seed=2):
+            with self.subTest(content=content.token_id):
+                assert content.to_bytes_hex() == pytezos_bytes_hex(content)
+
+    def test_should_roundtrip_bytes_and_micheline(self) -> None:
+        for content in make_random_contents(seed=3):
+            payload = content.to_bytes_hex()
+            assert TicketContent.from_bytes_hex(payload) == content
+            assert TicketContent.from_bytes_hex('0x' + payload) == content
+            assert TicketContent.from_micheline(content.to_micheline()) == content
+
+    def test_should_reject_unexpected_layout(self) -> None:
+        payload = TicketContent(1, b'info').to_bytes_hex()
+        for invalid in [payload[:-2], payload + '00', '0707' + payload[4:-10], '07070081', '030b']:
+            with self.assertRaises(ValueError):
+                TicketContent.from_bytes_hex(invalid)
+        with self.assertRaises(ValueError):
+            TicketContent(-1, None).to_bytes_hex()
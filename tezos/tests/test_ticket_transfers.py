@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import MagicMock
+from pytezos import pytezos
+from scripts.helpers.ticket import Ticket
+from scripts.helpers.ticket_content import TicketContent
+from scripts.helpers.ticket_transfers import (
+    TicketPayout,
+    plan_ticket_transfers,
+    transfer_tickets,
+)
+
+
+TICKETER = 'KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi'
+ROUTER = 'KT1SjXiUX63QvdNMcM2m492f7kuf8JxXRLp4'
+RECEIVERS = [
+    'tz1burnburnburnburnburnburnburjAYjjX',
+    'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU',
+]
+FA12 = TicketContent(0, b'fa12')
+FA2 = TicketContent(1, b'fa2')
+
+
+class TestTicketTransfers(unittest.TestCase):
+    def setUp(self) -> None:
+        # NOTE: operations are only built, so the client is never connected
+        self.owner = pytezos.using(shell='http://127.0.0.1:1')
+        self.tickets = [
+            Ticket(self.owner, TICKETER, FA12, 100),
+            Ticket(self.owner, TICKETER, FA2, 10),
+        ]
+
+    def test_should_split_tickets_into_merged_payouts(self) -> None:
+        payouts = [
+            TicketPayout(ROUTER, TICKETER, FA12, 30, 'withdraw'),
+            TicketPayout(RECEIVERS[0], TICKETER, FA2, 4),
+            TicketPayout(ROUTER, TICKETER, TicketContent(0, b'fa12'), 20, 'withdraw'),
+            TicketPayout(RECEIVERS[1], TICKETER, FA12, 50),
+        ]
+        transfers = plan_ticket_transfers(self.tickets, payouts)
+
+        self.assertEqual(
+            [(t.destination, t.entrypoint, t.ticket.content, t.ticket.amount) for t in transfers],
+            [
+                (ROUTER, 'withdraw', FA12, 50),
+                (RECEIVERS[0], 'default', FA2, 4),
+                (RECEIVERS[1], 'default', FA12, 50),
+            ],
+        )
+        contents = transfers[0].make_operation().contents
+        self.assertEqual(len(contents), 1)
+        self.assertEqual(contents[0]['kind'], 'transfer_ticket')
+        self.assertEqual(contents[0]['ticket_amount'], '50')
+        self.assertEqual(contents[0]['entrypoint'], 'withdraw')
+
+    def test_should_fail_before_splitting_if_not_enough_tickets(self) -> None:
+        payouts = [
+            TicketPayout(RECEIVERS[0], TICKETER, FA2, 6),
+            TicketPayout(RECEIVERS[1], TICKETER, FA2, 6),
+        ]
+        with self.assertRaisesRegex(ValueError, 'required 12, owned 10'):
+            plan_ticket_transfers(self.tickets, payouts)
+        with self.assertRaisesRegex(ValueError, 'owned 0'):
+            plan_ticket_transfers(self.tickets[:1], payouts)
+
+    def test_should_send_all_transfers_in_one_group(self) -> None:
+        client = MagicMock()
+        client.key.public_key_hash.return_value = RECEIVERS[0]
+        payouts = [
+            TicketPayout(receiver, TICKETER, FA12, 1)
+            for receiver in RECEIVERS * 5
+        ] + [TicketPayout(ROUTER, TICKETER, FA2, 1, 'withdraw')]
+
+        transfer_tickets(client, self.tickets, payouts)
+        client.bulk.assert_called_once()
+        operations = client.bulk.call_args.args
+        self.assertEqual(len(operations), 3)
+        self.assertEqual(
+            [op.contents[0]['ticket_amount'] for op in operations], ['5', '5', '1']
+        )
@@ -0,0 +1,241 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from os.path import dirname, join
+from urllib.parse import parse_qs, urlparse
+from pytezos import pytezos
+from pytezos.michelson.types.big_map import BigMapType
+from scripts.helpers.contracts.tokens import FxhashToken
+from scripts.helpers.stand_in import TezosNodeStandIn
+from scripts.helpers.token_metadata import TokenMetadata, TokenMetadataResolver
+from scripts.helpers.utility import load_contract_interface
+
+
+TOKENS = [
+    {
+        'contract': {'address': 'KT1PWx2mnDueood7fEmfbBDKx1D9BAnnXitn'},
+        'tokenId': '0',
+        'standard': 'fa1.2',
+        'totalSupply': '100000',
+        'metadata': {'name': 'tzBTC', 'symbol': 'tzBTC', 'decimals': '8'},
+    },
+    {
+        'contract': {'address': 'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o'},
+        'tokenId': '0',
+        'standard': 'fa2',
+        'totalSupply': '2000000',
+        'metadata': {'name': 'Tether USD', 'symbol': 'USDt', 'decimals': '6'},
+    },
+    {
+        'contract': {'address': 'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o'},
+        'tokenId': '1',
+        'standard': 'fa2',
+        'totalSupply': '1',
+        'metadata': {'name': 'Other', 'symbol': 'OTHER', 'decimals': '0'},
+    },
+]
+
+FXHASH_FILENAME = join(dirname(__file__), '..', '..', 'scripts', 'helpers', 'contracts', 'tokens', 'fa2', 'fxhash.tz')
+ON_CHAIN_ADDRESS = 'KT1U6EHmNxJTkvaWJ4ThczG4FSDaHC21ssvi'
+TOKEN_METADATA_ID = 4
+
+
+def make_fa2_block(token_info: dict[int, dict[str, bytes]]) -> dict[str, Any]:
+    """Returns the Tezos node stand-in block with the FA2 token contract
+    which has given `token_metadata` big_map entries"""
+
+    contract = load_contract_interface(FXHASH_FILENAME)
+    storage = contract.storage.encode({
+        **FxhashToken.default_storage,
+        'ledger': 0,
+        'metadata': 1,
+        'operators': 2,
+        'token_data': 3,
+        'token_metadata': TOKEN_METADATA_ID,
+    })
+    token_metadata = type(contract.storage.data).from_micheline_value(storage)['token_metadata']
+    assert isinstance(token_metadata, BigMapType)
+    value_type = token_metadata.args[1]
+    return {
+        'hash': f'BL{1:049d}',
+        'level': 1,
+        'contracts': {
+            ON_CHAIN_ADDRESS: {
+                'storage': storage,
+                'script': {'code': contract.to_micheline(), 'storage': storage},
+            }
+        },
+        'big_maps': {
+            str(TOKEN_METADATA_ID): {
+                token_metadata.get_key_hash(token_id): value_type.from_python_object(
+                    {'token_id': token_id, 'token_info': info}
+                ).to_micheline_value()
+                for token_id, info in token_info.items()
+            }
+        },
+    }
+
+
+class TzktStandInHandler(BaseHTTPRequestHandler):
+    """Serves `/tokens` endpoint with `contract.in` and `tokenId.in` filters"""
+
+    requests: list[dict[str, Any]] = []
+    unavailable = False
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: value[0] for key, value in parse_qs(url.query).items()}
+        self.requests.append(query)
+        if self.unavailable:
+            self.send_error(503)
+            return
+        contracts = query['contract.in'].split(',')
+        token_ids = query['tokenId.in'].split(',')
+        tokens = [
+            token
+            for token in TOKENS
+            if token['contract']['address'] in contracts  # type: ignore
+            and token['tokenId'] in token_ids
+        ]
+        body = json.dumps(tokens).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class TestTokenMetadataResolver(unittest.TestCase):
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), TzktStandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f'http://127.0.0.1:{cls.server.server_port}/v1'
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        TzktStandInHandler.requests = []
+        TzktStandInHandler.unavailable = False
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_filename = os.path.join(self.tmp_dir.name, 'cache.json')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def make_resolver(
+        self, cache_ttl: int = 3600, api_url: Optional[str] = None
+    ) -> TokenMetadataResolver:
+        return TokenMetadataResolver(
+            api_url or self.api_url,
+            cache_filename=self.cache_filename,
+            cache_ttl=cache_ttl,
+        )
+
+    def test_should_resolve_many_assets_in_single_request(self) -> None:
+        resolved = self.make_resolver().resolve_many(
+            [
+                'KT1PWx2mnDueood7fEmfbBDKx1D9BAnnXitn_0',
+                'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0',
+                'KT1AafHA1C1vk959wvHWBispY9Y2f3fxBUUo_0',
+            ]
+        )
+
+        assert len(TzktStandInHandler.requests) == 1
+        assert resolved == {
+            'KT1PWx2mnDueood7fEmfbBDKx1D9BAnnXitn_0': TokenMetadata(
+                name='tzBTC',
+                symbol='tzBTC',
+                decimals=8,
+                standard='FA1.2',
+                total_supply=100000,
+            ),
+            'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0': TokenMetadata(
+                name='Tether USD',
+                symbol='USDt',
+                decimals=6,
+                standard='FA2',
+                total_supply=2000000,
+            ),
+        }
+
+    def test_should_not_return_tokens_which_were_not_requested(self) -> None:
+        resolved = self.make_resolver().resolve_many(
+            [
+                'KT1PWx2mnDueood7fEmfbBDKx1D9BAnnXitn_1',
+                'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0',
+            ]
+        )
+        assert list(resolved) == ['KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0']
+
+    def test_should_read_metadata_from_disk_cache(self) -> None:
+        asset_id = 'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0'
+        metadata = self.make_resolver().resolve(asset_id)
+        assert self.make_resolver().resolve(asset_id) == metadata
+        assert len(TzktStandInHandler.requests) == 1
+
+    def test_should_refetch_metadata_when_cache_expired(self) -> None:
+        asset_id = 'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0'
+        self.make_resolver(cache_ttl=-1).resolve(asset_id)
+        self.make_resolver(cache_ttl=-1).resolve(asset_id)
+        assert len(TzktStandInHandler.requests) == 2
+
+    def test_should_not_share_cache_between_networks(self) -> None:
+        asset_id = 'KT1XnTn74bUtxHfDtBmm2bGZAQfhPbvKWR8o_0'
+        self.make_resolver().resolve(asset_id)
+        self.make_resolver(api_url=f'http://localhost:{self.server.server_port}/v1').resolve(asset_id)
+        assert len(TzktStandInHandler.requests) == 2
+
+    def test_should_fall_back_to_on_chain_metadata(self) -> None:
+        info = {'name': b'Wrapped', 'symbol': b'WRP', 'decimals': b'3'}
+        with TezosNodeStandIn({'blocks': [make_fa2_block({0: info})]}) as tezos_node:
+            resolver = TokenMetadataResolver(
+                self.api_url,
+                client=pytezos.using(shell=tezos_node.url),
+                cache_filename=self.cache_filename,
+            )
+            resolved = resolver.resolve_many(
+                [
+                    f'{ON_CHAIN_ADDRESS}_0',
+                    f'{ON_CHAIN_ADDRESS}_1',
+                    'KT1AafHA1C1vk959wvHWBispY9Y2f3fxBUUo_0',
+                ]
+            )
+
+        # NOTE: tokens missing in the big_map (KeyError) and unknown contracts
+        # (RpcError) are skipped:
+        assert resolved == {
+            f'{ON_CHAIN_ADDRESS}_0': TokenMetadata(
+                name='Wrapped', symbol='WRP', decimals=3, standard='FA2'
+            ),
+        }
+
+    def test_should_fall_back_to_on_chain_metadata_when_indexer_fails(self) -> None:
+        TzktStandInHandler.unavailable = True
+        info = {'name': b'Wrapped', 'symbol': b'WRP', 'decimals': b'3'}
+        with TezosNodeStandIn({'blocks': [make_fa2_block({0: info})]}) as tezos_node:
+            resolver = TokenMetadataResolver(
+                self.api_url,
+                client=pytezos.using(shell=tezos_node.url),
+                cache_filename=self.cache_filename,
+            )
+            resolved = resolver.resolve_many([f'{ON_CHAIN_ADDRESS}_0'])
+
+        assert len(TzktStandInHandler.requests) == 1
+        assert resolved == {
+            f'{ON_CHAIN_ADDRESS}_0': TokenMetadata(
+                name='Wrapped', symbol='WRP', decimals=3, standard='FA2'
+            ),
+        }
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from scripts.defaults import KERNEL_ADDRESS
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.stand_in import EtherlinkStandIn, get_fixture_path
+from scripts.helpers.tracing import (
+    InMemorySpanExporter,
+    NoOpTracer,
+    RecordingTracer,
+    get_tracer,
+    set_tracer,
+    start_span,
+)
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exporter = InMemorySpanExporter()
+        self.previous = set_tracer(RecordingTracer(self.exporter))
+
+    def tearDown(self) -> None:
+        set_tracer(self.previous)
+
+    def test_should_link_nested_spans_to_parent(self) -> None:
+        with start_span('deposit'):
+            with start_span('sign', chain='tezos'):
+                pass
+            with start_span('inject', chain='tezos') as span:
+                span.set_attribute('operation_hash', 'oo')
+
+        sign, inject, root = self.exporter.spans
+        assert [span.name for span in self.exporter.spans] == ['sign', 'inject', 'deposit']
+        assert root.parent_span_id is None
+        assert sign.parent_span_id == inject.parent_span_id == root.span_id
+        assert sign.trace_id == inject.trace_id == root.trace_id
+        assert inject.attributes == {'chain': 'tezos', 'operation_hash': 'oo'}
+        assert root.duration >= sign.duration + inject.duration
+
+    def test_should_mark_failed_span_with_exception(self) -> None:
+        with self.assertRaises(ValueError):
+            with start_span('withdraw'):
+                with start_span('wait_for_inclusion'):
+                    raise ValueError('timeout')
+
+        failed, root = self.exporter.spans
+        assert failed.status == root.status == 'ERROR'
+        assert failed.events[0]['attributes'] == {
+            'exception.type': 'ValueError',
+            'exception.message': 'timeout',
+        }
+        # NOTE: the next span starts a new trace:
+        with start_span('withdraw'):
+            pass
+        assert self.exporter.spans[-1].trace_id != root.trace_id
+
+    def test_should_write_spans_from_cli_option(self) -> None:
+        set_tracer(self.previous)
+        etherlink = EtherlinkStandIn.from_fixture(get_fixture_path('withdrawal.json')).start()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                filename = os.path.join(directory, 'trace.ndjson')
+                parse_withdrawal_event.callback(
+                    tx_hash=TX_HASH,
+                    etherlink_rpc_url=etherlink.url,
+                    kernel_address=KERNEL_ADDRESS,
+                    trace_file=filename,
+                )  # type: ignore
+                with open(filename) as f:
+                    spans = [json.loads(line) for line in f]
+        finally:
+            etherlink.stop()
+
+        receipt, root = spans
+        assert root['name'] == 'parse_withdrawal_event'
+        assert receipt['name'] == 'fetch_receipt'
+        assert receipt['parent_span_id'] == root['span_id']
+        assert receipt['attributes'] == {'chain': 'etherlink', 'tx_hash': TX_HASH}
+        assert receipt['duration'] > 0
+        assert isinstance(get_tracer(), NoOpTracer)
+
+    def test_should_not_record_spans_by_default(self) -> None:
+        set_tracer(self.previous)
+        assert isinstance(get_tracer(), NoOpTracer)
+        with start_span('deposit') as span:
+            span.set_attribute('operation_hash', 'oo')
+        assert self.exporter.spans == []
@@ -1,6 +1,8 @@
+import random
 import unittest
 from scripts.helpers.contracts.tokens import CtezToken, FxhashToken
 from scripts.helpers.ticket_content import TicketContent
+from scripts.helpers.utility import pack, pack_string_bytes_map, to_micheline
 from unittest.mock import Mock
 
 
@@ -82,3 +84,22 @@ class TestTicketContentGeneration(unittest.TestCase):
             + '320704010000000a746f6b656e5f747970650a00000003464132'
         )
         assert token_info_bytes.hex() == expected_token_info_hex
+
+
+class TestPacking(unittest.TestCase):
+    def test_string_bytes_map_packing_matches_pytezos(self) -> None:
+        rng = random.Random(0)
+        alphabet = 'abcXYZ_09 ~'
+        for _ in range(100):
+            items = {
+                ''.join(rng.choices(alphabet, k=rng.randint(0, 12))): rng.randbytes(rng.randint(0, 40))
+                for _ in range(rng.randint(0, 8))
+            }
+            assert pack_string_bytes_map(items) == pack(items, 'map string bytes')
+        with self.assertRaises(ValueError):
+            pack_string_bytes_map({'ñ': b''})
+
+    def test_cached_micheline_is_not_shared(self) -> None:
+        micheline = to_micheline(TicketContent.michelson_type)
+        micheline['args'].clear()
+        assert to_micheline(TicketContent.michelson_type)['args']
@@ -0,0 +1,20 @@
+import unittest
+from itertools import count
+from scripts.helpers.waiter import WaitTimeout, backoff_delays, wait_until
+
+
+class TestWaiter(unittest.TestCase):
+    def test_should_return_as_soon_as_condition_is_met(self) -> None:
+        counter = count()
+        result = wait_until(lambda: next(counter), lambda n: n == 2, initial_delay=0.01)
+        assert result == 2
+        assert next(counter) == 3
+
+    def test_should_raise_with_last_result_when_deadline_passed(self) -> None:
+        with self.assertRaises(WaitTimeout) as context:
+            wait_until(lambda: [], timeout=0.05, initial_delay=0.01)
+        assert context.exception.last_result == []
+
+    def test_should_cap_backoff_delays(self) -> None:
+        delays = backoff_delays(initial_delay=1, max_delay=4, factor=2, jitter=0)
+        assert [next(delays) for _ in range(5)] == [1, 2, 4, 4, 4]
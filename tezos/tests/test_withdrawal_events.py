@@ -0,0 +1,75 @@
+import unittest
+from typing import Any
+from web3 import Web3
+from scripts.defaults import KERNEL_ADDRESS
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.etherlink.withdrawal_events import (
+    WITHDRAWAL_EVENT_TOPIC,
+    get_withdrawal_logs,
+)
+from scripts.helpers.stand_in import EtherlinkStandIn, get_fixture_path
+from scripts.helpers.stand_in.etherlink import JsonRpcError
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+
+
+class TestWithdrawalEvents(unittest.TestCase):
+    etherlink: EtherlinkStandIn
+
+    def setUp(self) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        self.etherlink = EtherlinkStandIn.from_fixture(fixture).start()
+        self.web3 = Web3(Web3.HTTPProvider(self.etherlink.url))
+
+    def tearDown(self) -> None:
+        self.etherlink.stop()
+
+    def test_should_match_event_topic_from_interface(self) -> None:
+        [kernel_log] = self.etherlink.rpc_eth_getLogs({'address': KERNEL_ADDRESS})
+        assert kernel_log['topics'][0] == WITHDRAWAL_EVENT_TOPIC
+
+    def test_should_decode_withdrawals_in_block_range(self) -> None:
+        [event] = list(get_withdrawal_logs(self.web3, KERNEL_ADDRESS, 0, 500))
+        assert event['transaction_hash'] == TX_HASH
+        assert event['block_number'] == 420
+        assert event['sender'] == '0xBefD2C6fFC36249ebEbd21d6DF6376ecF3BAc448'
+        assert event['receiver'] == 'tz1VQ1ByPgZRG3HtRF7aEpozkkJrm6Wgk8oW'
+        assert event['amount'] == 7
+        assert (event['outbox_level'], event['outbox_index']) == (5242880, 0)
+
+    def test_should_reduce_chunk_when_node_rejects_range(self) -> None:
+        self.etherlink.max_logs_range = 50
+        events = list(get_withdrawal_logs(self.web3, KERNEL_ADDRESS, 0, 500, chunk_size=400))
+        assert [e['block_number'] for e in events] == [420]
+
+        self.etherlink.max_logs_range = 0
+        with self.assertRaises(ValueError):
+            list(get_withdrawal_logs(self.web3, KERNEL_ADDRESS, 0, 500))
+
+    def test_should_not_reduce_chunk_on_unrelated_error(self) -> None:
+        requested_ranges = []
+
+        def get_logs_failed(log_filter: dict[str, Any]) -> Any:
+            requested_ranges.append((log_filter['fromBlock'], log_filter['toBlock']))
+            raise JsonRpcError(-32000, 'exceeds block gas limit')
+
+        self.etherlink.rpc_eth_getLogs = get_logs_failed  # type: ignore
+        with self.assertRaises(ValueError):
+            list(get_withdrawal_logs(self.web3, KERNEL_ADDRESS, 0, 500))
+        assert len(requested_ranges) == 1
+
+    def test_should_return_same_coordinates_in_both_modes(self) -> None:
+        single = parse_withdrawal_event.callback(
+            tx_hash=TX_HASH,
+            etherlink_rpc_url=self.etherlink.url,
+            kernel_address=KERNEL_ADDRESS,
+        )  # type: ignore
+        [event] = parse_withdrawal_event.callback(
+            from_block=400,
+            to_block=None,
+            etherlink_rpc_url=self.etherlink.url,
+            kernel_address=KERNEL_ADDRESS,
+        )  # type: ignore
+        assert single['outbox_level'] == event['outbox_level']
+        assert single['outbox_index'] == event['outbox_index']
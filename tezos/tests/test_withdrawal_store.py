@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from os.path import join
+from scripts.defaults import KERNEL_ADDRESS
+from scripts.etherlink import parse_withdrawal_event
+from scripts.helpers.stand_in import (
+    EtherlinkStandIn,
+    RollupNodeStandIn,
+    get_fixture_path,
+)
+from scripts.helpers.withdrawal_store import (
+    EXECUTED,
+    FAILED,
+    OUTBOX_KNOWN,
+    PROVED,
+    WithdrawalStore,
+)
+from scripts.rollup_node import get_proof
+
+
+TX_HASH = '0xac586320f475653b5fe8c4e0ce40f61147fd556069d0c268a989c98e8a31c3c1'
+LEVEL = 5242880
+
+
+class TestWithdrawalStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = join(self.directory.name, 'withdrawals.sqlite')
+        self.store = WithdrawalStore(self.filename)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_should_link_all_steps_into_single_withdrawal(self) -> None:
+        fixture = get_fixture_path('withdrawal.json')
+        with EtherlinkStandIn.from_fixture(fixture) as etherlink:
+            parse_withdrawal_event.callback(
+                tx_hash=TX_HASH,
+                etherlink_rpc_url=etherlink.url,
+                kernel_address=KERNEL_ADDRESS,
+                withdrawal_store=self.filename,
+            )  # type: ignore
+        with RollupNodeStandIn.from_fixture(fixture) as rollup_node:
+            proof = get_proof.callback(
+                level=LEVEL,
+                index=0,
+                etherlink_rollup_node_url=rollup_node.url,
+                silent=True,
+                withdrawal_store=self.filename,
+            )  # type: ignore
+        self.store.record_execution(proof['commitment'], proof['proof'], l1_op_hash='oo1')
+
+        withdrawal = self.store.get(TX_HASH)
+        assert withdrawal is not None
+        assert withdrawal['status'] == EXECUTED
+        assert (withdrawal['outbox_level'], withdrawal['outbox_index']) == (LEVEL, 0)
+        assert withdrawal['receiver'] == 'tz1VQ1ByPgZRG3HtRF7aEpozkkJrm6Wgk8oW'
+        assert withdrawal['amount'] == '7'
+        assert withdrawal['commitment'] == proof['commitment']
+        assert withdrawal['l1_op_hash'] == 'oo1'
+
+    def test_should_merge_withdrawal_and_proof_recorded_before_event(self) -> None:
+        self.store.record_withdrawal(TX_HASH, receiver='tz1VQ1ByPgZRG3HtRF7aEpozkkJrm6Wgk8oW')
+        self.store.record_proof(LEVEL, 0, 'src1', 'proof')
+        withdrawal = self.store.record_event(
+            {'transaction_hash': TX_HASH, 'outbox_level': LEVEL, 'outbox_index': 0}
+        )
+
+        assert withdrawal == self.store.get(TX_HASH)
+        assert withdrawal['status'] == PROVED
+        assert withdrawal['receiver'] == 'tz1VQ1ByPgZRG3HtRF7aEpozkkJrm6Wgk8oW'
+        assert withdrawal['proof'] == 'proof'
+        assert len(self.store.get_ready_to_execute()) == 1
+
+    def test_should_not_move_status_back(self) -> None:
+        self.store.record_proof(LEVEL, 0, 'src1', 'proof')
+        self.store.record_execution('src1', 'proof', l1_op_hash='oo1')
+        self.store.record_execution('src1', 'proof', error='already executed')
+        withdrawal = self.store.record_event({'outbox_level': LEVEL, 'outbox_index': 0})
+        assert withdrawal['status'] == EXECUTED
+
+    def test_should_find_ready_to_execute_and_stuck_withdrawals(self) -> None:
+        self.store.record_event({'transaction_hash': '0x01', 'outbox_level': 10, 'outbox_index': 0})
+        self.store.record_proof(10, 1, 'src1', 'proof1')
+        self.store.record_proof(20, 0, 'src2', 'proof2')
+        self.store.record_proof(5, 0, 'src3', 'proof3')
+        self.store.record_execution('src3', 'proof3', error='failed')
+
+        ready = self.store.get_ready_to_execute(cemented_level=15)
+        assert [(w['outbox_level'], w['status']) for w in ready] == [(10, PROVED)]
+        assert len(self.store.get_ready_to_execute()) == 2
+
+        stuck = self.store.get_stuck(older_than=60, now=self.store.get('0x01')['updated_at'] + 61)  # type: ignore
+        assert [w['status'] for w in stuck] == [OUTBOX_KNOWN, PROVED, PROVED, FAILED]
+        assert self.store.get_stuck(older_than=60) == []